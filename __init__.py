@@ -1,4 +1,9 @@
 from .graph import Graph
-from .container import Container
+from .live import LiveGraph
+from .container import Container, ContainerIndex
 from .node import Node
 from .plug import Plug
+from .modifier import ModifierSession
+from .profiling import profile, ProfileStats
+from . import batch
+from .dispatch import Dispatcher
@@ -0,0 +1,188 @@
+from typing import Any, Callable, List, Optional, Tuple
+
+from maya.api import OpenMaya as om
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def requireNumpy():
+    if numpy is None:
+        raise ImportError('numpy is required for vectorized attribute access')
+
+    return numpy
+
+
+_INT_TYPES = (
+    om.MFnNumericData.kByte,
+    om.MFnNumericData.kChar,
+    om.MFnNumericData.kShort,
+    om.MFnNumericData.kInt,
+    om.MFnNumericData.kLong,
+    )
+
+_FLOAT_TYPES = (
+    om.MFnNumericData.kFloat,
+    om.MFnNumericData.kDouble,
+    )
+
+
+def _readMatrix(plug: om.MPlug) -> List[float]:
+    return list(om.MFnMatrixData(plug.asMObject()).matrix())
+
+
+def _writeMatrix(modifier: om.MDGModifier, plug: om.MPlug, value: List[float]) -> None:
+    obj = om.MFnMatrixData().create(om.MMatrix(value))
+    modifier.newPlugValue(plug, obj)
+
+
+class PlugAccessor:
+    """
+    :desc: value type of an attribute, decided once from a plug
+    and reused to read or write the same attribute on any number of plugs
+    values are python scalars, or flat lists for compound and matrix attributes
+    """
+
+    def __init__(self, plug: om.MPlug) -> None:
+
+        if plug.isCompound:
+            self.__initCompound(plug)
+            return
+
+        self.dtype, self.read, self.write = self.__scalar(plug)
+        self.width = 16 if self.read is _readMatrix else 1
+
+    def __initCompound(self, plug: om.MPlug) -> None:
+
+        children = [self.__class__(plug.child(idx)) for idx in range(plug.numChildren())]
+        if any(child.width != 1 for child in children):
+            raise TypeError(f'{plug.name()} is not a numeric compound')
+
+        readers = [child.read for child in children]
+        writers = [child.write for child in children]
+
+        def read(plug: om.MPlug) -> List[Any]:
+            return [reader(plug.child(idx)) for idx, reader in enumerate(readers)]
+
+        def write(modifier: om.MDGModifier, plug: om.MPlug, value: List[Any]) -> None:
+            for idx, (writer, val) in enumerate(zip(writers, value)):
+                writer(modifier, plug.child(idx), val)
+
+        dtypes = {child.dtype for child in children}
+        self.dtype = 'float64' if 'float64' in dtypes else dtypes.pop()
+        self.width = len(children)
+        self.read = read
+        self.write = write
+
+    @staticmethod
+    def __scalar(plug: om.MPlug) -> tuple:
+
+        attr = plug.attribute()
+
+        if attr.hasFn(om.MFn.kNumericAttribute):
+            typ = om.MFnNumericAttribute(attr).numericType()
+
+            if typ == om.MFnNumericData.kBoolean:
+                return 'bool', om.MPlug.asBool, om.MDGModifier.newPlugValueBool
+
+            if typ in _INT_TYPES:
+                return 'int64', om.MPlug.asInt, om.MDGModifier.newPlugValueInt
+
+            if typ in _FLOAT_TYPES:
+                return 'float64', om.MPlug.asDouble, om.MDGModifier.newPlugValueDouble
+
+        if attr.hasFn(om.MFn.kUnitAttribute):
+            return 'float64', om.MPlug.asDouble, om.MDGModifier.newPlugValueDouble
+
+        if attr.hasFn(om.MFn.kEnumAttribute):
+            return 'int64', om.MPlug.asInt, om.MDGModifier.newPlugValueInt
+
+        if attr.hasFn(om.MFn.kMatrixAttribute):
+            return 'float64', _readMatrix, _writeMatrix
+
+        if attr.hasFn(om.MFn.kTypedAttribute):
+            if om.MFnTypedAttribute(attr).attrType() == om.MFnData.kMatrix:
+                return 'float64', _readMatrix, _writeMatrix
+
+        raise TypeError(f'{plug.name()} has no numeric value')
+
+    @property
+    def shape(self) -> tuple:
+        return () if self.width == 1 else (self.width,)
+
+    def readAll(self, plugs: List[om.MPlug]) -> List[Any]:
+        read = self.read
+        return [read(plug) for plug in plugs]
+
+    def writeAll(
+            self,
+            modifier: om.MDGModifier,
+            plugs: List[om.MPlug],
+            values: List[Any]
+            ) -> None:
+        write = self.write
+        for plug, value in zip(plugs, values):
+            write(modifier, plug, value)
+
+
+_N = om.MFnNumericData
+_H = om.MDataHandle
+
+# element handle accessors of numeric multi attributes: dtype, width, getter, setter
+HANDLE_ACCESSORS = {
+    _N.kBoolean: ('bool', 1, _H.asBool, _H.setBool),
+    _N.kByte: ('int64', 1, _H.asChar, _H.setChar),
+    _N.kChar: ('int64', 1, _H.asChar, _H.setChar),
+    _N.kShort: ('int64', 1, _H.asShort, _H.setShort),
+    _N.kInt: ('int64', 1, _H.asInt, _H.setInt),
+    _N.kFloat: ('float32', 1, _H.asFloat, _H.setFloat),
+    _N.kDouble: ('float64', 1, _H.asDouble, _H.setDouble),
+    _N.k2Short: ('int64', 2, _H.asShort2, lambda h, v: h.set2Short(*v)),
+    _N.k2Int: ('int64', 2, _H.asInt2, lambda h, v: h.set2Int(*v)),
+    _N.k2Float: ('float32', 2, _H.asFloat2, lambda h, v: h.set2Float(*v)),
+    _N.k2Double: ('float64', 2, _H.asDouble2, lambda h, v: h.set2Double(*v)),
+    _N.k3Short: ('int64', 3, _H.asShort3, lambda h, v: h.set3Short(*v)),
+    _N.k3Int: ('int64', 3, _H.asInt3, lambda h, v: h.set3Int(*v)),
+    _N.k3Float: ('float32', 3, _H.asFloat3, lambda h, v: h.set3Float(*v)),
+    _N.k3Double: ('float64', 3, _H.asDouble3, lambda h, v: h.set3Double(*v)),
+    }
+
+
+def handleAccessor(attr: om.MObject) -> Optional[tuple]:
+    """
+    :desc: element handle accessor of a numeric multi attribute, None otherwise
+    """
+    if not attr.hasFn(om.MFn.kNumericAttribute):
+        return
+
+    return HANDLE_ACCESSORS.get(om.MFnNumericAttribute(attr).numericType())
+
+
+def _points(values: List[List[float]]) -> om.MPointArray:
+    return om.MPointArray([om.MPoint(*value) for value in values])
+
+
+def _vectors(values: List[List[float]]) -> om.MVectorArray:
+    return om.MVectorArray([om.MVector(*value) for value in values])
+
+
+# typed array data: function set, array builder, dtype, width
+ARRAY_DATA = {
+    om.MFnData.kDoubleArray: (om.MFnDoubleArrayData, om.MDoubleArray, 'float64', 1),
+    om.MFnData.kFloatArray: (om.MFnFloatArrayData, om.MFloatArray, 'float32', 1),
+    om.MFnData.kIntArray: (om.MFnIntArrayData, om.MIntArray, 'int32', 1),
+    om.MFnData.kPointArray: (om.MFnPointArrayData, _points, 'float64', 3),
+    om.MFnData.kVectorArray: (om.MFnVectorArrayData, _vectors, 'float64', 3),
+    }
+
+
+def arrayData(attr: om.MObject) -> Optional[Tuple[Any, Callable, str, int]]:
+    """
+    :desc: typed array data description of an attribute, None otherwise
+    """
+    if not attr.hasFn(om.MFn.kTypedAttribute):
+        return
+
+    return ARRAY_DATA.get(om.MFnTypedAttribute(attr).attrType())
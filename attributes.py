@@ -0,0 +1,247 @@
+from typing import Any, Dict, Optional
+
+from maya.api import OpenMaya as om
+
+# cmds.addAttr flags handled by createAttribute, short name or long name: long name
+FLAGS = {
+    'ln': 'longName', 'longName': 'longName',
+    'sn': 'shortName', 'shortName': 'shortName',
+    'nn': 'niceName', 'niceName': 'niceName',
+    'at': 'attributeType', 'attributeType': 'attributeType',
+    'dt': 'dataType', 'dataType': 'dataType',
+    'dv': 'defaultValue', 'defaultValue': 'defaultValue',
+    'min': 'minValue', 'minValue': 'minValue',
+    'max': 'maxValue', 'maxValue': 'maxValue',
+    'smn': 'softMinValue', 'softMinValue': 'softMinValue',
+    'smx': 'softMaxValue', 'softMaxValue': 'softMaxValue',
+    'en': 'enumName', 'enumName': 'enumName',
+    'k': 'keyable', 'keyable': 'keyable',
+    'h': 'hidden', 'hidden': 'hidden',
+    'm': 'multi', 'multi': 'multi',
+    'r': 'readable', 'readable': 'readable',
+    'w': 'writable', 'writable': 'writable',
+    's': 'storable', 'storable': 'storable',
+    }
+
+NUMERIC_TYPES = {
+    'bool': om.MFnNumericData.kBoolean,
+    'byte': om.MFnNumericData.kByte,
+    'char': om.MFnNumericData.kChar,
+    'short': om.MFnNumericData.kShort,
+    'long': om.MFnNumericData.kInt,
+    'float': om.MFnNumericData.kFloat,
+    'double': om.MFnNumericData.kDouble,
+    }
+
+UNIT_TYPES = {
+    'doubleLinear': om.MFnUnitAttribute.kDistance,
+    'doubleAngle': om.MFnUnitAttribute.kAngle,
+    'time': om.MFnUnitAttribute.kTime,
+    }
+
+DATA_TYPES = {
+    'string': om.MFnData.kString,
+    'matrix': om.MFnData.kMatrix,
+    'doubleArray': om.MFnData.kDoubleArray,
+    'floatArray': om.MFnData.kFloatArray,
+    'Int32Array': om.MFnData.kIntArray,
+    'pointArray': om.MFnData.kPointArray,
+    'vectorArray': om.MFnData.kVectorArray,
+    }
+
+
+def createAttribute(**kwargs) -> Optional[om.MObject]:
+    """
+    :desc: build a dynamic attribute from cmds.addAttr flags with the attribute function sets
+    compounds and flags not listed in FLAGS are not covered
+    :return: the attribute, None when the flags need the cmds command
+    :rtype: MObject | None
+    """
+    flags = {}
+    for key, value in kwargs.items():
+        if key not in FLAGS:
+            return
+
+        flags[FLAGS[key]] = value
+
+    longName = flags.get('longName', flags.get('shortName'))
+    if not longName:
+        return
+
+    shortName = flags.get('shortName', longName)
+    attrType = flags.get('attributeType')
+    dataType = flags.get('dataType')
+
+    if dataType is not None:
+        if attrType is not None or dataType not in DATA_TYPES:
+            return
+
+        fn = om.MFnTypedAttribute()
+        attr = fn.create(longName, shortName, DATA_TYPES[dataType])
+
+    elif attrType is None or attrType in NUMERIC_TYPES:
+        fn = om.MFnNumericAttribute()
+        attr = fn.create(longName, shortName, NUMERIC_TYPES[attrType or 'double'], flags.get('defaultValue', 0))
+
+    elif attrType in UNIT_TYPES:
+        fn = om.MFnUnitAttribute()
+        attr = fn.create(longName, shortName, UNIT_TYPES[attrType], flags.get('defaultValue', 0.0))
+
+    elif attrType == 'enum':
+        fn = om.MFnEnumAttribute()
+        attr = fn.create(longName, shortName, flags.get('defaultValue', 0))
+        for name, value in enumFields(flags.get('enumName', '')).items():
+            fn.addField(name, value)
+
+    elif attrType == 'message':
+        fn = om.MFnMessageAttribute()
+        attr = fn.create(longName, shortName)
+
+    elif attrType in ('matrix', 'fltMatrix'):
+        fn = om.MFnMatrixAttribute()
+        precision = om.MFnMatrixAttribute.kFloat if attrType == 'fltMatrix' else om.MFnMatrixAttribute.kDouble
+        attr = fn.create(longName, shortName, precision)
+
+    else:
+        return
+
+    _setLimits(fn, flags)
+
+    if 'niceName' in flags:
+        fn.setNiceNameOverride(flags['niceName'])
+
+    for flag, name in (
+            ('keyable', 'keyable'),
+            ('hidden', 'hidden'),
+            ('multi', 'array'),
+            ('readable', 'readable'),
+            ('writable', 'writable'),
+            ('storable', 'storable')
+            ):
+        if flag in flags:
+            setattr(fn, name, bool(flags[flag]))
+
+    return attr
+
+
+def _setLimits(fn: om.MFnAttribute, flags: Dict[str, Any]) -> None:
+
+    for flag, setter in (
+            ('minValue', 'setMin'),
+            ('maxValue', 'setMax'),
+            ('softMinValue', 'setSoftMin'),
+            ('softMaxValue', 'setSoftMax')
+            ):
+        if flag in flags and hasattr(fn, setter):
+            getattr(fn, setter)(flags[flag])
+
+
+def enumFields(enumName: str) -> Dict[str, int]:
+    """
+    :desc: parse a cmds enum string, "off:on" or "low=1:high=10"
+    """
+    fields = {}
+    value = 0
+    for field in filter(None, enumName.split(':')):
+        name, _, index = field.partition('=')
+        value = int(index) if index else value
+        fields[name] = value
+        value += 1
+
+    return fields
+
+
+def describeAttribute(attr: om.MObject) -> Optional[Dict[str, Any]]:
+    """
+    :desc: flags createAttribute builds the given attribute back from, the inverse of createAttribute
+    :return: long name flags, None for attributes createAttribute does not cover
+    :rtype: Dict[str, Any] | None
+    """
+    fnAttr = om.MFnAttribute(attr)
+    if not fnAttr.parent.isNull():
+        return
+
+    flags = {'longName': fnAttr.name, 'shortName': fnAttr.shortName}
+
+    if attr.hasFn(om.MFn.kNumericAttribute):
+        fn = om.MFnNumericAttribute(attr)
+        attrType = _reverse(NUMERIC_TYPES, fn.numericType())
+        if attrType is None:
+            return
+
+        flags['attributeType'] = attrType
+        flags['defaultValue'] = fn.default
+        _getLimits(fn, flags)
+
+    elif attr.hasFn(om.MFn.kUnitAttribute):
+        fn = om.MFnUnitAttribute(attr)
+        attrType = _reverse(UNIT_TYPES, fn.unitType())
+        if attrType is None:
+            return
+
+        # unit defaults are kept in internal units, the ones createAttribute expects
+        flags['attributeType'] = attrType
+        flags['defaultValue'] = getattr(fn.default, 'value', fn.default)
+        _getLimits(fn, flags)
+
+    elif attr.hasFn(om.MFn.kTypedAttribute):
+        if (dataType := _reverse(DATA_TYPES, om.MFnTypedAttribute(attr).attrType())) is None:
+            return
+
+        flags['dataType'] = dataType
+
+    elif attr.hasFn(om.MFn.kEnumAttribute):
+        fn = om.MFnEnumAttribute(attr)
+        flags['attributeType'] = 'enum'
+        flags['defaultValue'] = fn.default
+        flags['enumName'] = ':'.join(
+                f'{name}={value}' for value, name in _enumFields(fn).items()
+                )
+
+    elif attr.hasFn(om.MFn.kMessageAttribute):
+        flags['attributeType'] = 'message'
+
+    elif attr.hasFn(om.MFn.kMatrixAttribute):
+        flags['attributeType'] = 'matrix'
+
+    else:
+        return
+
+    for flag in ('keyable', 'hidden', 'readable', 'writable', 'storable'):
+        flags[flag] = getattr(fnAttr, flag)
+
+    flags['multi'] = fnAttr.array
+    return flags
+
+
+def _reverse(types: Dict[str, int], value: int) -> Optional[str]:
+
+    for name, typ in types.items():
+        if typ == value:
+            return name
+
+
+def _getLimits(fn: om.MFnAttribute, flags: Dict[str, Any]) -> None:
+
+    for flag, query, getter in (
+            ('minValue', 'hasMin', 'getMin'),
+            ('maxValue', 'hasMax', 'getMax'),
+            ('softMinValue', 'hasSoftMin', 'getSoftMin'),
+            ('softMaxValue', 'hasSoftMax', 'getSoftMax')
+            ):
+        if getattr(fn, query)():
+            value = getattr(fn, getter)()
+            flags[flag] = getattr(value, 'value', value)
+
+
+def _enumFields(fn: om.MFnEnumAttribute) -> Dict[int, str]:
+
+    fields = {}
+    for value in range(fn.getMin(), fn.getMax() + 1):
+        try:
+            fields[value] = fn.fieldName(value)
+        except RuntimeError:
+            # gap between the field values
+            continue
+
+    return fields
@@ -0,0 +1,258 @@
+import multiprocessing
+import os
+import traceback
+from collections import deque
+from multiprocessing.connection import wait
+from time import perf_counter
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class Result(NamedTuple):
+    index: int
+    path: str
+    value: Any = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class MayaWorker:
+    """
+    :desc: worker environment, maya standalone is initialised once per process
+    and every task opens its scene before the job runs
+    """
+
+    def initialize(self) -> None:
+        import maya.standalone
+        maya.standalone.initialize(name='python')
+
+    def open(self, path: str) -> None:
+        from maya.api import OpenMaya as om
+        om.MFileIO.open(path, None, True)
+
+    def close(self) -> None:
+        import maya.standalone
+        maya.standalone.uninitialize()
+
+
+class LocalWorker:
+    """
+    :desc: worker environment without maya, the job gets the path as is
+    used to check the scheduling, timeouts and crash handling of the runner
+    """
+
+    def initialize(self) -> None:
+        pass
+
+    def open(self, path: str) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def _serve(connection, worker, job: Callable[[str], Any]) -> None:
+    """
+    :desc: worker process loop, runs the job on each received path until None is received
+    None is sent once the worker is initialised, timeouts start from there
+    """
+    worker.initialize()
+    connection.send(None)
+
+    try:
+        while (path := connection.recv()) is not None:
+            start = perf_counter()
+            try:
+                worker.open(path)
+                value = job(path)
+                connection.send((value, None, perf_counter() - start))
+
+            except Exception as error:
+                message = f'{type(error).__name__}: {error}\n{traceback.format_exc()}'
+                connection.send((None, message, perf_counter() - start))
+
+    finally:
+        worker.close()
+
+
+class _Slot:
+
+    __slots__ = ('process', 'connection', 'index', 'path', 'ready', 'started')
+
+    def __init__(self, process, connection) -> None:
+        self.process = process
+        self.connection = connection
+        self.index = None
+        self.path = None
+        self.ready = False
+        self.started: Optional[float] = None
+
+    @property
+    def busy(self) -> bool:
+        return self.path is not None
+
+
+class BatchRunner:
+    """
+    :desc: run a job on many scene files with a pool of worker processes
+    each worker initialises its environment once and is reused across scenes,
+    a worker that crashes or exceeds the timeout is killed and replaced,
+    only the scene it was working on is reported as failed,
+    the timeout of a scene starts once its worker is initialised
+    """
+
+    def __init__(
+            self,
+            job: Callable[[str], Any],
+            workers: Optional[int] = None,
+            timeout: Optional[float] = None,
+            worker: Any = None,
+            context: str = 'spawn'
+            ) -> None:
+        """
+        :param callable job: picklable function called with the scene path in the worker,
+        its return value has to be picklable too
+        :param int | None workers: number of worker processes, the cpu count by default
+        :param float | None timeout: seconds a scene can take before its worker is killed
+        :param worker: worker environment, MayaWorker by default, LocalWorker to run without maya
+        :param str context: multiprocessing start method
+        """
+        self.job = job
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.worker = worker if worker is not None else MayaWorker()
+        self.__context = multiprocessing.get_context(context)
+
+    def __start(self) -> _Slot:
+
+        connection, child = self.__context.Pipe()
+        process = self.__context.Process(target=_serve, args=(child, self.worker, self.job), daemon=True)
+        process.start()
+        child.close()
+
+        return _Slot(process, connection)
+
+    @staticmethod
+    def __stop(slot: _Slot, kill: bool = False) -> None:
+
+        if not kill:
+            try:
+                slot.connection.send(None)
+            except (OSError, ValueError):
+                kill = True
+
+            slot.process.join(5)
+
+        if kill or slot.process.is_alive():
+            slot.process.terminate()
+            slot.process.join()
+
+        slot.connection.close()
+
+    def __replace(self, slots: List[_Slot], slot: _Slot) -> None:
+        self.__stop(slot, kill=True)
+        slots[slots.index(slot)] = self.__start()
+
+    def __collect(self, slot: _Slot) -> Optional[Tuple[Result, bool]]:
+        """
+        :desc: result of the slot task and whether the worker can be reused,
+        None while the task is still running or the worker is still initialising
+        """
+        now = perf_counter()
+        elapsed = now - slot.started if slot.started is not None else 0.0
+
+        if slot.connection.poll():
+            try:
+                message = slot.connection.recv()
+
+            except (EOFError, OSError):
+                pass
+
+            else:
+                if message is None:
+                    # the worker is initialised, the scene clock starts now
+                    slot.ready = True
+                    slot.started = now
+                    return
+
+                value, error, seconds = message
+                return Result(slot.index, slot.path, value, error, seconds), True
+
+        elif slot.process.is_alive():
+            if self.timeout is None or slot.started is None or elapsed < self.timeout:
+                return
+
+            return Result(slot.index, slot.path, None, f'timeout after {self.timeout}s', elapsed), False
+
+        slot.process.join()
+        error = f'worker crashed, exit code {slot.process.exitcode}'
+        return Result(slot.index, slot.path, None, error, elapsed), False
+
+    def run(self, paths: Iterable[str]) -> Iterator[Result]:
+        """
+        :desc: yield the result of every scene as soon as it is finished
+        closing the generator stops the workers
+        """
+        pending = deque(enumerate(paths))
+        slots = [self.__start() for _ in range(min(self.workers, len(pending)))]
+
+        try:
+            while True:
+                for slot in slots:
+                    if not slot.busy and pending:
+                        slot.index, slot.path = pending.popleft()
+                        slot.started = perf_counter() if slot.ready else None
+                        slot.connection.send(slot.path)
+
+                busy = [slot for slot in slots if slot.busy]
+                if not busy:
+                    return
+
+                waitTimeout = None
+                started = [slot.started for slot in busy if slot.started is not None]
+                if self.timeout is not None and started:
+                    deadline = min(started) + self.timeout
+                    waitTimeout = max(deadline - perf_counter(), 0.0)
+
+                wait(
+                    [slot.connection for slot in busy] + [slot.process.sentinel for slot in busy],
+                    waitTimeout
+                    )
+
+                for slot in busy:
+                    if (collected := self.__collect(slot)) is None:
+                        continue
+
+                    result, reusable = collected
+                    if reusable:
+                        slot.index = slot.path = None
+
+                    elif pending:
+                        self.__replace(slots, slot)
+
+                    else:
+                        self.__stop(slot, kill=True)
+                        slots.remove(slot)
+
+                    yield result
+
+        finally:
+            for slot in slots:
+                self.__stop(slot)
+
+
+def run(
+        paths: Iterable[str],
+        job: Callable[[str], Any],
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        worker: Any = None
+        ) -> Iterator[Result]:
+    """
+    :desc: run job on every scene with a BatchRunner, results are yielded as they finish
+    :example: for result in batch.run(paths, checkRig, workers=8, timeout=120): ...
+    """
+    return BatchRunner(job, workers=workers, timeout=timeout, worker=worker).run(paths)
@@ -0,0 +1,2047 @@
+"""
+:desc: in memory stand-in for the part of maya.api.OpenMaya used by grapher
+nodes, attributes, plugs and connections live in a python scene so grapher
+can be timed without a maya session, it only mimics behaviour, not costs:
+primitives are O(1) where maya is, node, name, attribute, connection and dag
+callbacks are fired by the edits that trigger them in maya, container publish ones never are
+"""
+import itertools
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class MFn:
+    kInvalid = 0
+    kBase = 1
+    kDependencyNode = 4
+    kDagNode = 107
+    kTransform = 110
+    kJoint = 121
+    kShape = 248
+    kMesh = 296
+    kLocator = 281
+    kContainer = 1009
+    kWorld = 1010
+    kNurbsCurve = 267
+    kNurbsSurface = 294
+    kCamera = 250
+    kBlendShape = 336
+    kAnimCurve = 7
+    kSet = 459
+    kReference = 747
+    kGeometryFilt = 335
+    kSkinClusterFilter = 682
+    kAttribute = 554
+    kNumericAttribute = 566
+    kUnitAttribute = 574
+    kEnumAttribute = 563
+    kMatrixAttribute = 565
+    kTypedAttribute = 573
+    kMessageAttribute = 564
+    kCompoundAttribute = 561
+
+
+class MFnData:
+    kInvalid = 0
+    kNumeric = 1
+    kString = 4
+    kMatrix = 5
+    kDoubleArray = 7
+    kFloatArray = 8
+    kIntArray = 9
+    kPointArray = 10
+    kVectorArray = 11
+
+
+class MFnNumericData:
+    kInvalid = 0
+    kBoolean = 1
+    kByte = 2
+    kChar = 3
+    kShort = 4
+    k2Short = 5
+    k3Short = 6
+    kLong = kInt = 7
+    k2Long = k2Int = 8
+    k3Long = k3Int = 9
+    kFloat = 11
+    k2Float = 12
+    k3Float = 13
+    kDouble = 14
+    k2Double = 15
+    k3Double = 16
+
+
+class MTypeId:
+
+    def __init__(self, value: int = 0) -> None:
+        self.value = value
+
+    def id(self) -> int:
+        return self.value
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, MTypeId) and other.value == self.value
+
+    def __hash__(self) -> int:
+        return self.value
+
+
+# scene ------------------------------------------------------------------------
+
+class _Attribute:
+
+    __slots__ = (
+        'name', 'shortName', 'fnType', 'numericType', 'dataType', 'default',
+        'children', 'parent', 'array', 'writable', 'storable', 'dynamic',
+        'keyable', 'hidden', 'readable', 'limits', 'fields'
+        )
+
+    def __init__(
+            self,
+            name: str,
+            shortName: str,
+            fnType: int,
+            numericType: int = MFnNumericData.kInvalid,
+            dataType: int = MFnData.kInvalid,
+            default: Any = None,
+            children: Tuple['_Attribute', ...] = (),
+            array: bool = False,
+            writable: bool = True,
+            storable: bool = True
+            ) -> None:
+
+        self.name = name
+        self.shortName = shortName
+        self.fnType = fnType
+        self.numericType = numericType
+        self.dataType = dataType
+        self.default = default
+        self.children = children
+        self.parent = None
+        self.array = array
+        self.writable = writable
+        self.storable = storable
+        self.dynamic = False
+        self.keyable = False
+        self.hidden = False
+        self.readable = True
+        self.limits: Dict[str, Any] = {}
+        self.fields: Dict[int, str] = {}
+
+        for child in children:
+            child.parent = self
+
+    def hasFn(self, fnType: int) -> bool:
+        return fnType in (MFn.kBase, MFn.kAttribute, self.fnType)
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+def _double(name, short, default=0.0, **kwargs):
+    return _Attribute(name, short, MFn.kNumericAttribute, MFnNumericData.kDouble, default=default, **kwargs)
+
+
+def _distance(name, short, default=0.0):
+    return _Attribute(name, short, MFn.kUnitAttribute, default=default)
+
+
+def _double3(name, short, suffixes='XYZ', default=0.0, unit=False):
+    make = _distance if unit else _double
+    children = tuple(make(f'{name}{axis}', f'{short}{axis.lower()}', default) for axis in suffixes)
+    return _Attribute(name, short, MFn.kNumericAttribute, MFnNumericData.k3Double, children=children)
+
+
+def _bool(name, short, default=False):
+    return _Attribute(name, short, MFn.kNumericAttribute, MFnNumericData.kBoolean, default=default)
+
+
+def _message(name, short):
+    return _Attribute(name, short, MFn.kMessageAttribute, storable=False)
+
+
+def _matrix(name, short, **kwargs):
+    return _Attribute(name, short, MFn.kMatrixAttribute, **kwargs)
+
+
+_DEPEND = lambda: (_message('message', 'msg'), _bool('isHistoricallyInteresting', 'ihi', True))
+_DAG = lambda: _DEPEND() + (
+    _bool('visibility', 'v', True),
+    _matrix('matrix', 'm', writable=False, storable=False),
+    _matrix('worldMatrix', 'wm', array=True, writable=False, storable=False),
+    )
+_TRANSFORM = lambda: _DAG() + (
+    _double3('translate', 't', unit=True),
+    _double3('rotate', 'r', unit=True),
+    _double3('scale', 's', default=1.0),
+    _double3('shear', 'sh', suffixes=('XY', 'XZ', 'YZ')),
+    _double3('rotateAxis', 'ra', unit=True),
+    _Attribute('rotateOrder', 'ro', MFn.kEnumAttribute, MFnNumericData.kShort, default=0),
+    _bool('inheritsTransform', 'it', True),
+    )
+
+# type name: (function set types, attribute factory, is shape)
+_NODE_TYPES = {
+    'network': ((MFn.kDependencyNode,), _DEPEND, False),
+    'addDoubleLinear': ((MFn.kDependencyNode,), lambda: _DEPEND() + (
+        _double('input1', 'i1'), _double('input2', 'i2'), _double('output', 'o', writable=False, storable=False),
+        ), False),
+    'multiplyDivide': ((MFn.kDependencyNode,), lambda: _DEPEND() + (
+        _double3('input1', 'i1'), _double3('input2', 'i2', default=1.0), _double3('output', 'o'),
+        ), False),
+    'blendWeighted': ((MFn.kDependencyNode,), lambda: _DEPEND() + (
+        _double('weight', 'w', array=True), _double('output', 'o'),
+        ), False),
+    'skinCluster': ((MFn.kDependencyNode, MFn.kGeometryFilt, MFn.kSkinClusterFilter), _DEPEND, False),
+    'container': ((MFn.kDependencyNode, MFn.kContainer), lambda: _DEPEND() + (
+        _message('hyperLayout', 'hl'), _message('rootTransform', 'rt'),
+        ), False),
+    'hyperLayout': ((MFn.kDependencyNode,), lambda: _DEPEND() + (
+        _Attribute('hyperPosition', 'hyp', MFn.kCompoundAttribute, array=True, children=(
+            _message('dependNode', 'dn'),
+            )),
+        ), False),
+    'transform': ((MFn.kDependencyNode, MFn.kDagNode, MFn.kTransform), _TRANSFORM, False),
+    'joint': ((MFn.kDependencyNode, MFn.kDagNode, MFn.kTransform, MFn.kJoint), lambda: _TRANSFORM() + (
+        _double3('jointOrient', 'jo', unit=True), _double3('inverseScale', 'is', default=1.0),
+        _double('radius', 'radi', 1.0), _bool('segmentScaleCompensate', 'ssc', True),
+        ), False),
+    'locator': ((MFn.kDependencyNode, MFn.kDagNode, MFn.kShape, MFn.kLocator), _DAG, True),
+    'mesh': ((MFn.kDependencyNode, MFn.kDagNode, MFn.kShape, MFn.kMesh), _DAG, True),
+    }
+
+_TYPE_IDS = {name: MTypeId(0x1000 + idx) for idx, name in enumerate(_NODE_TYPES)}
+
+
+class _Node:
+
+    __slots__ = (
+        'type', 'name', 'fnTypes', 'attributes', 'attributeList', 'values',
+        'sources', 'destinations', 'parents', 'children', 'alive',
+        '__weakref__'
+        )
+
+    def __init__(self, typ: str) -> None:
+
+        if typ not in _NODE_TYPES:
+            raise RuntimeError(f'Unknown node type: {typ}')
+
+        fnTypes, factory, _ = _NODE_TYPES[typ]
+        self.type = typ
+        self.name = typ
+        self.fnTypes = frozenset((MFn.kBase,) + fnTypes)
+        self.attributeList = list(factory())
+        self.attributes: Dict[str, _Attribute] = {}
+        for root in self.attributeList:
+            for attr in root.walk():
+                self.attributes[attr.name] = attr
+                self.attributes[attr.shortName] = attr
+
+        self.values: Dict[tuple, Any] = {}
+        self.sources: Dict[tuple, tuple] = {}
+        self.destinations: Dict[tuple, List[tuple]] = {}
+        self.parents: List['_Node'] = []
+        self.children: List['_Node'] = []
+        self.alive = False
+
+    @property
+    def isDag(self) -> bool:
+        return MFn.kDagNode in self.fnTypes
+
+    def allAttributes(self) -> List[_Attribute]:
+        attrs = []
+        for root in self.attributeList:
+            attrs.extend(root.walk())
+        return attrs
+
+
+class _Scene:
+
+    def __init__(self) -> None:
+        self.nodes: Dict[int, _Node] = {}
+        self.names: Dict[str, List[_Node]] = {}
+        self.counters = itertools.count(1)
+        self.currentContainer: Optional[_Node] = None
+
+    def register(self, node: _Node, name: Optional[str] = None) -> None:
+        node.alive = True
+        self.nodes[id(node)] = node
+        self.rename(node, name or f'{node.type}{next(self.counters)}', notify=False)
+        _notify('nodeAdded', node, MObject._wrap(node))
+
+    def unregister(self, node: _Node) -> None:
+        _notify('nodeRemoved', node, MObject._wrap(node))
+        node.alive = False
+        self.nodes.pop(id(node), None)
+        if node in self.names.get(node.name, ()):
+            self.names[node.name].remove(node)
+
+    def rename(self, node: _Node, name: str, notify: bool = True) -> None:
+
+        previous = node.name
+        if node in self.names.get(node.name, ()):
+            self.names[node.name].remove(node)
+
+        # dependency nodes and dag nodes under the same parent need unique names
+        while any(other is not node and (not node.isDag or other.parents == node.parents)
+                  for other in self.names.get(name, ())):
+            stem = name.rstrip('0123456789')
+            name = f'{stem}{next(self.counters)}'
+
+        node.name = name
+        self.names.setdefault(name, []).append(node)
+
+        if notify and name != previous:
+            _notify('nameChanged', node, MObject._wrap(node), previous)
+
+    def find(self, name: str) -> List[_Node]:
+
+        if '|' not in name:
+            return list(self.names.get(name, ()))
+
+        parts = [part for part in name.split('|') if part]
+        candidates = [node for node in self.names.get(parts[-1], ())]
+        return [node for node in candidates if self.__matchPath(node, parts)]
+
+    @staticmethod
+    def __matchPath(node: _Node, parts: List[str]) -> bool:
+        for part in reversed(parts):
+            if node is None or node.name != part:
+                return False
+            node = node.parents[0] if node.parents else None
+        return True
+
+    def ls(self, typ: Optional[str] = None) -> List[_Node]:
+        return [node for node in self.nodes.values() if typ is None or node.type == typ]
+
+
+_scene = _Scene()
+
+
+def _newScene() -> None:
+    """
+    :desc: every node is removed, callbacks registered on a node go with it
+    """
+    global _scene
+    for node in _scene.nodes.values():
+        _notify('preRemoval', node, MObject._wrap(node))
+        node.alive = False
+
+    for event, target in [key for key in _listeners if key[1] is not None]:
+        for callbackId in _listeners.pop((event, target)):
+            MMessage._callbacks.pop(callbackId, None)
+
+    _scene = _Scene()
+
+
+def _paths(node: _Node) -> List[Tuple[_Node, ...]]:
+    if not node.parents:
+        return [(node,)]
+    return [path + (node,) for parent in node.parents for path in _paths(parent)]
+
+
+def _fullName(path: Tuple[_Node, ...]) -> str:
+    return '|' + '|'.join(node.name for node in path)
+
+
+def _selectionName(node: _Node, path: Optional[Tuple[_Node, ...]] = None) -> str:
+
+    if not node.isDag:
+        return node.name
+
+    path = path or _paths(node)[0]
+    if len(_scene.names.get(node.name, ())) == 1 and len(node.parents) <= 1:
+        return node.name
+
+    return _fullName(path)
+
+
+# objects ---------------------------------------------------------------------
+
+class MObject:
+
+    __slots__ = ('_data',)
+
+    kNullObj: 'MObject'
+
+    def __init__(self, other: Optional['MObject'] = None) -> None:
+        self._data = other._data if isinstance(other, MObject) else None
+
+    @classmethod
+    def _wrap(cls, data: Any) -> 'MObject':
+        obj = MObject()
+        obj._data = data
+        return obj
+
+    def isNull(self) -> bool:
+        return self._data is None
+
+    def hasFn(self, fnType: int) -> bool:
+
+        if self._data is None:
+            return False
+
+        if isinstance(self._data, _Attribute):
+            return self._data.hasFn(fnType)
+
+        return fnType in self._data.fnTypes
+
+    def apiType(self) -> int:
+
+        if self._data is None:
+            return MFn.kInvalid
+
+        if isinstance(self._data, _Attribute):
+            return self._data.fnType
+
+        return max(self._data.fnTypes)
+
+    def apiTypeStr(self) -> str:
+        return str(self.apiType())
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, MObject) and other._data is self._data
+
+    def __ne__(self, other: Any) -> bool:
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+
+MObject.kNullObj = MObject()
+
+
+class MObjectHandle:
+
+    def __init__(self, obj: Optional[MObject] = None) -> None:
+        self._data = obj._data if obj is not None else None
+
+    def hashCode(self) -> int:
+        return id(self._data)
+
+    def isValid(self) -> bool:
+        return self._data is not None and getattr(self._data, 'alive', True)
+
+    def isAlive(self) -> bool:
+        return self.isValid()
+
+    def object(self) -> MObject:
+        return MObject._wrap(self._data)
+
+
+class MDagPath:
+
+    def __init__(self, other: Optional['MDagPath'] = None) -> None:
+        self._path: Tuple[_Node, ...] = other._path if other is not None else ()
+
+    @classmethod
+    def _wrap(cls, path: Tuple[_Node, ...]) -> 'MDagPath':
+        dagPath = MDagPath()
+        dagPath._path = path
+        return dagPath
+
+    @staticmethod
+    def getAllPathsTo(obj: MObject) -> List['MDagPath']:
+        return [MDagPath._wrap(path) for path in _paths(obj._data)]
+
+    @staticmethod
+    def getAPathTo(obj: MObject) -> 'MDagPath':
+        return MDagPath._wrap(_paths(obj._data)[0])
+
+    def fullPathName(self) -> str:
+        return _fullName(self._path)
+
+    def partialPathName(self) -> str:
+        return _selectionName(self._path[-1], self._path)
+
+    def node(self) -> MObject:
+        return MObject._wrap(self._path[-1])
+
+    def transform(self) -> MObject:
+        for node in reversed(self._path):
+            if MFn.kTransform in node.fnTypes:
+                return MObject._wrap(node)
+        raise RuntimeError('no transform in path')
+
+    def length(self) -> int:
+        return len(self._path)
+
+    def pop(self, num: int = 1) -> 'MDagPath':
+        self._path = self._path[:-num]
+        return self
+
+    def isValid(self) -> bool:
+        return bool(self._path) and all(node.alive for node in self._path)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, MDagPath) and other._path == self._path
+
+    def __hash__(self) -> int:
+        return hash(tuple(id(node) for node in self._path))
+
+
+# local matrix of transforms, scale * shear * rotateAxis * rotate * jointOrient * inverseScale * translate
+# the inverse scale only applies to joints with segmentScaleCompensate on
+_ROTATE_ORDERS = ((0, 1, 2), (1, 2, 0), (2, 0, 1), (0, 2, 1), (1, 0, 2), (2, 1, 0))
+
+
+def _rotation(angles: List[float], order: Tuple[int, int, int] = (0, 1, 2)) -> 'MMatrix':
+
+    matrix = MMatrix()
+    for axis in order:
+        cos, sin = math.cos(angles[axis]), math.sin(angles[axis])
+        values = [1.0 if row == col else 0.0 for row in range(4) for col in range(4)]
+        first, second = [(1, 2), (2, 0), (0, 1)][axis]
+        values[first * 4 + first] = values[second * 4 + second] = cos
+        values[first * 4 + second] = sin
+        values[second * 4 + first] = -sin
+        matrix = matrix * MMatrix(values)
+
+    return matrix
+
+
+def _localMatrix(plug: 'MPlug') -> 'MMatrix':
+
+    node = plug._node
+
+    def read(name: str) -> List[float]:
+        if name not in node.attributes:
+            return []
+        root = MPlug._make(node, node.attributes[name])
+        return [root.child(idx).asDouble() for idx in range(3)]
+
+    scale = read('scale')
+    shearXY, shearXZ, shearYZ = read('shear')
+    matrix = MMatrix([
+        scale[0], 0, 0, 0,
+        scale[1] * shearXY, scale[1], 0, 0,
+        scale[2] * shearXZ, scale[2] * shearYZ, scale[2], 0,
+        0, 0, 0, 1,
+        ])
+
+    order = _ROTATE_ORDERS[MPlug._make(node, node.attributes['rotateOrder']).asInt()]
+    matrix = matrix * _rotation(read('rotateAxis')) * _rotation(read('rotate'), order)
+
+    if 'jointOrient' in node.attributes:
+        matrix = matrix * _rotation(read('jointOrient'))
+
+        if MPlug._make(node, node.attributes['segmentScaleCompensate']).asBool():
+            inverse = read('inverseScale')
+            matrix = matrix * MMatrix([
+                1 / inverse[0], 0, 0, 0, 0, 1 / inverse[1], 0, 0, 0, 0, 1 / inverse[2], 0, 0, 0, 0, 1
+                ])
+
+    translate = read('translate')
+    return matrix * MMatrix([1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, translate[0], translate[1], translate[2], 1])
+
+
+def _worldMatrix(node: _Node, index: int) -> 'MMatrix':
+    """
+    :desc: world matrix of the instance index of node, parents stop at a node not inheriting its transform
+    """
+    matrix = MMatrix()
+    for member in reversed(_paths(node)[index]):
+        if MFn.kTransform in member.fnTypes:
+            matrix = matrix * _localMatrix(MPlug._make(member, member.attributes['matrix']))
+            if not MPlug._make(member, member.attributes['inheritsTransform']).asBool():
+                break
+
+    return matrix
+
+
+# plugs -----------------------------------------------------------------------
+
+class MPlug:
+
+    __slots__ = ('_node', '_attr', '_indices', '_element')
+
+    def __init__(self, *args) -> None:
+
+        self._node = self._attr = None
+        self._indices: Tuple[int, ...] = ()
+        self._element = False
+
+        if len(args) == 1 and isinstance(args[0], MPlug):
+            other = args[0]
+            self._node, self._attr = other._node, other._attr
+            self._indices, self._element = other._indices, other._element
+
+        elif len(args) == 2:
+            self._node, self._attr = args[0]._data, args[1]._data
+
+    @classmethod
+    def _make(cls, node: _Node, attr: _Attribute, indices: tuple = (), element: bool = False) -> 'MPlug':
+        plug = MPlug()
+        plug._node, plug._attr, plug._indices, plug._element = node, attr, indices, element
+        return plug
+
+    def _key(self) -> tuple:
+        return (self._attr.name, self._indices)
+
+    def _state(self) -> tuple:
+        return (self._node, self._attr, self._indices, self._element)
+
+    @property
+    def isNull(self) -> bool:
+        return self._attr is None
+
+    @property
+    def isArray(self) -> bool:
+        return self._attr.array and not self._element
+
+    @property
+    def isElement(self) -> bool:
+        return self._element
+
+    @property
+    def isCompound(self) -> bool:
+        return bool(self._attr.children)
+
+    @property
+    def isChild(self) -> bool:
+        return self._attr.parent is not None
+
+    @property
+    def isDestination(self) -> bool:
+        return self._key() in self._node.sources
+
+    @property
+    def isSource(self) -> bool:
+        return bool(self._node.destinations.get(self._key()))
+
+    @property
+    def isConnected(self) -> bool:
+        return self.isDestination or self.isSource
+
+    def attribute(self) -> MObject:
+        return MObject._wrap(self._attr)
+
+    def node(self) -> MObject:
+        return MObject._wrap(self._node)
+
+    def numChildren(self) -> int:
+        return len(self._attr.children)
+
+    def child(self, index: Any) -> 'MPlug':
+
+        if isinstance(index, MObject):
+            attr = index._data
+        else:
+            attr = self._attr.children[index]
+
+        return MPlug._make(self._node, attr, self._indices, False)
+
+    def parent(self) -> 'MPlug':
+        parent = self._attr.parent
+        return MPlug._make(self._node, parent, self._indices, parent.array)
+
+    def array(self) -> 'MPlug':
+        return MPlug._make(self._node, self._attr, self._indices[:-1], False)
+
+    def elementByLogicalIndex(self, index: int) -> 'MPlug':
+        return MPlug._make(self._node, self._attr, self._indices + (index,), True)
+
+    def elementByPhysicalIndex(self, index: int) -> 'MPlug':
+        return self.elementByLogicalIndex(self.getExistingArrayAttributeIndices()[index])
+
+    def logicalIndex(self) -> int:
+        return self._indices[-1]
+
+    def numElements(self) -> int:
+        return len(self.getExistingArrayAttributeIndices())
+
+    def getExistingArrayAttributeIndices(self) -> List[int]:
+
+        depth = len(self._indices)
+        indices = set()
+        for attr in self._attr.walk():
+            for name, idx in itertools.chain(self._node.values, self._node.sources, self._node.destinations):
+                if name == attr.name and len(idx) > depth and idx[:depth] == self._indices:
+                    indices.add(idx[depth])
+
+        return sorted(indices)
+
+    def name(self) -> str:
+        return self.partialName(includeNodeName=True)
+
+    def partialName(
+            self,
+            includeNodeName: bool = False,
+            includeNonMandatoryIndices: bool = False,
+            includeInstancedIndices: bool = False,
+            useAlias: bool = False,
+            useFullAttributePath: bool = False,
+            useLongNames: bool = False
+            ) -> str:
+
+        attr = self._attr
+        name = attr.name if useLongNames else attr.shortName
+        if self._element:
+            name += f'[{self._indices[-1]}]'
+
+        if useFullAttributePath and attr.parent is not None:
+            name = f'{self.parent().partialName(useFullAttributePath=True, useLongNames=useLongNames)}.{name}'
+
+        if includeNodeName:
+            name = f'{_selectionName(self._node)}.{name}'
+
+        return name
+
+    # values
+
+    def __value(self) -> Any:
+        return self._node.values.get(self._key(), self._attr.default)
+
+    def __set(self, value: Any) -> None:
+        if self.isDestination:
+            raise RuntimeError(f'{self.name()} is connected')
+        self._node.values[self._key()] = value
+        _notifyAttribute(MNodeMessage.kAttributeSet, self)
+
+    def asDouble(self) -> float:
+        return float(self.__value() or 0.0)
+
+    def asFloat(self) -> float:
+        return float(self.__value() or 0.0)
+
+    def asInt(self) -> int:
+        return int(self.__value() or 0)
+
+    asShort = asChar = asInt
+
+    def asBool(self) -> bool:
+        return bool(self.__value())
+
+    def asString(self) -> str:
+        return self.__value() or ''
+
+    def asMObject(self) -> MObject:
+        if self._attr.name == 'matrix' and MFn.kTransform in self._node.fnTypes:
+            return MObject._wrap(_localMatrix(self))
+
+        if self._attr.name == 'worldMatrix' and self._indices:
+            return MObject._wrap(_worldMatrix(self._node, self._indices[-1]))
+
+        value = self.__value()
+        if value is None and self._attr.fnType == MFn.kMatrixAttribute:
+            value = MMatrix()
+        return MObject._wrap(value)
+
+    def setDouble(self, value: float) -> None:
+        self.__set(float(value))
+
+    setFloat = setDouble
+
+    def setInt(self, value: int) -> None:
+        self.__set(int(value))
+
+    setShort = setChar = setInt
+
+    def setBool(self, value: bool) -> None:
+        self.__set(bool(value))
+
+    def setString(self, value: str) -> None:
+        self.__set(str(value))
+
+    def setMObject(self, value: MObject) -> None:
+        self.__set(value._data)
+
+    def asMDataHandle(self) -> 'MDataHandle':
+        return MDataHandle(MPlug(self))
+
+    def setMDataHandle(self, handle: 'MDataHandle') -> None:
+        if self.isDestination:
+            raise RuntimeError(f'{self.name()} is connected')
+
+        for (name, indices), value in handle._staged.items():
+            self._node.values[(name, indices)] = value
+
+        handle._staged.clear()
+        _notifyAttribute(MNodeMessage.kAttributeSet, self)
+
+    def destructHandle(self, handle: 'MDataHandle') -> None:
+        handle._staged.clear()
+
+    def isDefaultValue(self, forceEval: bool = True) -> bool:
+
+        if self._attr.children:
+            return all(self.child(idx).isDefaultValue() for idx in range(self.numChildren()))
+
+        return self._key() not in self._node.values or self.__value() == self._attr.default
+
+    # connections
+
+    def source(self) -> 'MPlug':
+        state = self._node.sources.get(self._key())
+        return MPlug._make(*state) if state else MPlug()
+
+    def destinations(self) -> List['MPlug']:
+        return [MPlug._make(*state) for state in self._node.destinations.get(self._key(), ())]
+
+    def connectedTo(self, asDst: bool, asSrc: bool) -> List['MPlug']:
+
+        plugs = []
+        if asDst and self.isDestination:
+            plugs.append(self.source())
+
+        if asSrc:
+            plugs.extend(self.destinations())
+
+        return plugs
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, MPlug) and other._state() == self._state()
+
+    __hash__ = None
+
+
+def _connect(src: MPlug, dst: MPlug) -> None:
+
+    if dst.isDestination:
+        raise RuntimeError(f'{dst.name()} is already connected')
+
+    dst._node.sources[dst._key()] = src._state()
+    src._node.destinations.setdefault(src._key(), []).append(dst._state())
+    _notifyConnection(src, dst, True)
+
+
+def _disconnect(src: MPlug, dst: MPlug) -> None:
+
+    if dst._node.sources.get(dst._key()) != src._state():
+        raise RuntimeError(f'{src.name()} is not connected to {dst.name()}')
+
+    del dst._node.sources[dst._key()]
+    src._node.destinations[src._key()].remove(dst._state())
+    _notifyConnection(src, dst, False)
+
+
+def _notifyConnection(src: MPlug, dst: MPlug, made: bool) -> None:
+
+    msg = MNodeMessage.kConnectionMade if made else MNodeMessage.kConnectionBroken
+    msg |= MNodeMessage.kOtherPlugSet
+    _notifyAttribute(msg | MNodeMessage.kIncomingDirection, dst, src)
+    _notifyAttribute(msg, src, dst)
+    _notify('connection', dst._node, src, dst, made)
+
+
+# math and data ---------------------------------------------------------------
+
+class MMatrix:
+
+    def __init__(self, values: Any = None) -> None:
+
+        if values is None:
+            values = [1.0 if row == col else 0.0 for row in range(4) for col in range(4)]
+
+        elif isinstance(values, MMatrix):
+            values = list(values._values)
+
+        else:
+            values = [float(value) for row in values for value in (row if isinstance(row, (list, tuple)) else [row])]
+
+        if len(values) != 16:
+            raise ValueError('MMatrix needs 16 values')
+
+        self._values = values
+
+    def __len__(self) -> int:
+        return 16
+
+    def __getitem__(self, index: int) -> float:
+        return self._values[index]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def getElement(self, row: int, col: int) -> float:
+        return self._values[row * 4 + col]
+
+    def __mul__(self, other: 'MMatrix') -> 'MMatrix':
+        a, b = self._values, other._values
+        return MMatrix([
+            sum(a[row * 4 + k] * b[k * 4 + col] for k in range(4))
+            for row in range(4) for col in range(4)
+            ])
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, MMatrix) and other._values == self._values
+
+
+class MPoint(tuple):
+
+    def __new__(cls, x=0.0, y=0.0, z=0.0, w=1.0):
+        return super().__new__(cls, (float(x), float(y), float(z), float(w)))
+
+
+class MVector(tuple):
+
+    def __new__(cls, x=0.0, y=0.0, z=0.0):
+        return super().__new__(cls, (float(x), float(y), float(z)))
+
+
+MDoubleArray = MFloatArray = MIntArray = MPointArray = MVectorArray = list
+
+
+class MFnMatrixData:
+
+    def __init__(self, obj: Optional[MObject] = None) -> None:
+        self._matrix = obj._data if obj is not None and obj._data is not None else MMatrix()
+
+    def create(self, matrix: MMatrix) -> MObject:
+        self._matrix = MMatrix(matrix)
+        return MObject._wrap(self._matrix)
+
+    def matrix(self) -> MMatrix:
+        return self._matrix
+
+
+class _ArrayData:
+
+    def __init__(self, obj: Optional[MObject] = None) -> None:
+        self._array = list(obj._data) if obj is not None and obj._data is not None else []
+
+    def create(self, array: list) -> MObject:
+        self._array = list(array)
+        return MObject._wrap(self._array)
+
+    def array(self) -> list:
+        return self._array
+
+
+MFnDoubleArrayData = MFnFloatArrayData = MFnIntArrayData = _ArrayData
+MFnPointArrayData = MFnVectorArrayData = _ArrayData
+
+
+class MDataHandle:
+    """
+    :desc: handle on the value of a plug, writes are staged and reach the node
+    when the handle is given back to MPlug.setMDataHandle
+    """
+
+    def __init__(self, plug: Optional['MPlug'] = None, staged: Optional[Dict[tuple, Any]] = None) -> None:
+        self._plug = plug
+        self._staged: Dict[tuple, Any] = staged if staged is not None else {}
+
+    def _get(self, attr: _Attribute) -> Any:
+        key = (attr.name, self._plug._indices)
+        if key in self._staged:
+            return self._staged[key]
+        return self._plug._node.values.get(key, attr.default)
+
+    def _put(self, attr: _Attribute, value: Any) -> None:
+        self._staged[(attr.name, self._plug._indices)] = value
+
+
+def _handleAccessors(suffix: str, convert: Any, width: int) -> None:
+
+    if width == 1:
+        def get(self):
+            return convert(self._get(self._plug._attr) or 0)
+
+        def put(self, value):
+            self._put(self._plug._attr, convert(value))
+
+        setattr(MDataHandle, f'as{suffix}', get)
+        setattr(MDataHandle, f'set{suffix}', put)
+        return
+
+    def get(self):
+        return tuple(convert(self._get(child) or 0) for child in self._plug._attr.children[:width])
+
+    def put(self, *values):
+        for child, value in zip(self._plug._attr.children, values):
+            self._put(child, convert(value))
+
+    setattr(MDataHandle, f'as{suffix}{width}', get)
+    setattr(MDataHandle, f'set{width}{suffix}', put)
+
+
+for _suffix, _convert in (
+        ('Bool', bool), ('Char', int), ('Short', int), ('Int', int), ('Float', float), ('Double', float)
+        ):
+    _handleAccessors(_suffix, _convert, 1)
+    if _convert is not bool and _suffix != 'Char':
+        _handleAccessors(_suffix, _convert, 2)
+        _handleAccessors(_suffix, _convert, 3)
+
+
+class MArrayDataBuilder:
+
+    def __init__(self, handle: 'MArrayDataHandle') -> None:
+        self._handle = handle
+        self._staged: Dict[tuple, Any] = {}
+        self._indices = set(handle._indices)
+
+    def addElement(self, index: int) -> MDataHandle:
+        self._indices.add(index)
+        return MDataHandle(self._handle._element(index), self._staged)
+
+    def elementCount(self) -> int:
+        return len(self._indices)
+
+
+class MArrayDataHandle:
+
+    def __init__(self, handle: MDataHandle) -> None:
+        if not handle._plug.isArray:
+            raise RuntimeError(f'{handle._plug.name()} is not an array')
+
+        self._handle = handle
+        # existing logical indices, read once like maya reads the array block once
+        self._indices = handle._plug.getExistingArrayAttributeIndices()
+        self._existing = set(self._indices)
+        self._current: Optional[int] = self._indices[0] if self._indices else None
+
+    def _element(self, index: int) -> 'MPlug':
+        return self._handle._plug.elementByLogicalIndex(index)
+
+    def elementCount(self) -> int:
+        return len(self._indices)
+
+    def jumpToLogicalElement(self, index: int) -> None:
+        if index not in self._existing:
+            raise RuntimeError(f'no element at logical index {index}')
+        self._current = index
+
+    def inputValue(self) -> MDataHandle:
+        if self._current is None:
+            raise RuntimeError('the array has no element')
+        return MDataHandle(self._element(self._current), self._handle._staged)
+
+    outputValue = inputValue
+
+    def builder(self) -> MArrayDataBuilder:
+        return MArrayDataBuilder(self)
+
+    def set(self, builder: MArrayDataBuilder) -> None:
+        self._handle._staged.update(builder._staged)
+
+
+# function sets ---------------------------------------------------------------
+
+class MFnAttribute:
+
+    def __init__(self, obj: Optional[MObject] = None) -> None:
+        self._attr: Optional[_Attribute] = obj._data if obj is not None else None
+
+    def _create(self, attr: _Attribute) -> MObject:
+        attr.dynamic = True
+        self._attr = attr
+        return MObject._wrap(attr)
+
+    @property
+    def name(self) -> str:
+        return self._attr.name
+
+    @property
+    def shortName(self) -> str:
+        return self._attr.shortName
+
+    @property
+    def parent(self) -> MObject:
+        return MObject._wrap(self._attr.parent)
+
+    @property
+    def dynamic(self) -> bool:
+        return self._attr.dynamic
+
+    def setNiceNameOverride(self, name: str) -> None:
+        pass
+
+
+def _flag(name: str) -> property:
+    return property(
+            lambda self: getattr(self._attr, name, False),
+            lambda self, value: setattr(self._attr, name, value) if hasattr(self._attr, name) else None
+            )
+
+
+for _name in ('writable', 'storable', 'array', 'keyable', 'hidden', 'readable'):
+    setattr(MFnAttribute, _name, _flag(_name))
+
+
+def _limit(name: str) -> Tuple[Any, Any, Any]:
+    return (
+            lambda self: name in self._attr.limits,
+            lambda self: self._attr.limits[name],
+            lambda self, value: self._attr.limits.__setitem__(name, value)
+            )
+
+
+class _LimitedAttribute(MFnAttribute):
+
+    @property
+    def default(self) -> Any:
+        return self._attr.default
+
+    hasMin, getMin, setMin = _limit('min')
+    hasMax, getMax, setMax = _limit('max')
+    hasSoftMin, getSoftMin, setSoftMin = _limit('softMin')
+    hasSoftMax, getSoftMax, setSoftMax = _limit('softMax')
+
+
+class MFnNumericAttribute(_LimitedAttribute):
+
+    def create(self, longName: str, shortName: str, numericType: int, default: Any = 0) -> MObject:
+        return self._create(_Attribute(
+                longName, shortName, MFn.kNumericAttribute, numericType, default=default
+                ))
+
+    def numericType(self) -> int:
+        return self._attr.numericType
+
+
+class MFnUnitAttribute(_LimitedAttribute):
+    kInvalid = 0
+    kAngle = 1
+    kDistance = 2
+    kTime = 3
+
+    def create(self, longName: str, shortName: str, unitType: int, default: float = 0.0) -> MObject:
+        return self._create(_Attribute(longName, shortName, MFn.kUnitAttribute, default=default))
+
+    def unitType(self) -> int:
+        return self.kDistance
+
+
+class MFnTypedAttribute(MFnAttribute):
+
+    def create(self, longName: str, shortName: str, dataType: int, default: Any = None) -> MObject:
+        return self._create(_Attribute(longName, shortName, MFn.kTypedAttribute, dataType=dataType))
+
+    def attrType(self) -> int:
+        return self._attr.dataType
+
+
+class MFnEnumAttribute(MFnAttribute):
+
+    def create(self, longName: str, shortName: str, default: int = 0) -> MObject:
+        return self._create(_Attribute(
+                longName, shortName, MFn.kEnumAttribute, MFnNumericData.kShort, default=default
+                ))
+
+    @property
+    def default(self) -> int:
+        return self._attr.default
+
+    def addField(self, name: str, value: int) -> None:
+        self._attr.fields[value] = name
+
+    def getMin(self) -> int:
+        return min(self._attr.fields, default=0)
+
+    def getMax(self) -> int:
+        return max(self._attr.fields, default=0)
+
+    def fieldName(self, value: int) -> str:
+        if value not in self._attr.fields:
+            raise RuntimeError(f'{value} is not a field of {self._attr.name}')
+        return self._attr.fields[value]
+
+
+class MFnMessageAttribute(MFnAttribute):
+
+    def create(self, longName: str, shortName: str) -> MObject:
+        return self._create(_message(longName, shortName))
+
+
+class MFnMatrixAttribute(MFnAttribute):
+    kFloat = 0
+    kDouble = 1
+
+    def create(self, longName: str, shortName: str, precision: int = kDouble) -> MObject:
+        return self._create(_matrix(longName, shortName))
+
+
+class MFnDependencyNode:
+
+    kNormalAttr = 0
+    kLocalDynamicAttr = 1
+    kExtensionAttr = 2
+
+    def __init__(self, obj: Optional[MObject] = None) -> None:
+        self._node: Optional[_Node] = obj._data if obj is not None else None
+
+    def object(self) -> MObject:
+        return MObject._wrap(self._node)
+
+    def create(self, typ: str, name: Optional[str] = None) -> MObject:
+        self._node = _Node(typ)
+        _scene.register(self._node, name)
+        return MObject._wrap(self._node)
+
+    def name(self) -> str:
+        return self._node.name
+
+    def absoluteName(self) -> str:
+        return f':{self._node.name}'
+
+    def setName(self, name: str) -> str:
+        _scene.rename(self._node, name)
+        return self._node.name
+
+    @property
+    def typeName(self) -> str:
+        return self._node.type
+
+    @property
+    def typeId(self) -> MTypeId:
+        return _TYPE_IDS[self._node.type]
+
+    def hasUniqueName(self) -> bool:
+        return len(_scene.names.get(self._node.name, ())) == 1
+
+    def hasAttribute(self, name: str) -> bool:
+        return name in self._node.attributes
+
+    def attributeCount(self) -> int:
+        return len(self._node.allAttributes())
+
+    def attribute(self, index: Any) -> MObject:
+
+        if isinstance(index, str):
+            if index not in self._node.attributes:
+                raise RuntimeError(f'{self._node.name} has no attribute {index}')
+            return MObject._wrap(self._node.attributes[index])
+
+        return MObject._wrap(self._node.allAttributes()[index])
+
+    def attributeClass(self, attr: MObject) -> int:
+        return self.kLocalDynamicAttr if attr._data.dynamic else self.kNormalAttr
+
+    def findPlug(self, attr: Any, wantNetworkedPlug: bool = True) -> MPlug:
+
+        if isinstance(attr, MObject):
+            return MPlug._make(self._node, attr._data)
+
+        if attr not in self._node.attributes:
+            raise RuntimeError(f'{self._node.name} has no attribute {attr}')
+
+        return MPlug._make(self._node, self._node.attributes[attr])
+
+    def getConnections(self) -> List[MPlug]:
+
+        plugs = []
+        for name, indices in dict.fromkeys(itertools.chain(self._node.sources, self._node.destinations)):
+            attr = self._node.attributes[name]
+            plugs.append(MPlug._make(self._node, attr, indices, attr.array and bool(indices)))
+
+        return plugs
+
+
+class MFnDagNode(MFnDependencyNode):
+
+    def __init__(self, obj: Any = None) -> None:
+
+        if isinstance(obj, MDagPath):
+            self._path = obj
+            obj = obj.node()
+
+        else:
+            self._path = None
+
+        super().__init__(obj)
+
+        if self._node is not None and not self._node.isDag:
+            raise RuntimeError(f'{self._node.name} is not a dag node')
+
+    def create(self, typ: str, name: Optional[str] = None, parent: MObject = MObject.kNullObj) -> MObject:
+        modifier = MDagModifier()
+        obj = modifier.createNode(typ, parent)
+        if name:
+            modifier.renameNode(obj, name)
+        modifier.doIt()
+        self._node = obj._data
+        return obj
+
+    def parentCount(self) -> int:
+        return len(self._node.parents)
+
+    def parent(self, index: int) -> MObject:
+        return MObject._wrap(self._node.parents[index])
+
+    def childCount(self) -> int:
+        return len(self._node.children)
+
+    def child(self, index: int) -> MObject:
+        return MObject._wrap(self._node.children[index])
+
+    def isChildOf(self, node: MObject) -> bool:
+        return any(parent is node._data for parent in self._node.parents)
+
+    def isParentOf(self, node: MObject) -> bool:
+        return any(child is node._data for child in self._node.children)
+
+    def fullPathName(self) -> str:
+        return self.getPath().fullPathName()
+
+    def partialPathName(self) -> str:
+        return self.getPath().partialPathName()
+
+    def getPath(self) -> MDagPath:
+        return self._path or MDagPath.getAPathTo(MObject._wrap(self._node))
+
+
+def _members(container: _Node) -> List[_Node]:
+
+    layout = container.sources.get(('hyperLayout', ()))
+    if layout is None:
+        return []
+
+    layout = layout[0]
+    entries = sorted((key[1], state[0]) for key, state in layout.sources.items() if key[0] == 'dependNode')
+    return [node for _, node in entries if node.alive]
+
+
+class MFnContainerNode(MFnDependencyNode):
+
+    kGeneric = 0
+    kParentAnchor = 1
+    kChildAnchor = 2
+
+    def getMembers(self) -> List[MObject]:
+        return [MObject._wrap(node) for node in _members(self._node)]
+
+    def getPublishedPlugs(self) -> Tuple[List[MPlug], List[str]]:
+        return [], []
+
+    def getPublishedNodes(self, kind: int) -> Tuple[List[str], List[MObject]]:
+        return [], []
+
+    def getParentContainer(self) -> MObject:
+        for node in _scene.nodes.values():
+            if MFn.kContainer in node.fnTypes and self._node in _members(node):
+                return MObject._wrap(node)
+        return MObject()
+
+    def getSubcontainers(self) -> List[MObject]:
+        return [MObject._wrap(node) for node in _members(self._node) if MFn.kContainer in node.fnTypes]
+
+    def getRootTransform(self) -> MObject:
+        source = MPlug._make(self._node, self._node.attributes['rt']).source()
+        return source.node() if not source.isNull else MObject()
+
+    def isCurrent(self) -> bool:
+        return _scene.currentContainer is self._node
+
+    def makeCurrent(self, current: bool) -> None:
+        _scene.currentContainer = self._node if current else None
+
+    @staticmethod
+    def getCurrentAsMObject() -> MObject:
+        return MObject._wrap(_scene.currentContainer)
+
+
+# modifiers -------------------------------------------------------------------
+
+class MDGModifier:
+
+    def __init__(self) -> None:
+        self._operations: List[Tuple[Any, Any]] = []
+
+    def _queue(self, do, undo) -> None:
+        self._operations.append((do, undo))
+
+    def createNode(self, typ: Any, *args) -> MObject:
+
+        node = _Node(typ)
+        node.name = ''
+        if node.isDag:
+            raise RuntimeError(f'{typ} is a dag node, use a MDagModifier')
+
+        self._queueCreated(node, None)
+        return MObject._wrap(node)
+
+    def renameNode(self, obj: MObject, name: str) -> None:
+        node = obj._data
+        previous = []
+
+        def do():
+            previous.append(node.name)
+            _scene.rename(node, name)
+
+        self._queue(do, lambda: _scene.rename(node, previous.pop()))
+
+    def connect(self, src: MPlug, dst: MPlug) -> None:
+        src, dst = MPlug(src), MPlug(dst)
+        self._queue(lambda: _connect(src, dst), lambda: _disconnect(src, dst))
+
+    def disconnect(self, src: MPlug, dst: MPlug) -> None:
+        src, dst = MPlug(src), MPlug(dst)
+        self._queue(lambda: _disconnect(src, dst), lambda: _connect(src, dst))
+
+    def __newValue(self, plug: MPlug, value: Any) -> None:
+        plug = MPlug(plug)
+        key = plug._key()
+        previous = []
+
+        def do():
+            previous.append(plug._node.values.get(key))
+            plug._node.values[key] = value
+            _notifyAttribute(MNodeMessage.kAttributeSet, plug)
+
+        def undo():
+            plug._node.values[key] = previous.pop()
+            _notifyAttribute(MNodeMessage.kAttributeSet, plug)
+
+        self._queue(do, undo)
+
+    def newPlugValue(self, plug: MPlug, value: MObject) -> None:
+        self.__newValue(plug, value._data)
+
+    def newPlugValueBool(self, plug: MPlug, value: bool) -> None:
+        self.__newValue(plug, bool(value))
+
+    def newPlugValueInt(self, plug: MPlug, value: int) -> None:
+        self.__newValue(plug, int(value))
+
+    newPlugValueShort = newPlugValueChar = newPlugValueInt
+
+    def newPlugValueDouble(self, plug: MPlug, value: float) -> None:
+        self.__newValue(plug, float(value))
+
+    newPlugValueFloat = newPlugValueDouble
+
+    def newPlugValueString(self, plug: MPlug, value: str) -> None:
+        self.__newValue(plug, str(value))
+
+    def addAttribute(self, obj: MObject, attr: MObject) -> None:
+        node, attribute = obj._data, attr._data
+        self._queue(lambda: _addAttribute(node, attribute), lambda: _removeAttribute(node, attribute))
+
+    def removeAttribute(self, obj: MObject, attr: MObject) -> None:
+        node, attribute = obj._data, attr._data
+        self._queue(lambda: _removeAttribute(node, attribute), lambda: _addAttribute(node, attribute))
+
+    def deleteNode(self, obj: MObject) -> None:
+        node = obj._data
+        deleted = []
+        self._queue(lambda: deleted.append(_deleteNode(node)), lambda: _restoreNode(deleted.pop()))
+
+    def _queueCreated(self, node: _Node, parent: Optional[_Node]) -> None:
+
+        def do():
+            if parent is not None:
+                node.parents.append(parent)
+                parent.children.append(node)
+            _scene.register(node, node.name or None)
+            if parent is not None:
+                _notifyParent('parentAdded', MDagMessage.kParentAdded, node, parent)
+
+        def undo():
+            if parent is not None:
+                _notifyParent('parentRemoved', MDagMessage.kParentRemoved, node, parent)
+                node.parents.remove(parent)
+                parent.children.remove(node)
+            _scene.unregister(node)
+
+        self._queue(do, undo)
+
+    def doIt(self) -> None:
+        for do, _ in self._operations:
+            do()
+
+    def undoIt(self) -> None:
+        for _, undo in reversed(self._operations):
+            undo()
+
+
+def _addAttribute(node: _Node, attribute: _Attribute) -> None:
+
+    node.attributeList.append(attribute)
+    for item in attribute.walk():
+        node.attributes[item.name] = node.attributes[item.shortName] = item
+
+    _notifyAttributeList(MNodeMessage.kAttributeAdded, node, attribute)
+
+
+def _removeAttribute(node: _Node, attribute: _Attribute) -> None:
+
+    _notifyAttributeList(MNodeMessage.kAttributeRemoved, node, attribute)
+    node.attributeList.remove(attribute)
+    for item in attribute.walk():
+        node.attributes.pop(item.name, None)
+        node.attributes.pop(item.shortName, None)
+
+
+def _notifyAttributeList(msg: int, node: _Node, attribute: _Attribute) -> None:
+    plug = MPlug._make(node, attribute)
+    _notify('attributeAddedOrRemoved', node, msg, plug)
+    _notifyAttribute(msg, plug)
+
+
+def _deleteNode(node: _Node) -> tuple:
+    """
+    :desc: delete node and its dag children, connections are broken first like maya does
+    :return: state restoring the nodes
+    """
+    nodes = [node]
+    for item in nodes:
+        nodes.extend(child for child in item.children if len(child.parents) == 1)
+
+    for item in nodes:
+        _notify('preRemoval', item, MObject._wrap(item))
+
+    def state(item, key):
+        attr = item.attributes[key[0]]
+        return item, attr, key[1], attr.array and len(key[1]) > 0
+
+    # (source state, destination state), a connection between two deleted nodes is listed once
+    connections = {}
+    for item in nodes:
+        for key, source in item.sources.items():
+            connections[(source, state(item, key))] = None
+        for key, destinations in item.destinations.items():
+            connections.update(dict.fromkeys((state(item, key), destination) for destination in destinations))
+
+    connections = list(connections)
+    for src, dst in connections:
+        _disconnect(MPlug._make(*src), MPlug._make(*dst))
+
+    parents = []
+    for item in reversed(nodes):
+        parents.append((item, list(item.parents)))
+        for parent in item.parents:
+            _notifyParent('parentRemoved', MDagMessage.kParentRemoved, item, parent)
+            parent.children.remove(item)
+        item.parents = []
+        _scene.unregister(item)
+
+    return nodes, parents, connections
+
+
+def _restoreNode(state: tuple) -> None:
+
+    nodes, parents, connections = state
+    for item, itemParents in reversed(parents):
+        _scene.register(item, item.name)
+        for parent in itemParents:
+            item.parents.append(parent)
+            parent.children.append(item)
+            _notifyParent('parentAdded', MDagMessage.kParentAdded, item, parent)
+
+    for src, dst in connections:
+        _connect(MPlug._make(*src), MPlug._make(*dst))
+
+
+class MDagModifier(MDGModifier):
+
+    def createNode(self, typ: Any, parent: MObject = MObject.kNullObj) -> MObject:
+
+        node = _Node(typ)
+        node.name = ''
+
+        if not node.isDag:
+            raise RuntimeError(f'{typ} is not a dag node, use a MDGModifier')
+
+        parentNode = parent._data if parent is not None else None
+        if parentNode is None and _NODE_TYPES[typ][2]:
+            transform = _Node('transform')
+            transform.name = ''
+            self._queueCreated(transform, None)
+            self._queueCreated(node, transform)
+            return MObject._wrap(transform)
+
+        self._queueCreated(node, parentNode)
+        return MObject._wrap(node)
+
+    def reparentNode(self, obj: MObject, parent: MObject = MObject.kNullObj) -> None:
+        node = obj._data
+        previous = list(node.parents)
+
+        def setParents(parents):
+            for old in node.parents:
+                _notifyParent('parentRemoved', MDagMessage.kParentRemoved, node, old)
+                old.children.remove(node)
+            node.parents = []
+            for new in parents:
+                node.parents.append(new)
+                new.children.append(node)
+                _notifyParent('parentAdded', MDagMessage.kParentAdded, node, new)
+
+        self._queue(
+                lambda: setParents([parent._data] if parent._data is not None else []),
+                lambda: setParents(previous)
+                )
+
+
+# selection -------------------------------------------------------------------
+
+class MSelectionList:
+
+    kMergeNormal = 0
+    kXORWithList = 1
+    kRemoveFromList = 2
+
+    def __init__(self, other: Optional['MSelectionList'] = None) -> None:
+        self._items: List[tuple] = []
+        self._keys: Dict[Any, int] = {}
+        if other is not None:
+            self.copy(other)
+
+    @staticmethod
+    def __key(item: tuple) -> Any:
+        node, path, plug = item
+        if plug is not None:
+            return ('plug', id(node), plug._key())
+        if path is not None:
+            return ('path', tuple(id(part) for part in path))
+        return ('node', id(node))
+
+    def __reindex(self) -> None:
+        self._keys = {self.__key(item): idx for idx, item in enumerate(self._items)}
+
+    def __append(self, item: tuple, merge: bool = True) -> None:
+        key = self.__key(item)
+        if merge and key in self._keys:
+            return
+        self._keys[key] = len(self._items)
+        self._items.append(item)
+
+    @staticmethod
+    def __items(entry: Any) -> List[tuple]:
+
+        if isinstance(entry, MPlug):
+            return [(entry._node, None, MPlug(entry))]
+
+        if isinstance(entry, MDagPath):
+            return [(entry._path[-1], entry._path, None)]
+
+        if isinstance(entry, MObject):
+            node = entry._data
+            if node is None:
+                raise RuntimeError('null object')
+            path = _paths(node)[0] if node.isDag else None
+            return [(node, path, None)]
+
+        if isinstance(entry, str):
+            nodeName, _, attr = entry.partition('.')
+            nodes = _scene.find(nodeName)
+            if not nodes:
+                raise RuntimeError(f'({entry}) Object does not exist')
+
+            if attr:
+                node = nodes[0]
+                return [(node, None, MFnDependencyNode(MObject._wrap(node)).findPlug(attr.split('.')[-1]))]
+
+            items = []
+            for node in nodes:
+                items.append((node, _paths(node)[0] if node.isDag else None, None))
+            return items
+
+        raise TypeError(f'can not add {type(entry)} to a selection list')
+
+    def add(self, entry: Any, mergeWithExisting: bool = True) -> 'MSelectionList':
+        for item in self.__items(entry):
+            self.__append(item, mergeWithExisting)
+        return self
+
+    def length(self) -> int:
+        return len(self._items)
+
+    def isEmpty(self) -> bool:
+        return not self._items
+
+    def clear(self) -> 'MSelectionList':
+        self._items = []
+        self._keys = {}
+        return self
+
+    def copy(self, other: 'MSelectionList') -> 'MSelectionList':
+        self._items = list(other._items)
+        self._keys = dict(other._keys)
+        return self
+
+    def remove(self, index: int) -> 'MSelectionList':
+        self._items.pop(index)
+        self.__reindex()
+        return self
+
+    def replace(self, index: int, entry: Any) -> 'MSelectionList':
+        self._items[index] = self.__items(entry)[0]
+        self.__reindex()
+        return self
+
+    def getDependNode(self, index: int) -> MObject:
+        if not 0 <= index < len(self._items):
+            raise IndexError('index out of range')
+        return MObject._wrap(self._items[index][0])
+
+    def getDagPath(self, index: int) -> MDagPath:
+        node, path, _ = self._items[index]
+        if path is None:
+            raise RuntimeError(f'{node.name} is not a dag node')
+        return MDagPath._wrap(path)
+
+    def getPlug(self, index: int) -> MPlug:
+        plug = self._items[index][2]
+        if plug is None:
+            raise RuntimeError('item is not a plug')
+        return MPlug(plug)
+
+    def getSelectionStrings(self, index: Optional[int] = None) -> List[str]:
+
+        items = self._items if index is None else [self._items[index]]
+        strings = []
+        for node, path, plug in items:
+            if plug is not None:
+                strings.append(plug.name())
+            else:
+                strings.append(_selectionName(node, path))
+
+        return strings
+
+    def hasItem(self, entry: Any) -> bool:
+        return any(self.__key(item) in self._keys for item in self.__items(entry))
+
+    def merge(self, other: 'MSelectionList', strategy: int = kMergeNormal) -> 'MSelectionList':
+
+        if strategy == self.kMergeNormal:
+            for item in other._items:
+                self.__append(item)
+
+        elif strategy == self.kRemoveFromList:
+            self._items = [item for item in self._items if self.__key(item) not in other._keys]
+            self.__reindex()
+
+        elif strategy == self.kXORWithList:
+            common = {key for key in other._keys if key in self._keys}
+            self._items = [item for item in self._items if self.__key(item) not in common]
+            self._items += [item for item in other._items if self.__key(item) not in common]
+            self.__reindex()
+
+        return self
+
+    def intersect(self, other: 'MSelectionList', expandToLeaves: bool = False) -> 'MSelectionList':
+        self._items = [item for item in self._items if self.__key(item) in other._keys]
+        self.__reindex()
+        return self
+
+
+# iterators -------------------------------------------------------------------
+
+class MItDependencyGraph:
+
+    kUpstream = 0
+    kDownstream = 1
+    kDepthFirst = 0
+    kBreadthFirst = 1
+    kNodeLevel = 0
+    kPlugLevel = 1
+
+    def __init__(
+            self,
+            root: MObject,
+            fnType: int = MFn.kInvalid,
+            direction: int = kDownstream,
+            traversal: int = kDepthFirst,
+            level: int = kNodeLevel
+            ) -> None:
+
+        self._fnType = fnType
+        self._upstream = direction == self.kUpstream
+        self._breadthFirst = traversal == self.kBreadthFirst
+        self._visited = {id(root._data)}
+        self._pending = [(root._data, (root._data,))]
+        self._current = None
+        self._pruned = False
+        self.next()
+
+    def __neighbours(self, node: _Node) -> List[_Node]:
+
+        if self._upstream:
+            states = node.sources.values()
+        else:
+            states = [state for states in node.destinations.values() for state in states]
+
+        return [state[0] for state in states]
+
+    def __push(self, node: _Node, path: tuple) -> None:
+        neighbours = [other for other in self.__neighbours(node) if id(other) not in self._visited]
+        self._visited.update(id(other) for other in neighbours)
+        entries = [(other, path + (other,)) for other in neighbours]
+        self._pending.extend(entries if self._breadthFirst else reversed(entries))
+
+    def next(self) -> None:
+
+        if self._current is not None and not self._pruned:
+            self.__push(*self._current)
+
+        self._pruned = False
+        while self._pending:
+            node, path = self._pending.pop(0) if self._breadthFirst else self._pending.pop()
+            if len(path) == 1 or self._fnType == MFn.kInvalid or self._fnType in node.fnTypes:
+                self._current = (node, path)
+                return
+
+            self.__push(node, path)
+
+        self._current = None
+
+    def prune(self) -> None:
+        self._pruned = True
+
+    def isDone(self) -> bool:
+        return self._current is None
+
+    def currentNode(self) -> MObject:
+        return MObject._wrap(self._current[0])
+
+    def getNodePath(self) -> List[MObject]:
+        return [MObject._wrap(node) for node in self._current[1]]
+
+
+class MItDependencyNodes:
+
+    def __init__(self, fnType: int = MFn.kInvalid) -> None:
+        self._nodes = [
+            node for node in list(_scene.nodes.values())
+            if fnType == MFn.kInvalid or fnType in node.fnTypes
+            ]
+        self._index = 0
+
+    def isDone(self) -> bool:
+        return self._index >= len(self._nodes)
+
+    def thisNode(self) -> MObject:
+        return MObject._wrap(self._nodes[self._index])
+
+    def next(self) -> None:
+        self._index += 1
+
+
+class MItDag:
+
+    kDepthFirst = 0
+    kBreadthFirst = 1
+
+    def __init__(self, traversal: int = kDepthFirst, fnType: int = MFn.kInvalid) -> None:
+        # the world is not yielded, top level nodes are at depth 1 below it
+        roots = [(node,) for node in _scene.nodes.values() if node.isDag and not node.parents]
+        self._base = 0
+        self.__start(roots, traversal, fnType)
+
+    def reset(self, root: Any, traversal: int = kDepthFirst, fnType: int = MFn.kInvalid) -> None:
+        path = root._path if isinstance(root, MDagPath) else _paths(root._data)[0]
+        self._base = len(path)
+        self.__start([path], traversal, fnType)
+
+    def __start(self, roots: List[tuple], traversal: int, fnType: int) -> None:
+        self._breadthFirst = traversal == self.kBreadthFirst
+        self._fnType = fnType
+        self._pending = list(roots if self._breadthFirst else reversed(roots))
+        self._current = None
+        self._pruned = False
+        self.next()
+
+    def __push(self, path: tuple) -> None:
+        entries = [path + (child,) for child in path[-1].children]
+        self._pending.extend(entries if self._breadthFirst else reversed(entries))
+
+    def next(self) -> None:
+
+        if self._current is not None and not self._pruned:
+            self.__push(self._current)
+
+        self._pruned = False
+        while self._pending:
+            path = self._pending.pop(0) if self._breadthFirst else self._pending.pop()
+            if self._fnType == MFn.kInvalid or self._fnType in path[-1].fnTypes:
+                self._current = path
+                return
+
+            self.__push(path)
+
+        self._current = None
+
+    def prune(self) -> None:
+        self._pruned = True
+
+    def isDone(self) -> bool:
+        return self._current is None
+
+    def currentItem(self) -> MObject:
+        return MObject._wrap(self._current[-1])
+
+    def getPath(self) -> MDagPath:
+        return MDagPath._wrap(self._current)
+
+    def depth(self) -> int:
+        return len(self._current) - self._base
+
+    def isInstanced(self, indirect: bool = True) -> bool:
+        return any(len(node.parents) > 1 for node in (self._current if indirect else self._current[-1:]))
+
+
+# messages --------------------------------------------------------------------
+
+class MMessage:
+
+    _ids = itertools.count(1)
+    # callback id: (event, target)
+    _callbacks: Dict[int, Tuple[str, Any]] = {}
+
+    @classmethod
+    def removeCallback(cls, callbackId: int) -> None:
+        if (entry := cls._callbacks.pop(callbackId, None)) is not None:
+            _listeners.get(entry, {}).pop(callbackId, None)
+
+    @classmethod
+    def removeCallbacks(cls, callbackIds: List[int]) -> None:
+        for callbackId in callbackIds:
+            cls.removeCallback(callbackId)
+
+
+# (event, node or None for every node): {callback id: (function, client data, node type)}
+_listeners: Dict[Tuple[str, Any], Dict[int, Tuple[Any, Any, Optional[str]]]] = {}
+
+
+def _listen(event: str, obj: Optional[MObject], function: Any, clientData: Any, nodeType: Optional[str] = None) -> int:
+
+    target = obj._data if obj is not None else None
+    callbackId = next(MMessage._ids)
+    MMessage._callbacks[callbackId] = (event, target)
+    _listeners.setdefault((event, target), {})[callbackId] = (function, clientData, nodeType)
+    return callbackId
+
+
+def _isNodeType(node: _Node, typ: str) -> bool:
+
+    if typ == 'dependNode':
+        return True
+
+    if typ == 'dagNode':
+        return node.isDag
+
+    if typ not in _NODE_TYPES:
+        return node.type == typ
+
+    return set(_NODE_TYPES[typ][0]) <= node.fnTypes
+
+
+def _notify(event: str, node: _Node, *args) -> None:
+    """
+    :desc: call the callbacks of event registered on node and on every node, with args and their client data
+    """
+    for target in (node, None):
+        if not (listeners := _listeners.get((event, target))):
+            continue
+
+        for function, clientData, nodeType in list(listeners.values()):
+            if nodeType is None or _isNodeType(node, nodeType):
+                function(*args, clientData)
+
+
+def _notifyAttribute(msg: int, plug: 'MPlug', otherPlug: Optional['MPlug'] = None) -> None:
+    _notify('attributeChanged', plug._node, msg, plug, otherPlug if otherPlug is not None else MPlug())
+
+
+def _notifyParent(event: str, msgType: int, node: _Node, parent: _Node) -> None:
+
+    if not (_listeners.get((event, None)) or _listeners.get(('allDagChanges', None))):
+        return
+
+    child, parentPath = MDagPath._wrap(_paths(node)[0]), MDagPath._wrap(_paths(parent)[0])
+    _notify(event, node, child, parentPath)
+    _notify('allDagChanges', node, msgType, child, parentPath)
+
+
+class MNodeMessage(MMessage):
+    kConnectionMade = 0x01
+    kConnectionBroken = 0x02
+    kAttributeEval = 0x04
+    kAttributeSet = 0x08
+    kAttributeLocked = 0x10
+    kAttributeUnlocked = 0x20
+    kAttributeAdded = 0x40
+    kAttributeRemoved = 0x80
+    kAttributeRenamed = 0x100
+    kIncomingDirection = 0x800
+    kOtherPlugSet = 0x4000
+
+    @staticmethod
+    def addAttributeChangedCallback(node: MObject, function: Any, clientData: Any = None) -> int:
+        return _listen('attributeChanged', node, function, clientData)
+
+    @staticmethod
+    def addAttributeAddedOrRemovedCallback(node: MObject, function: Any, clientData: Any = None) -> int:
+        return _listen('attributeAddedOrRemoved', node, function, clientData)
+
+    @staticmethod
+    def addNodePreRemovalCallback(node: MObject, function: Any, clientData: Any = None) -> int:
+        return _listen('preRemoval', node, function, clientData)
+
+    @staticmethod
+    def addNameChangedCallback(node: MObject, function: Any, clientData: Any = None) -> int:
+        return _listen('nameChanged', None if node.isNull() else node, function, clientData)
+
+
+class MDGMessage(MMessage):
+
+    @staticmethod
+    def addNodeAddedCallback(function: Any, nodeType: str = 'dependNode', clientData: Any = None) -> int:
+        return _listen('nodeAdded', None, function, clientData, nodeType)
+
+    @staticmethod
+    def addNodeRemovedCallback(function: Any, nodeType: str = 'dependNode', clientData: Any = None) -> int:
+        return _listen('nodeRemoved', None, function, clientData, nodeType)
+
+    @staticmethod
+    def addConnectionCallback(function: Any, clientData: Any = None) -> int:
+        return _listen('connection', None, function, clientData)
+
+
+class MDagMessage(MMessage):
+    kParentAdded = 0
+    kParentRemoved = 1
+
+    @staticmethod
+    def addAllDagChangesCallback(function: Any, clientData: Any = None) -> int:
+        return _listen('allDagChanges', None, function, clientData)
+
+    @staticmethod
+    def addParentAddedCallback(function: Any, clientData: Any = None) -> int:
+        return _listen('parentAdded', None, function, clientData)
+
+    @staticmethod
+    def addParentRemovedCallback(function: Any, clientData: Any = None) -> int:
+        return _listen('parentRemoved', None, function, clientData)
+
+
+class MContainerMessage(MMessage):
+
+    @staticmethod
+    def addPublishAttrCallback(function: Any, clientData: Any = None) -> int:
+        return _listen('publishAttr', None, function, clientData)
+
+    @staticmethod
+    def addBoundAttrCallback(function: Any, clientData: Any = None) -> int:
+        return _listen('boundAttr', None, function, clientData)
+
+
+class MNamespace:
+
+    _namespaces = {':'}
+
+    @classmethod
+    def namespaceExists(cls, namespace: str) -> bool:
+        return namespace.strip(':') in cls._namespaces
+
+    @classmethod
+    def addNamespace(cls, namespace: str, parent: Optional[str] = None) -> str:
+        cls._namespaces.add(namespace.strip(':'))
+        return namespace
+
+
+class MGlobal:
+
+    @staticmethod
+    def displayInfo(message: str) -> None:
+        print(message)
+
+    @staticmethod
+    def displayWarning(message: str) -> None:
+        print(f'Warning: {message}')
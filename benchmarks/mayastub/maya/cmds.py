@@ -0,0 +1,237 @@
+"""
+:desc: in memory stand-in for the maya.cmds commands used by grapher,
+backed by the scene of the OpenMaya stand-in
+only the flags grapher passes are supported
+"""
+from typing import List, Optional
+
+from .api import OpenMaya as om
+
+
+def _nodes(names) -> list:
+
+    if names is None:
+        return []
+
+    if isinstance(names, str):
+        names = [names]
+
+    nodes = []
+    for name in names:
+        found = om._scene.find(name)
+        if not found:
+            raise ValueError(f'No object matches name: {name}')
+        nodes.extend(found)
+
+    return nodes
+
+
+def _names(nodes) -> Optional[List[str]]:
+    return [om._selectionName(node) for node in nodes] or None
+
+
+def _isType(node, typ: str) -> bool:
+
+    if typ == 'dependNode':
+        return True
+
+    if typ == 'dagNode':
+        return node.isDag
+
+    return node.type == typ
+
+
+def file(*args, new: bool = False, force: bool = False, **kwargs) -> None:
+    if new:
+        om._newScene()
+
+
+def ls(*args, type: Optional[str] = None, long: bool = False, **kwargs) -> List[str]:
+
+    nodes = _nodes(args[0] if args else None) if args else om._scene.ls()
+    if type is not None:
+        nodes = [node for node in nodes if _isType(node, type)]
+
+    if long:
+        return [om._fullName(om._paths(node)[0]) if node.isDag else node.name for node in nodes]
+
+    return [om._selectionName(node) for node in nodes]
+
+
+def nodeType(name: str, derived: bool = False, isTypeName: bool = False, **kwargs):
+
+    if not isTypeName:
+        return _nodes(name)[0].type
+
+    if name not in om._NODE_TYPES:
+        raise RuntimeError(f'Unknown node type: {name}')
+
+    if not derived:
+        return name
+
+    # types sharing their function sets with another type have no derived types here
+    fnTypes = om._NODE_TYPES[name][0]
+    if sum(entry[0] == fnTypes for entry in om._NODE_TYPES.values()) > 1:
+        return [name]
+
+    return [typ for typ, entry in om._NODE_TYPES.items() if set(fnTypes) <= set(entry[0])]
+
+
+def _owners() -> dict:
+    return {id(member): other for other in om._scene.ls('container') for member in om._members(other)}
+
+
+def _removeMembers(container, nodes) -> None:
+
+    layout = container.sources.get(('hyperLayout', ()))
+    if layout is None:
+        return
+
+    fn = om.MFnDependencyNode(om.MObject._wrap(layout[0]))
+    positions = fn.findPlug('hyperPosition')
+    removed = set(map(id, nodes))
+
+    modifier = om.MDGModifier()
+    for key, state in list(layout[0].sources.items()):
+        if key[0] == 'dependNode' and id(state[0]) in removed:
+            element = positions.elementByLogicalIndex(key[1][0]).child(fn.attribute('dependNode'))
+            modifier.disconnect(om.MFnDependencyNode(om.MObject._wrap(state[0])).findPlug('message'), element)
+
+    modifier.doIt()
+
+
+def _addMembers(container, nodes, force: bool = False) -> None:
+
+    # maya refuses nodes of another container unless forced, forced nodes are moved
+    owners = _owners()
+    for node in nodes:
+        owner = owners.get(id(node))
+        if owner is None or owner is container:
+            continue
+        if not force:
+            raise RuntimeError(f'{node.name} is already in container {owner.name}')
+        _removeMembers(owner, [node])
+
+    layout = container.sources.get(('hyperLayout', ()))
+    modifier = om.MDGModifier()
+
+    if layout is None:
+        layout = modifier.createNode('hyperLayout')
+        modifier.connect(
+                om.MFnDependencyNode(layout).findPlug('message'),
+                om.MFnDependencyNode(om.MObject._wrap(container)).findPlug('hyperLayout')
+                )
+        modifier.doIt()
+        layout = layout._data
+
+    else:
+        layout = layout[0]
+
+    fn = om.MFnDependencyNode(om.MObject._wrap(layout))
+    positions = fn.findPlug('hyperPosition')
+    members = set(map(id, om._members(container)))
+    start = max([0] + [idx + 1 for idx in positions.getExistingArrayAttributeIndices()])
+
+    modifier = om.MDGModifier()
+    for node in nodes:
+        if id(node) in members:
+            continue
+
+        members.add(id(node))
+        element = positions.elementByLogicalIndex(start).child(fn.attribute('dependNode'))
+        modifier.connect(om.MFnDependencyNode(om.MObject._wrap(node)).findPlug('message'), element)
+        start += 1
+
+    modifier.doIt()
+
+
+def listHistory(*args, **kwargs) -> Optional[List[str]]:
+
+    seen = {}
+    pending = _nodes(args[0] if args else None)
+    while pending:
+        node = pending.pop()
+        if id(node) in seen:
+            continue
+
+        seen[id(node)] = node
+        pending.extend(state[0] for state in node.sources.values())
+
+    return _names(seen.values())
+
+
+def listRelatives(
+        *args,
+        children: bool = False,
+        parent: bool = False,
+        allDescendents: bool = False,
+        allParents: bool = False,
+        type: Optional[str] = None,
+        **kwargs
+        ) -> Optional[List[str]]:
+
+    nodes = _nodes(args[0] if args else None)
+    found = []
+
+    for node in nodes:
+        if parent or allParents:
+            found.extend(node.parents)
+
+        elif allDescendents:
+            pending = list(node.children)
+            while pending:
+                child = pending.pop()
+                found.append(child)
+                pending.extend(child.children)
+
+        else:
+            found.extend(node.children)
+
+    if type is not None:
+        found = [node for node in found if node.type == type]
+
+    return _names(found)
+
+
+def addAttr(name: str, longName: Optional[str] = None, attributeType: str = 'double', **kwargs) -> None:
+
+    longName = longName or kwargs.get('ln')
+    attributeType = kwargs.get('at', attributeType)
+    node = _nodes(name)[0]
+
+    if attributeType == 'bool':
+        attr = om._bool(longName, kwargs.get('sn', longName))
+    else:
+        attr = om._double(longName, kwargs.get('sn', longName), default=kwargs.get('dv', 0.0))
+
+    attr.dynamic = True
+    om._addAttribute(node, attr)
+
+
+def container(*args, q: bool = False, e: bool = False, edit: bool = False, query: bool = False, **kwargs):
+
+    if q or query:
+        current = om._scene.currentContainer
+        return current.name if current is not None else None
+
+    if e or edit:
+        if 'current' in kwargs:
+            nodes = _nodes(kwargs['current']) if kwargs['current'] else []
+            om._scene.currentContainer = nodes[0] if nodes else None
+            return
+
+        added = kwargs.get('addNode')
+        if added is not None:
+            _addMembers(_nodes(args[0])[0], _nodes(added), kwargs.get('force', False))
+
+        removed = kwargs.get('removeNode')
+        if removed is not None:
+            _removeMembers(_nodes(args[0])[0], _nodes(removed))
+        return
+
+    fn = om.MFnDependencyNode()
+    obj = fn.create('container', kwargs.get('n') or kwargs.get('name'))
+    if kwargs.get('current'):
+        om._scene.currentContainer = obj._data
+
+    return fn.name()
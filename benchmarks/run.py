@@ -0,0 +1,432 @@
+"""
+:desc: time grapher on scenes of growing size without a maya session
+the maya modules are replaced by the in memory stand-in of benchmarks/mayastub,
+results are written to benchmarks/results.json and compared with the previous run
+
+usage: python benchmarks/run.py [--sizes 1000 10000 100000] [--repeat 3] [--only getDagRoots ...] [--profile]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+RESULTS = os.path.join(HERE, 'results.json')
+
+sys.path.insert(0, os.path.join(HERE, 'mayastub'))
+
+from maya import cmds  # noqa: E402
+from maya.api import OpenMaya as om  # noqa: E402
+
+
+def loadGrapher() -> Any:
+    """
+    :desc: import the repository as the grapher package whatever its folder name
+    """
+    spec = importlib.util.spec_from_file_location(
+            'grapher',
+            os.path.join(ROOT, '__init__.py'),
+            submodule_search_locations=[ROOT]
+            )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['grapher'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+grapher = loadGrapher()
+
+
+class Scene:
+    """
+    :desc: benchmark scene, a forest of transforms of the given size
+    with one network node per transform and a chain of addDoubleLinear
+    """
+
+    def __init__(self, size: int, depth: int = 4) -> None:
+
+        cmds.file(new=True, force=True)
+
+        modifier = om.MDagModifier()
+        self.transforms: List[om.MObject] = []
+        branching = max(2, round(size ** (1.0 / depth)))
+
+        for idx in range(size):
+            parent = self.transforms[(idx - 1) // branching] if idx else om.MObject.kNullObj
+            obj = modifier.createNode('transform', parent)
+            modifier.renameNode(obj, f'transform{idx}')
+            self.transforms.append(obj)
+
+        dgModifier = om.MDGModifier()
+        self.adders = []
+        for idx in range(size):
+            obj = dgModifier.createNode('addDoubleLinear')
+            dgModifier.renameNode(obj, f'add{idx}')
+            self.adders.append(obj)
+
+        modifier.doIt()
+        dgModifier.doIt()
+
+        self.size = size
+        self.graph = grapher.Graph()
+        for obj in self.transforms:
+            self.graph.add(obj)
+
+        self.half = grapher.Graph()
+        for obj in self.transforms[::2]:
+            self.half.add(obj)
+
+
+def caseGetDagRoots(scene: Scene) -> Callable[[], Any]:
+    return lambda: grapher.Graph.getDagRoots(grapher.Graph(scene.half))
+
+
+def caseDirectChildren(scene: Scene) -> Callable[[], Any]:
+    step = max(1, scene.size // 100)
+    nodes = [grapher.Node(obj) for obj in scene.transforms[::step]]
+
+    def run():
+        graph = grapher.Graph(scene.graph)
+        for node in nodes:
+            graph.directChildren(node)
+            graph.directParents(node)
+
+    return run
+
+
+def caseSetAlgebra(scene: Scene) -> Callable[[], Any]:
+
+    def run():
+        graph = grapher.Graph(scene.graph)
+        (graph & scene.half, graph | scene.half, graph - scene.half, graph ^ scene.half)
+        scene.half.issubset(graph)
+
+        graph -= scene.half
+        graph |= scene.half
+        graph ^= scene.half
+        graph &= scene.half
+
+    return run
+
+
+def caseIteration(scene: Scene) -> Callable[[], Any]:
+    return lambda: sum(1 for _ in scene.graph)
+
+
+def caseSetAttr(scene: Scene) -> Callable[[], Any]:
+    nodes = [grapher.Node(obj) for obj in scene.adders]
+
+    def run():
+        for idx, node in enumerate(nodes):
+            node['input1'] = float(idx)
+
+    return run
+
+
+def caseGraphSetAttr(scene: Scene) -> Callable[[], Any]:
+
+    grapher.arrays.requireNumpy()
+    graph = grapher.Graph()
+    for obj in scene.adders:
+        graph.add(obj)
+
+    return lambda: graph.setAttr('input2', 1.0)
+
+
+def caseConnect(scene: Scene) -> Callable[[], Any]:
+    pairs = [
+        (grapher.Node(src)['output'], grapher.Node(dst)['input1'])
+        for src, dst in zip(scene.adders, scene.adders[1:])
+        ]
+
+    def run():
+        with grapher.Graph.batch() as session:
+            for src, dst in pairs:
+                src.connect(dst, force=True)
+
+        session.undoIt()
+
+    return run
+
+
+def caseDescendants(scene: Scene) -> Callable[[], Any]:
+    root = grapher.Node(scene.transforms[0])
+
+    def run():
+        sum(1 for _ in root.descendants())
+        grapher.Graph.listRelatives(root, allDescendents=True)
+
+    return run
+
+
+def caseMatrices(scene: Scene) -> Callable[[], Any]:
+
+    grapher.arrays.requireNumpy()
+    graph = grapher.Graph(scene.graph)
+
+    def run():
+        graph.worldMatrices()
+        graph.setLocalMatrices(graph.localMatrices())
+
+    return run
+
+
+def caseQuery(scene: Scene) -> Callable[[], Any]:
+    root = scene.transforms[0]
+    return lambda: grapher.Graph.query(type='transform', under=root, where={'translateX': ('>=', 0.0)})
+
+
+def caseConnectivity(scene: Scene) -> Callable[[], Any]:
+
+    grapher.arrays.requireNumpy()
+    modifier = om.MDGModifier()
+    for src, dst in zip(scene.adders, scene.adders[1:]):
+        modifier.connect(om.MFnDependencyNode(src).findPlug('output', False), om.MFnDependencyNode(dst).findPlug('input2', False))
+
+    modifier.doIt()
+    graph = grapher.Graph()
+    for obj in scene.adders:
+        graph.add(obj)
+
+    def run():
+        connectivity = graph.connectivity()
+        connectivity.toposort()
+        connectivity.connectedComponents()
+        connectivity.findCycles()
+
+    return run
+
+
+def caseOwnership(scene: Scene) -> Callable[[], Any]:
+
+    step = max(1, scene.size // 10)
+    for start in range(0, scene.size, step):
+        container = grapher.Container.create()
+        container.addNodes([grapher.Node(obj) for obj in scene.adders[start:start + step]])
+
+    nodes = [grapher.Node(obj) for obj in scene.adders]
+
+    def run():
+        for node in nodes:
+            grapher.Container.ownerOf(node)
+
+    return run
+
+
+def caseArrays(scene: Scene) -> Callable[[], Any]:
+
+    np = grapher.arrays.requireNumpy()
+    plug = grapher.Node.create('blendWeighted')['weight']
+    values = np.arange(scene.size, dtype=float)
+    half = list(range(0, scene.size, 2))
+
+    def run():
+        plug.setArray(values)
+        plug.getArray()
+        plug.getArray(half)
+
+        with grapher.Graph.batch() as session:
+            plug.setArray(values[half] + 1.0, indices=half)
+
+        session.undoIt()
+
+    return run
+
+
+def caseInvalidation(scene: Scene) -> Callable[[], Any]:
+    """
+    :desc: edit the scene through modifiers and query the caches the edits make stale,
+    every edit is reverted so runs can repeat, a stale answer raises
+    """
+    count = max(1, scene.size // 100)
+    roots = [grapher.Node(obj) for obj in scene.transforms[1:count + 1]]
+    leaves = [grapher.Node(obj) for obj in scene.transforms[-count:]]
+    members = [grapher.Node.create('network') for _ in range(count)]
+    container = grapher.Container.create()
+    graph = grapher.Graph(scene.graph)
+
+    def check(condition: bool, message: str) -> None:
+        if not condition:
+            raise RuntimeError(f'stale cache: {message}')
+
+    def run():
+
+        with grapher.LiveGraph(nodeType='network') as live:
+            modifier = om.MDGModifier()
+            nodes = [modifier.createNode('network') for _ in range(count)]
+            modifier.doIt()
+            check(all(node in live for node in nodes), 'created node missing from the live graph')
+
+            for idx, node in enumerate(nodes):
+                modifier.renameNode(node, f'benchNetwork{idx}')
+            modifier.doIt()
+            check(live['benchNetwork0'] == nodes[0], 'renamed node not found by name in the live graph')
+
+            for node in nodes:
+                modifier.deleteNode(node)
+            modifier.doIt()
+            check(not any(node in live for node in nodes), 'deleted node still in the live graph')
+
+        # the hierarchy index of the graph has to follow the reparenting
+        for parent in roots:
+            graph.directChildren(parent)
+
+        modifier = om.MDagModifier()
+        previous = [om.MFnDagNode(leaf).parent(0) for leaf in leaves]
+        for leaf, parent in zip(leaves, roots):
+            modifier.reparentNode(leaf, parent)
+        modifier.doIt()
+        check(all(leaf in graph.directChildren(parent) for leaf, parent in zip(leaves, roots)), 'reparented child not found')
+
+        modifier.undoIt()
+        check(not any(leaf in graph.directChildren(parent) for leaf, parent in zip(leaves, roots)), 'child found under its previous parent')
+        check(all(om.MFnDagNode(leaf).parent(0) == parent for leaf, parent in zip(leaves, previous)), 'reparenting not undone')
+
+        # plugs looked up by name have to follow the added and removed attributes
+        modifier = om.MDGModifier()
+        for node in members:
+            node['message']
+            node.addAttr(longName='bench', attributeType='double')
+            check(not node['bench'].isNull, 'added attribute not found')
+            modifier.removeAttribute(node, node.dependencyNode.attribute('bench'))
+        modifier.doIt()
+
+        for node in members:
+            try:
+                node['bench']
+            except RuntimeError:
+                continue
+            raise RuntimeError('stale cache: removed attribute still found')
+
+        # owners have to follow the membership edits
+        container.addNodes(members)
+        check(all(grapher.Container.ownerOf(node) == container for node in members), 'member owner not found')
+
+        cmds.container(container.name, edit=True, removeNode=[node.name for node in members])
+        check(all(grapher.Container.ownerOf(node) is None for node in members), 'removed member still owned')
+        check(not any(node in container for node in members), 'removed member still in the container')
+
+    return run
+
+
+CASES: Dict[str, Callable[[Scene], Callable[[], Any]]] = {
+    'getDagRoots': caseGetDagRoots,
+    'directChildren': caseDirectChildren,
+    'setAlgebra': caseSetAlgebra,
+    'iteration': caseIteration,
+    'setAttr': caseSetAttr,
+    'graphSetAttr': caseGraphSetAttr,
+    'connect': caseConnect,
+    'descendants': caseDescendants,
+    'matrices': caseMatrices,
+    'query': caseQuery,
+    'connectivity': caseConnectivity,
+    'ownership': caseOwnership,
+    'arrays': caseArrays,
+    'invalidation': caseInvalidation,
+    }
+
+
+def measure(run: Callable[[], Any], repeat: int) -> float:
+    """
+    :desc: best wall time of repeat runs, in seconds
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def runCases(
+        sizes: List[int],
+        repeat: int,
+        only: Optional[List[str]],
+        profile: bool = False
+        ) -> Dict[str, Dict[str, Any]]:
+
+    results = {}
+    for size in sizes:
+        scene = Scene(size)
+
+        for name, case in CASES.items():
+            if only and name not in only:
+                continue
+
+            key = f'{name}[{size}]'
+            try:
+                run = case(scene)
+                results[key] = {'seconds': measure(run, repeat)}
+
+            except Exception as error:
+                results[key] = {'error': f'{type(error).__name__}: {error}'}
+                traceback.print_exc()
+
+            print(f'{key:<28} {format(results[key])}', flush=True)
+
+            if profile and 'error' not in results[key]:
+                with grapher.profile() as stats:
+                    run()
+                print(stats.report(limit=5), flush=True)
+
+    return results
+
+
+def format(result: Dict[str, Any]) -> str:
+
+    if 'error' in result:
+        return result['error']
+
+    return f'{result["seconds"] * 1000:10.2f} ms'
+
+
+def compare(previous: Dict[str, Dict[str, Any]], results: Dict[str, Dict[str, Any]]) -> None:
+
+    print('\ncompared with the previous run:')
+    for key, result in results.items():
+        before = previous.get(key, {}).get('seconds')
+        after = result.get('seconds')
+
+        if before is None or after is None:
+            continue
+
+        ratio = after / before if before else float('inf')
+        flag = '  REGRESSION' if ratio > 1.25 else ''
+        print(f'{key:<28} {before * 1000:10.2f} ms -> {after * 1000:10.2f} ms  x{ratio:.2f}{flag}')
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', nargs='+', choices=list(CASES))
+    parser.add_argument('--profile', action='store_true', help='print the api calls made by one run of each case')
+    parser.add_argument('--no-save', action='store_true', help='do not overwrite the stored results')
+    args = parser.parse_args(argv)
+
+    previous = {}
+    if os.path.exists(RESULTS):
+        with open(RESULTS) as stream:
+            previous = json.load(stream)
+
+    results = runCases(args.sizes, args.repeat, args.only, args.profile)
+
+    if previous:
+        compare(previous, results)
+
+    if not args.no_save:
+        with open(RESULTS, 'w') as stream:
+            json.dump(dict(previous, **results), stream, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from maya.api import OpenMaya as om
+
+
+class NodeCache:
+    """
+    :desc: value cached per node, keyed by the MObjectHandle hash code of the node
+    maya callbacks are registered when an entry is created,
+    they reset the value when it gets stale and drop the entry with the node
+    """
+
+    def __init__(self) -> None:
+        # key: [handle, value, callback ids]
+        self._entries: Dict[int, list] = {}
+
+    def _build(self, obj: om.MObject) -> Any:
+        raise NotImplementedError
+
+    def _callbacks(self, obj: om.MObject, key: int) -> List[int]:
+        return []
+
+    def get(self, obj: om.MObject) -> Any:
+
+        handle = om.MObjectHandle(obj)
+        key = handle.hashCode()
+        entry = self._entries.get(key)
+
+        # hash codes can collide, the entry has to hold this very node
+        if entry is not None and (not entry[0].isValid() or entry[0].object() != obj):
+            self.invalidate(key)
+            entry = None
+
+        if entry is None:
+            callbacks = [om.MNodeMessage.addNodePreRemovalCallback(obj, self.__onRemoved, key)]
+            callbacks.extend(self._callbacks(obj, key))
+            entry = self._entries[key] = [handle, None, callbacks]
+
+        if entry[1] is None:
+            entry[1] = self._build(obj)
+
+        return entry[1]
+
+    def reset(self, key: int) -> None:
+        """
+        :desc: drop the cached value, it is rebuilt on the next get
+        """
+        if entry := self._entries.get(key):
+            entry[1] = None
+
+    def invalidate(self, key: int) -> None:
+        """
+        :desc: drop the entry and its callbacks
+        """
+        if entry := self._entries.pop(key, None):
+            om.MMessage.removeCallbacks(entry[2])
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self.invalidate(key)
+
+    def __onRemoved(self, node: om.MObject, key: int) -> None:
+        self.invalidate(key)
+
+
+class PlugCache(NodeCache):
+    """
+    :desc: attribute name or alias to plug lookup per node
+    reset when an attribute is added or removed on the node
+    and when a container publishes or unpublishes an attribute,
+    static attributes can not be renamed, so only lookups through a dynamic attribute
+    or an alias check the plug still answers to the name, renames and alias edits need no callback
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__containerCallbacks: Optional[List[int]] = None
+
+    def _build(self, obj: om.MObject) -> Dict[Any, tuple]:
+        # item: (plug, whether the plug name has to be checked on lookup)
+        return {}
+
+    def _callbacks(self, obj: om.MObject, key: int) -> List[int]:
+
+        if obj.hasFn(om.MFn.kContainer) and self.__containerCallbacks is None:
+            self.__containerCallbacks = [
+                om.MContainerMessage.addPublishAttrCallback(self.__onPublished),
+                om.MContainerMessage.addBoundAttrCallback(self.__onPublished),
+                ]
+
+        return [om.MNodeMessage.addAttributeAddedOrRemovedCallback(obj, self.__onAttributeAddedOrRemoved, key)]
+
+    def find(self, obj: om.MObject, item: Union[str, int], finder: Callable[[Union[str, int]], om.MPlug]) -> om.MPlug:
+        """
+        :desc: cached plug of obj for item, finder(item) is called on a miss or a stale entry
+        """
+        plugs = self.get(obj)
+
+        entry = plugs.get(item)
+        if entry is not None and (not entry[1] or self.__answersTo(entry[0], item)):
+            return entry[0]
+
+        plug = finder(item)
+        plugs[item] = (plug, self.__needsCheck(obj, plug, item))
+        return plug
+
+    @staticmethod
+    def __needsCheck(obj: om.MObject, plug: om.MPlug, item: Union[str, int]) -> bool:
+
+        # published plugs belong to a member node, the publish callbacks keep them current
+        if not isinstance(item, str) or plug.node() != obj:
+            return False
+
+        fn = om.MFnAttribute(plug.attribute())
+        return fn.dynamic or item not in (fn.name, fn.shortName)
+
+    @staticmethod
+    def __answersTo(plug: om.MPlug, item: str) -> bool:
+
+        fn = om.MFnAttribute(plug.attribute())
+        return item in (fn.name, fn.shortName) or item == plug.partialName(useAlias=True)
+
+    def clear(self) -> None:
+        super().clear()
+
+        if self.__containerCallbacks is not None:
+            om.MMessage.removeCallbacks(self.__containerCallbacks)
+            self.__containerCallbacks = None
+
+    def __onAttributeAddedOrRemoved(self, msg: int, plug: om.MPlug, key: int) -> None:
+        self.reset(key)
+
+    def __onPublished(self, node: om.MObject, name: str, published: bool, clientData: Any) -> None:
+        self.reset(om.MObjectHandle(node).hashCode())
+
+
+class PublishedInterface:
+    """
+    :desc: published plugs and nodes of a container, by published name
+    """
+
+    __slots__ = ('plugs', 'nodes', 'parentAnchors', 'childAnchors')
+
+    def __init__(self, obj: om.MObject) -> None:
+
+        fn = om.MFnContainerNode(obj)
+        plugs, names = fn.getPublishedPlugs()
+        self.plugs: Dict[str, om.MPlug] = dict(zip(names, plugs))
+        self.nodes = self.__nodes(fn, om.MFnContainerNode.kGeneric)
+        self.parentAnchors = self.__nodes(fn, om.MFnContainerNode.kParentAnchor)
+        self.childAnchors = self.__nodes(fn, om.MFnContainerNode.kChildAnchor)
+
+    @staticmethod
+    def __nodes(fn: om.MFnContainerNode, kind: int) -> Dict[str, om.MObject]:
+        names, nodes = fn.getPublishedNodes(kind)
+        return dict(zip(names, nodes))
+
+
+class PublishedCache(NodeCache):
+    """
+    :desc: published interface per container
+    reset when the container publishes, unpublishes or binds an attribute,
+    and when attributes or connections of the container change,
+    published nodes are stored as connections on the container
+    """
+
+    MESSAGES = (
+        om.MNodeMessage.kAttributeAdded
+        | om.MNodeMessage.kAttributeRemoved
+        | om.MNodeMessage.kAttributeRenamed
+        | om.MNodeMessage.kConnectionMade
+        | om.MNodeMessage.kConnectionBroken
+        )
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__containerCallbacks: Optional[List[int]] = None
+
+    def _build(self, obj: om.MObject) -> PublishedInterface:
+        return PublishedInterface(obj)
+
+    def _callbacks(self, obj: om.MObject, key: int) -> List[int]:
+
+        if self.__containerCallbacks is None:
+            self.__containerCallbacks = [
+                om.MContainerMessage.addPublishAttrCallback(self.__onPublished),
+                om.MContainerMessage.addBoundAttrCallback(self.__onPublished),
+                ]
+
+        return [om.MNodeMessage.addAttributeChangedCallback(obj, self.__onAttributeChanged, key)]
+
+    def clear(self) -> None:
+        super().clear()
+
+        if self.__containerCallbacks is not None:
+            om.MMessage.removeCallbacks(self.__containerCallbacks)
+            self.__containerCallbacks = None
+
+    def __onAttributeChanged(self, msg: int, plug: om.MPlug, otherPlug: om.MPlug, key: int) -> None:
+        if msg & self.MESSAGES:
+            self.reset(key)
+
+    def __onPublished(self, node: om.MObject, name: str, published: bool, clientData: Any) -> None:
+        self.reset(om.MObjectHandle(node).hashCode())
+
+
+class NameCache:
+    """
+    :desc: node name to MObjectHandle lookup
+    emptied when any node is renamed or reparented, deleted nodes are skipped
+    """
+
+    def __init__(self) -> None:
+        self.__handles: Dict[str, om.MObjectHandle] = {}
+        self.__callbacks: Optional[List[int]] = None
+
+    def get(self, name: str) -> Optional[om.MObject]:
+
+        handle = self.__handles.get(name)
+        if handle is None:
+            return
+
+        if not handle.isValid():
+            del self.__handles[name]
+            return
+
+        return handle.object()
+
+    def set(self, name: str, obj: om.MObject) -> None:
+
+        if self.__callbacks is None:
+            self.__callbacks = [
+                om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, self.__onChanged),
+                om.MDagMessage.addAllDagChangesCallback(self.__onChanged),
+                ]
+
+        self.__handles[name] = om.MObjectHandle(obj)
+
+    def clear(self) -> None:
+        self.__handles.clear()
+
+        if self.__callbacks is not None:
+            om.MMessage.removeCallbacks(self.__callbacks)
+            self.__callbacks = None
+
+    def __onChanged(self, *args) -> None:
+        self.__handles.clear()
+
+
+class DagGeneration:
+    """
+    :desc: scene wide counter bumped when a dag node is parented, unparented or any node renamed
+    indexes built from dag paths store the value they were built at and are stale once it moved
+    """
+
+    def __init__(self) -> None:
+        self.__value = 0
+        self.__callbacks: Optional[List[int]] = None
+
+    @property
+    def value(self) -> int:
+
+        if self.__callbacks is None:
+            self.__callbacks = [
+                om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, self.__onChanged),
+                om.MDagMessage.addParentAddedCallback(self.__onChanged),
+                om.MDagMessage.addParentRemovedCallback(self.__onChanged),
+                ]
+
+        return self.__value
+
+    def clear(self) -> None:
+        self.__value += 1
+
+        if self.__callbacks is not None:
+            om.MMessage.removeCallbacks(self.__callbacks)
+            self.__callbacks = None
+
+    def __onChanged(self, *args) -> None:
+        self.__value += 1
+
+
+PLUG_CACHE = PlugCache()
+PUBLISHED_CACHE = PublishedCache()
+NAME_CACHE = NameCache()
+DAG_GENERATION = DagGeneration()
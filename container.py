@@ -1,19 +1,79 @@
-from typing import Union, List, Dict, Optional
+from typing import Any, Union, List, Dict, Optional, Set, Tuple
 
-from maya import cmds
 from maya.api import OpenMaya as om
 
+from . import shims
+from .cache import NodeCache, PUBLISHED_CACHE
 from .graph import Graph
+from .modifier import ModifierSession
 from .node import Node
 from .plug import Plug
 
 
+class MemberCache(NodeCache):
+    """
+    :desc: members of each container, as a Graph and a set of handle hash codes
+    membership lives in the connections of the container hyperLayout node,
+    the entry is reset when connections change on the container or its hyperLayout
+    """
+
+    CONNECTION_MESSAGES = om.MNodeMessage.kConnectionMade | om.MNodeMessage.kConnectionBroken
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__layoutCallbacks: Dict[int, int] = {}
+
+    def _build(self, obj: om.MObject) -> Tuple[Graph, Set[int]]:
+
+        graph = Graph()
+        hashes = set()
+        for member in om.MFnContainerNode(obj).getMembers():
+            graph.add(member)
+            hashes.add(om.MObjectHandle(member).hashCode())
+
+        self.__watchLayout(obj)
+        return graph, hashes
+
+    def _callbacks(self, obj: om.MObject, key: int) -> List[int]:
+        return [om.MNodeMessage.addAttributeChangedCallback(obj, self.__onChanged, key)]
+
+    def invalidate(self, key: int) -> None:
+        super().invalidate(key)
+
+        if (callback := self.__layoutCallbacks.pop(key, None)) is not None:
+            om.MMessage.removeCallback(callback)
+
+    def __watchLayout(self, obj: om.MObject) -> None:
+        """
+        :desc: follow the hyperLayout currently connected to the container
+        """
+        key = om.MObjectHandle(obj).hashCode()
+        if (callback := self.__layoutCallbacks.pop(key, None)) is not None:
+            om.MMessage.removeCallback(callback)
+
+        layout = om.MFnDependencyNode(obj).findPlug('hyperLayout', False).source()
+        if layout.isNull:
+            return
+
+        self.__layoutCallbacks[key] = om.MNodeMessage.addAttributeChangedCallback(
+                layout.node(),
+                self.__onChanged,
+                key
+                )
+
+    def __onChanged(self, msg: int, plug: om.MPlug, otherPlug: om.MPlug, key: int) -> None:
+        if msg & self.CONNECTION_MESSAGES:
+            self.reset(key)
+
+
+MEMBER_CACHE = MemberCache()
+
+
 class Container(Node):
 
     @classmethod
     def create(cls, name=None):
-        obj = om.MFnDependencyNode().create('container', name)
-        return cls(obj)
+        return cls(Node.create('container', name=name))
 
     @classmethod
     def containerize(
@@ -24,8 +84,7 @@ class Container(Node):
             ) -> 'Container':
 
         container = cls.create(name)
-        for node in graph:
-            container.addNode(node)
+        container.addNodes(graph)
 
         if setRootTransform:
             if dagRoots := graph.dagRoots:
@@ -44,51 +103,56 @@ class Container(Node):
     def __str__(self) -> str:
         return self.name
 
+    @classmethod
+    def ownerOf(cls, node: Union[str, om.MObject]) -> Optional['Container']:
+        """
+        :desc: container the node is a member of, answered by the scene ContainerIndex
+        """
+        return CONTAINER_INDEX.ownerOf(node)
+
     @property
     def parent(self) -> Optional['Container']:
-        if parent := self.fnContainer.getParentContainer():
-            if parent.isNull():
-                return
-            return self.__class__(parent)
+        return CONTAINER_INDEX.ownerOf(self)
 
     @property
     def children(self) -> List['Container']:
-        return_list = []
-        for item in self.fnContainer.getSubcontainers():
-            return_list.append(self.__class__(item))
+        return CONTAINER_INDEX.childrenOf(self)
 
-        return return_list
+    @property
+    def path(self) -> List['Container']:
+        """
+        :desc: containers from the top one down to this container included
+        """
+        return CONTAINER_INDEX.pathOf(self)
 
     @property
     def nodes(self) -> Graph:
+        graph, _ = MEMBER_CACHE.get(self)
+        return Graph(graph)
 
-        sel = Graph()
-        for item in self.fnContainer.getMembers():
-            sel.add(item)
-        return sel
-
-    def __publishNodes(self, attr) -> Dict[str, Node]:
-        names, nodes = self.fnContainer.getPublishedNodes(attr)
-        nodes = [Node(node) for node in nodes]
-        return dict(zip(names, nodes))
+    def __contains__(self, node: str | om.MObject) -> bool:
+        _, hashes = MEMBER_CACHE.get(self)
+        return om.MObjectHandle(Node(node)).hashCode() in hashes
 
     @property
     def publishParentAnchor(self) -> Dict[str, Node]:
-        return self.__publishNodes(self.fnContainer.kParentAnchor)
+        anchors = PUBLISHED_CACHE.get(self).parentAnchors
+        return {name: Node(node) for name, node in anchors.items()}
 
     @property
     def publishChildAnchor(self) -> Dict[str, Node]:
-        return self.__publishNodes(self.fnContainer.kChildAnchor)
+        anchors = PUBLISHED_CACHE.get(self).childAnchors
+        return {name: Node(node) for name, node in anchors.items()}
 
     @property
     def publishNodes(self) -> Dict[str, Node]:
-        return self.__publishNodes(self.fnContainer.kGeneric)
+        nodes = PUBLISHED_CACHE.get(self).nodes
+        return {name: Node(node) for name, node in nodes.items()}
 
     @property
     def publishPlugs(self) -> Dict[str, Plug]:
-        plugs, names = self.fnContainer.getPublishedPlugs()
-        plugs = [Plug(plug) for plug in plugs]
-        return dict(zip(names, plugs))
+        plugs = PUBLISHED_CACHE.get(self).plugs
+        return {name: Plug(plug) for name, plug in plugs.items()}
 
     @property
     def current(self) -> bool:
@@ -114,7 +178,7 @@ class Container(Node):
 
         node = Node(node)
 
-        if node not in self.nodes:
+        if node not in self:
             raise NameError(f'{node} is not part of the container')
 
         node['msg'] >> Node(self)['rt']
@@ -126,6 +190,196 @@ class Container(Node):
         return node
 
     def addNode(self, node: str | om.MObject) -> None:
+        self.addNodes([node])
+
+    def addNodes(self, graph: Union[Graph, List[str], List[Node]]) -> None:
+        """
+        :desc: add every given node to the container with a single container command
+        the api has no membership edit, the command goes through the shims and joins
+        the active modifier session in queue order, names are read when it runs
+        """
+        _, hashes = MEMBER_CACHE.get(self)
+
+        if isinstance(graph, om.MSelectionList):
+            nodes = [Node(graph.getDependNode(idx)) for idx in range(graph.length())]
+        else:
+            nodes = [Node(node) for node in graph]
+
+        objects = {}
+        for node in nodes:
+            key = om.MObjectHandle(node).hashCode()
+            if key not in hashes and node != self:
+                objects.setdefault(key, node)
+
+        if not objects:
+            return
 
-        node = Node(node)
-        cmds.container(self.name, addNode=str(node), e=True)
+        members = list(objects.values())
+
+        def doIt():
+            shims.addContainerNodes(self.name, [node.name for node in members])
+            self.__reset()
+
+        def undoIt():
+            shims.removeContainerNodes(self.name, [node.name for node in members])
+            self.__reset()
+
+        if (session := ModifierSession.active()) is not None:
+            session.command(doIt, undoIt)
+            return
+
+        doIt()
+
+    def __reset(self) -> None:
+        MEMBER_CACHE.reset(om.MObjectHandle(self).hashCode())
+        CONTAINER_INDEX.reset()
+
+
+class ContainerIndex:
+    """
+    :desc: owning container of every node of the scene and the container tree
+    built in one pass over the containers on first query,
+    member connections made or broken on a hyperLayout update the owner of the member,
+    containers created or deleted and hyperLayouts swapped rebuild the index on the next query
+    """
+
+    def __init__(self) -> None:
+        self.__owners: Optional[Dict[int, int]] = None
+        self.__layouts: Dict[int, int] = {}
+        self.__handles: Dict[int, om.MObjectHandle] = {}
+        self.__paths: Optional[Dict[int, Tuple[int, ...]]] = None
+        self.__callbacks: Optional[List[int]] = None
+
+    def __build(self) -> Dict[int, int]:
+
+        if self.__owners is not None:
+            return self.__owners
+
+        if self.__callbacks is None:
+            self.__callbacks = [
+                om.MDGMessage.addConnectionCallback(self.__onConnection),
+                om.MDGMessage.addNodeAddedCallback(self.__onContainerChanged, 'container'),
+                om.MDGMessage.addNodeRemovedCallback(self.__onContainerChanged, 'container'),
+                ]
+
+        owners, self.__layouts, self.__handles = {}, {}, {}
+        self.__paths = None
+
+        iterator = om.MItDependencyNodes(om.MFn.kContainer)
+        while not iterator.isDone():
+            obj = iterator.thisNode()
+            key = om.MObjectHandle(obj).hashCode()
+            self.__handles[key] = om.MObjectHandle(obj)
+
+            layout = om.MFnDependencyNode(obj).findPlug('hyperLayout', False).source()
+            if not layout.isNull:
+                self.__layouts[om.MObjectHandle(layout.node()).hashCode()] = key
+
+            for member in om.MFnContainerNode(obj).getMembers():
+                owners[om.MObjectHandle(member).hashCode()] = key
+
+            iterator.next()
+
+        self.__owners = owners
+        return owners
+
+    def __getPaths(self) -> Dict[int, Tuple[int, ...]]:
+        """
+        :desc: chain of container keys from the top container down to each container
+        """
+        owners = self.__build()
+        if self.__paths is not None:
+            return self.__paths
+
+        paths = {}
+        for key in self.__handles:
+            chain = []
+            current = key
+            while current is not None and current not in paths and current not in chain:
+                chain.append(current)
+                current = owners.get(current)
+
+            path = paths.get(current, ())
+            for item in reversed(chain):
+                path = path + (item,)
+                paths[item] = path
+
+        self.__paths = paths
+        return paths
+
+    def __container(self, key: Optional[int]) -> Optional[Container]:
+
+        if key is None or (handle := self.__handles.get(key)) is None or not handle.isValid():
+            return
+
+        return Container(handle.object())
+
+    def ownerOf(self, node: Union[str, om.MObject]) -> Optional[Container]:
+        """
+        :desc: container the node is a member of, None when it is in no container
+        """
+        return self.__container(self.__build().get(om.MObjectHandle(Node(node)).hashCode()))
+
+    def pathOf(self, container: Union[str, om.MObject]) -> List[Container]:
+        """
+        :desc: containers from the top one down to the given container included
+        """
+        path = self.__getPaths().get(om.MObjectHandle(Node(container)).hashCode(), ())
+        return [self.__container(key) for key in path]
+
+    def childrenOf(self, container: Union[str, om.MObject]) -> List[Container]:
+        """
+        :desc: containers that are direct members of the given container
+        """
+        key = om.MObjectHandle(Node(container)).hashCode()
+        owners = self.__build()
+        return [self.__container(other) for other in self.__handles if owners.get(other) == key]
+
+    def roots(self) -> List[Container]:
+        """
+        :desc: containers that are not member of another container
+        """
+        owners = self.__build()
+        return [self.__container(key) for key in self.__handles if key not in owners]
+
+    def reset(self) -> None:
+        """
+        :desc: rebuild the index on the next query
+        """
+        self.__owners = None
+        self.__paths = None
+
+    def clear(self) -> None:
+        self.reset()
+
+        if self.__callbacks is not None:
+            om.MMessage.removeCallbacks(self.__callbacks)
+            self.__callbacks = None
+
+    def __onConnection(self, source: om.MPlug, destination: om.MPlug, made: bool, clientData: Any) -> None:
+
+        if self.__owners is None:
+            return
+
+        target = om.MObjectHandle(destination.node()).hashCode()
+
+        if (container := self.__layouts.get(target)) is not None:
+            member = source.node()
+            key = om.MObjectHandle(member).hashCode()
+
+            if made:
+                self.__owners[key] = container
+            elif self.__owners.get(key) == container:
+                del self.__owners[key]
+
+            if member.hasFn(om.MFn.kContainer):
+                self.__paths = None
+
+        elif target in self.__handles and om.MFnAttribute(destination.attribute()).name == 'hyperLayout':
+            self.reset()
+
+    def __onContainerChanged(self, node: om.MObject, clientData: Any) -> None:
+        self.reset()
+
+
+CONTAINER_INDEX = ContainerIndex()
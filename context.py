@@ -1,20 +1,27 @@
 from contextlib import contextmanager
 
-from maya import cmds
+from maya.api import OpenMaya as om
+
+from .container import Container
 
 
 @contextmanager
 def withContainer(containerName=None) -> str:
-    current = cmds.container(q=True)
-
-    if containerName:
-        container = cmds.container(n=containerName, current=True)
+    """
+    :desc: create a container current for the with block,
+    the previously current container is restored on exit
+    """
+    current = om.MFnContainerNode.getCurrentAsMObject()
 
-    else:
-        container = cmds.container(current=True)
+    container = Container.create(containerName)
+    container.current = True
 
     try:
-        yield container
+        yield container.name
 
     finally:
-        cmds.container(edit=True, current=current if current else 0)
+        if not current.isNull():
+            om.MFnContainerNode(current).makeCurrent(True)
+
+        elif not (active := om.MFnContainerNode.getCurrentAsMObject()).isNull():
+            om.MFnContainerNode(active).makeCurrent(False)
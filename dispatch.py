@@ -0,0 +1,274 @@
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+from itertools import groupby
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from maya.api import OpenMaya as om
+
+from .arrays import PlugAccessor
+from .modifier import ModifierSession
+
+
+class MayaScheduler:
+    """
+    :desc: run callbacks on the maya main thread once maya is idle
+    """
+
+    def schedule(self, callback: Callable[[], None]) -> None:
+        import maya.utils
+        maya.utils.executeDeferred(callback)
+
+
+class ThreadScheduler:
+    """
+    :desc: a plain thread standing for the main thread, callbacks run in submission order
+    used to run the dispatcher outside of maya
+    """
+
+    def __init__(self) -> None:
+        self.__queue: queue.Queue = queue.Queue()
+        self.thread = threading.Thread(target=self.__loop, name='grapher-main', daemon=True)
+        self.thread.start()
+
+    def __enter__(self) -> 'ThreadScheduler':
+        return self
+
+    def __exit__(self, excType, excValue, traceback) -> None:
+        self.close()
+
+    def __loop(self) -> None:
+        while (callback := self.__queue.get()) is not None:
+            callback()
+
+    def schedule(self, callback: Callable[[], None]) -> None:
+        self.__queue.put(callback)
+
+    def close(self) -> None:
+        self.__queue.put(None)
+        self.thread.join()
+
+
+class _Operation:
+
+    __slots__ = ('function', 'args', 'kwargs', 'futures')
+
+    def __init__(self, function: Callable, args: tuple, kwargs: dict, future: Future) -> None:
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.futures = [future]
+
+
+class Dispatcher:
+    """
+    :desc: queue grapher operations from any thread and run them on the main thread
+    operations and plug values queued between two ticks run in one main thread call
+    in submission order, consecutive operations run inside one ModifierSession
+    so their connections, renames and creations share a doIt,
+    consecutive plug values sent with set are coalesced per plug and written by one modifier
+    before the next operation runs, so operations see the values sent before them,
+    an operation or value that raises has what it queued dropped, its future gets the error
+    and nothing of it reaches the scene
+    """
+
+    def __init__(self, scheduler: Any = None) -> None:
+        """
+        :param scheduler: object with a schedule(callback) method running callback on the main thread,
+        MayaScheduler by default
+        """
+        self.scheduler = scheduler if scheduler is not None else MayaScheduler()
+        self.__lock = threading.Lock()
+        self.__queue: List[Union[_Operation, Tuple[om.MPlug, tuple, Future]]] = []
+        self.__keys: Dict[Hashable, _Operation] = {}
+        self.__scheduled = False
+
+    def submit(self, function: Callable, *args, key: Optional[Hashable] = None, **kwargs) -> Future:
+        """
+        :desc: run function(*args, **kwargs) on the main thread
+        an operation submitted with the key of a queued one replaces it at its place in the queue,
+        both futures get the result of the last one
+        :return: future resolved once the batch holding the operation is done
+        :rtype: concurrent.futures.Future
+        """
+        future = Future()
+
+        with self.__lock:
+            if key is not None and (operation := self.__keys.get(key)) is not None:
+                operation.function, operation.args, operation.kwargs = function, args, kwargs
+                operation.futures.append(future)
+
+            else:
+                operation = _Operation(function, args, kwargs, future)
+                self.__queue.append(operation)
+                if key is not None:
+                    self.__keys[key] = operation
+
+            self.__request()
+
+        return future
+
+    def set(self, plug: om.MPlug, *value: Any) -> Future:
+        """
+        :desc: set a plug value on the main thread, only the last value sent
+        to a plug before the next operation or the tick is written
+        """
+        future = Future()
+
+        with self.__lock:
+            self.__queue.append((plug, value, future))
+            self.__request()
+
+        return future
+
+    def submitAsync(self, function: Callable, *args, **kwargs) -> asyncio.Future:
+        """
+        :desc: submit from an asyncio task, the returned future can be awaited
+        """
+        return asyncio.wrap_future(self.submit(function, *args, **kwargs))
+
+    def __request(self) -> None:
+        # called with the lock held, one flush is scheduled per tick
+        if not self.__scheduled:
+            self.__scheduled = True
+            self.scheduler.schedule(self.flush)
+
+    def flush(self) -> None:
+        """
+        :desc: run every queued operation, has to be called on the main thread
+        """
+        with self.__lock:
+            entries, self.__queue = self.__queue, []
+            self.__keys = {}
+            self.__scheduled = False
+
+        results = []
+        for isOperation, group in groupby(entries, key=lambda entry: isinstance(entry, _Operation)):
+            run = self.__runOperations if isOperation else self.__writeValues
+            results.extend(self.__runSession(run, list(group)))
+
+        for futures, value, error in results:
+            for future in futures:
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(value)
+
+    @staticmethod
+    def __runSession(run: Callable[[ModifierSession, list], List[tuple]], entries: list) -> List[tuple]:
+        """
+        :desc: run a group of queued entries inside one modifier session
+        """
+        results = []
+        session = ModifierSession()
+
+        try:
+            with session:
+                results.extend(run(session, entries))
+
+        except Exception as error:
+            # the batch modifier failed and was rolled back, nothing of it happened
+            results = [(futures, None, error) for futures, _, _ in results]
+
+        return results
+
+    @staticmethod
+    def __runOperations(session: ModifierSession, operations: List[_Operation]) -> List[tuple]:
+
+        results = []
+        for operation in operations:
+            mark = session.mark()
+            try:
+                value = operation.function(*operation.args, **operation.kwargs)
+                results.append((operation.futures, value, None))
+
+            except Exception as error:
+                session.rollback(mark)
+                results.append((operation.futures, None, error))
+
+        return results
+
+    @classmethod
+    def __writeValues(cls, session: ModifierSession, sets: List[Tuple[om.MPlug, tuple, Future]]) -> List[tuple]:
+        """
+        :desc: coalesce the values per plug, the last value sent wins
+        """
+        latest: Dict[tuple, list] = {}
+        for plug, value, future in sets:
+            key = (
+                om.MObjectHandle(plug.node()).hashCode(),
+                plug.partialName(includeNonMandatoryIndices=True, useFullAttributePath=True)
+                )
+
+            if key in latest:
+                latest[key][1] = value
+                latest[key][2].append(future)
+            else:
+                latest[key] = [plug, value, [future]]
+
+        mark = session.mark()
+        results = cls.__queueValues(session, list(latest.values()), False)
+
+        if results is None:
+            # a value failed half written, queue them again each on its own modifier so only failed ones are dropped
+            session.rollback(mark)
+            results = cls.__queueValues(session, list(latest.values()), True)
+
+        return results
+
+    @classmethod
+    def __queueValues(cls, session: ModifierSession, entries: List[list], isolated: bool) -> Optional[List[tuple]]:
+        """
+        :desc: queue the values on the session modifier,
+        None on the first error when the values are not isolated
+        """
+        results = []
+        for plug, value, futures in entries:
+            mark = session.mark() if isolated else None
+            try:
+                cls.__queueValue(session.modifier(), plug, value)
+                results.append((futures, None, None))
+
+            except Exception as error:
+                if not isolated:
+                    return
+
+                session.rollback(mark)
+                results.append((futures, None, error))
+
+        return results
+
+    @classmethod
+    def __queueValue(cls, modifier: om.MDGModifier, plug: om.MPlug, value: tuple) -> None:
+
+        if plug.isArray:
+            for idx, val in enumerate(value[0] if len(value) == 1 else value):
+                cls.__queueValue(modifier, plug.elementByLogicalIndex(idx), (val,))
+            return
+
+        try:
+            accessor = PlugAccessor(plug)
+
+        except TypeError:
+            # strings, typed data and compounds of them
+            if plug.isCompound:
+                for idx, val in enumerate(value[0] if len(value) == 1 else value):
+                    cls.__queueValue(modifier, plug.child(idx), (val,))
+
+            elif isinstance(value[0], str):
+                modifier.newPlugValueString(plug, value[0])
+
+            elif isinstance(value[0], om.MObject):
+                modifier.newPlugValue(plug, value[0])
+
+            else:
+                raise TypeError(f'{plug.name()} can not be set to {value!r}')
+
+        else:
+            if accessor.width == 1:
+                value = value[0]
+            else:
+                value = list(value[0] if len(value) == 1 else value)
+
+            accessor.write(modifier, plug, value)
@@ -1,26 +1,55 @@
-from typing import List, Any, Union, Optional, Iterator
+from itertools import islice
+from typing import List, Any, Union, Optional, Iterator, Dict, Callable, Tuple
 
-from maya import cmds
 from maya.api import OpenMaya as om
 
+from . import shims, transforms
+from .arrays import PlugAccessor, requireNumpy
+from .cache import DAG_GENERATION
+from .hierarchy import HierarchyIndex
+from .modifier import ModifierSession, dgModifier
 from .node import Node
+from .query import iterQuery
+from .snapshot import Snapshot
+from .topology import Connectivity
+from .traversal import (
+    iterAncestors, iterDependencyGraph, iterDescendants, iterNodes, typeConstraint, typeFilter
+    )
+
+# flags of the api implementations of cmds queries, short name or long name: long name
+HISTORY_FLAGS = {'f': 'future', 'future': 'future', 'lv': 'levels', 'levels': 'levels'}
+RELATIVES_FLAGS = {
+    'c': 'children', 'children': 'children',
+    'p': 'parent', 'parent': 'parent',
+    'ap': 'allParents', 'allParents': 'allParents',
+    'ad': 'allDescendents', 'allDescendents': 'allDescendents',
+    's': 'shapes', 'shapes': 'shapes',
+    'typ': 'type', 'type': 'type',
+    'f': 'fullPath', 'fullPath': 'fullPath',
+    'pa': 'path', 'path': 'path',
+    }
 
 
 class Graph(om.MSelectionList):
 
+    _hierarchy: Optional[HierarchyIndex] = None
+    _hierarchyGeneration: Optional[int] = None
+    _names: Optional[Dict[str, int]] = None
+    _hashes: Optional[Dict[int, List[Tuple[int, om.MObject]]]] = None
+
     @classmethod
-    def ls(cls, *args, **kwargs) -> List[Node]:
+    def ls(cls, *args, **kwargs) -> 'Graph':
         """
         desc: this function is a reimplementation of the cmds.ls function
         allow user to gathers nodes from string list
         args and kwargs work like cmds.ls command
+        without positional arguments and with at most the type flag
+        nodes are listed from the api iterators, other calls go through the cmds shim
         """
-        result = cmds.ls(*args, **kwargs) or []
-        lst = cls()
-        for item in result:
-            lst.add(item)
+        if args or set(kwargs) - {'type', 'typ'}:
+            return cls.__fromNames(shims.ls(*args, **kwargs))
 
-        return lst
+        return cls.__fromObjects(iterNodes(kwargs.get('type', kwargs.get('typ'))))
 
     @classmethod
     def listHistory(cls, *args, **kwargs) -> 'Graph':
@@ -28,30 +57,135 @@ class Graph(om.MSelectionList):
         desc: this function is a reimplementation of the cmds.listHistory function
         allow user to gathers nodes from string list
         args and kwargs work like cmds.listHistory command
+        the future and levels flags are walked with MItDependencyGraph,
+        the history of a transform includes the history of its shapes like cmds does,
+        other flags go through the cmds shim
         """
-        result = cmds.listHistory(*args, **kwargs) or []
-
-        lst = cls()
-        for item in result:
-            lst.add(item)
-
-        return lst
+        flags = cls.__flags(kwargs, HISTORY_FLAGS)
+        if not args or flags is None:
+            return cls.__fromNames(shims.listHistory(*args, **kwargs))
+
+        graph = cls()
+        for obj in cls.__argumentObjects(args):
+            roots = [obj]
+            if obj.hasFn(om.MFn.kTransform):
+                fn = om.MFnDagNode(obj)
+                roots.extend(
+                    child for child in map(fn.child, range(fn.childCount()))
+                    if child.hasFn(om.MFn.kShape)
+                    )
+
+            for root in roots:
+                for item in iterDependencyGraph(
+                        root,
+                        upstream=not flags.get('future', False),
+                        depth=flags.get('levels') or None,
+                        includeRoot=True
+                        ):
+                    graph.add(item)
+
+        return graph
 
     @classmethod
     def listRelatives(cls, *args, **kwargs) -> 'Graph':
         """
-        desc: this function is a reimplementation of the cmds.listHistory function
+        desc: this function is a reimplementation of the cmds.listRelatives function
         allow user to gathers nodes from string list
-        args and kwargs work like cmds.listHistory command
+        args and kwargs work like cmds.listRelatives command
+        children, parent, allParents, allDescendents, shapes and type are walked
+        with MItDag, other flags go through the cmds shim
         """
-        print(args, kwargs)
-        result = cmds.listRelatives(*args, **kwargs) or []
+        flags = cls.__flags(kwargs, RELATIVES_FLAGS)
+        if not args or flags is None:
+            return cls.__fromNames(shims.listRelatives(*args, **kwargs))
+
+        fnType, match = typeConstraint(flags['type']) if flags.get('type') else (om.MFn.kInvalid, None)
+        if flags.get('shapes'):
+            fnType = om.MFn.kShape
+            match = typeFilter(flags['type']) if flags.get('type') else None
+
+        graph = cls()
 
-        lst = cls()
-        for item in result:
-            lst.add(item)
+        for obj in cls.__argumentObjects(args):
+            if not obj.hasFn(om.MFn.kDagNode):
+                continue
+
+            for path in cls.__relatives(obj, flags, fnType):
+                if match is None or match(path.node()):
+                    graph.add(path)
 
-        return lst
+        return graph
+
+    @classmethod
+    def query(
+            cls,
+            type: Union[str, List[str], None] = None,
+            under: Union[str, om.MObject, None] = None,
+            where: Optional[Dict[str, Any]] = None,
+            inContainer: Union[str, om.MObject, None] = None
+            ) -> 'Graph':
+        """
+        :desc: gather the nodes matching every given constraint without going through node names
+        type and under are walked by MItDependencyNodes or MItDag with a function set filter,
+        where predicates are evaluated on batches of the walked nodes
+        :param str | List[str] | None type: node types, types deriving from them match too
+        :param str | MObject | None under: only dag descendants of this node
+        :param dict | None where: attribute name: value, (operator, value) or callable,
+        operators are ==, !=, >, >=, <, <=, in and not in
+        :param str | MObject | None inContainer: only members of this container
+        :example: Graph.query(type='joint', under=root, where={'radius': ('>', 1.0)})
+        """
+        return cls.__fromObjects(iterQuery(
+                type,
+                under=Node(under) if under is not None else None,
+                where=where,
+                inContainer=Node(inContainer) if inContainer is not None else None
+                ))
+
+    @staticmethod
+    def __relatives(obj: om.MObject, flags: Dict[str, Any], fnType: int) -> Iterator[om.MDagPath]:
+
+        if flags.get('parent') or flags.get('allParents'):
+            parents = iterAncestors(obj, fnType, depth=1)
+            return parents if flags.get('allParents') else islice(parents, 1)
+
+        return iterDescendants(obj, fnType, depth=None if flags.get('allDescendents') else 1)
+
+    @staticmethod
+    def __flags(kwargs: Dict[str, Any], supported: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        :desc: long named flags, None when a flag is not supported by the api implementation
+        """
+        flags = {}
+        for key, value in kwargs.items():
+            if key not in supported:
+                return None
+
+            flags[supported[key]] = value
+
+        return flags
+
+    @classmethod
+    def __argumentObjects(cls, args: tuple) -> List[om.MObject]:
+
+        items = args[0] if len(args) == 1 and isinstance(args[0], (list, tuple, om.MSelectionList)) else args
+        if isinstance(items, tuple):
+            items = list(items)
+
+        graph = cls.__asGraph(items)
+        return [graph.getDependNode(idx) for idx in range(graph.length())]
+
+    @classmethod
+    def __fromNames(cls, names: List[str]) -> 'Graph':
+        """
+        :desc: build a graph from node names in a single selection list pass
+        names are added as is so dag paths of instances are kept
+        """
+        graph = cls()
+        for name in names:
+            graph.add(name)
+
+        return graph
 
     @classmethod
     def getDagRoots(
@@ -61,43 +195,52 @@ class Graph(om.MSelectionList):
             ) -> 'Graph':
         """
         :desc: this method get dag root from given nodes
+        a node is a root when none of its dag ancestors is part of the given nodes,
+        ancestors are found from the full dag paths of the nodes in one pass
         :param List[str | Node] | MSelectionList nodes: nodes you want dag roots on
         :return: the founded relative dagRoots
         :rtype: Graph
         """
 
-        if isinstance(nodes, list):
-            tmp = Graph()
+        nodes = cls.__asGraph(nodes)
 
-            for node in nodes:
-                tmp.add(node)
+        if not safe:
+            for idx in range(nodes.length()):
+                item = nodes.getDependNode(idx)
+                if not item.hasFn(om.MFn.kDagNode):
+                    raise TypeError(f'{Node(item)} is not a dagNode')
 
-            node = tmp
+        return cls.__fromObjects(nodes.__getHierarchy().roots())
 
-        elif isinstance(nodes, om.MSelectionList):
-            nodes = cls(nodes)
+    @classmethod
+    def __asGraph(
+            cls,
+            nodes: Union[List[str], List[Node], om.MSelectionList]
+            ) -> 'Graph':
 
-        previous = cls()
-        roots = cls()
-        for item in nodes:
-            previous.add(item)
+        if isinstance(nodes, Graph):
+            return nodes
 
-            if (not safe) and (not item.hasFn(om.MFn.MFnDagNode)):
-                raise TypeError(f'{node} is not a dagNode')
+        if isinstance(nodes, om.MSelectionList):
+            return cls(nodes)
 
-            if safe and (not item.hasFn(om.MFn.kDagNode)):
-                continue
+        if isinstance(nodes, list):
+            graph = cls()
+            for node in nodes:
+                graph.add(node)
 
-            is_child = False
-            mfnDagNode = om.MFnDagNode(item)
-            for other in nodes - previous:
-                if other.hasFn(om.MFn.kDagNode):
-                    is_child |= mfnDagNode.isChildOf(other)
+            return graph
 
-            if not is_child:
-                roots.add(item)
+        raise TypeError('nodes need to be list or om.MSelectionList')
+
+    @classmethod
+    def __fromObjects(cls, objects: List[om.MObject]) -> 'Graph':
 
-        return roots
+        graph = cls()
+        for obj in objects:
+            graph.add(obj)
+
+        return graph
 
     @classmethod
     def getChildren(
@@ -105,39 +248,16 @@ class Graph(om.MSelectionList):
             node: Union[str, om.MObject],
             graph: Union[om.MSelectionList, List[str], List[Node]]
             ) -> 'Graph':
+        """
+        :desc: get all the dag descendants of node that are part of graph
+        """
 
         node = Node(node)
         if not node.hasFn(om.MFn.kDagNode):
             return
 
-        if isinstance(graph, om.MSelectionList):
-            graph = cls(graph)
-
-        elif isinstance(graph, list):
-            tmp = Graph()
-
-            for node in graph:
-                tmp.add(node)
-
-            graph = tmp
-
-        else:
-            raise TypeError('graph need to be list or om.MSelectionList')
-
-        # clear graph
-        if node in graph:
-            node_graph = Graph()
-            node_graph.add(node)
-            graph = graph - node_graph
-
-        childrens = cls()
-        for other in graph:
-            otherDagNode = om.MFnDagNode(other)
-
-            if otherDagNode.isChildOf(node):
-                childrens.add(other)
-
-        return childrens
+        hierarchy = cls.__asGraph(graph).__getHierarchy()
+        return cls.__fromObjects(hierarchy.descendants(node))
 
     @classmethod
     def getParents(
@@ -145,41 +265,16 @@ class Graph(om.MSelectionList):
             node: Union[str, om.MObject],
             graph: Union[om.MSelectionList, List[str], List[Node]]
             ) -> 'Graph':
+        """
+        :desc: get all the dag ancestors of node that are part of graph
+        """
 
         node = Node(node)
-
-        if isinstance(graph, om.MSelectionList):
-            graph = cls(graph)
-
-        elif not node.hasFn(om.MFn.kDagNode):
+        if not node.hasFn(om.MFn.kDagNode):
             return
 
-        elif isinstance(graph, list):
-            tmp = Graph()
-
-            for node in graph:
-                tmp.add(node)
-
-            graph = tmp
-
-        else:
-            raise TypeError('second argument need to be list or om.MSelectionList')
-
-        # clear graph
-        if node in graph:
-            node_graph = Graph()
-            node_graph.add(node)
-            graph = graph - node_graph
-
-        dagNode = om.MFnDagNode(node)
-
-        parents = cls()
-        for other in graph:
-
-            if dagNode.isChildOf(other):
-                parents.add(other)
-
-        return parents
+        hierarchy = cls.__asGraph(graph).__getHierarchy()
+        return cls.__fromObjects(hierarchy.ancestors(node))
 
     @classmethod
     def getDirectChildren(
@@ -187,16 +282,16 @@ class Graph(om.MSelectionList):
             node: Union[str, om.MObject],
             graph: Union[om.MSelectionList, List[str], List[Node]]
             ) -> 'Graph':
+        """
+        :desc: get the descendants of node in graph with no other graph node in between
+        """
 
-        childrens = cls.getChildren(node, graph)
-        childrens_copy = cls().copy(childrens)
-
-        to_remove = cls()
-        for child in childrens_copy:
-            for subChild in cls.getChildren(child, graph):
-                to_remove.add(subChild)
+        node = Node(node)
+        if not node.hasFn(om.MFn.kDagNode):
+            return
 
-        return childrens - to_remove
+        hierarchy = cls.__asGraph(graph).__getHierarchy()
+        return cls.__fromObjects(hierarchy.directChildren(node))
 
     @classmethod
     def getDirectParent(
@@ -204,17 +299,92 @@ class Graph(om.MSelectionList):
             node: Union[str, om.MObject],
             graph: Union[om.MSelectionList, List[str], List[Node]]
             ) -> Optional[Node]:
+        """
+        :desc: get the nearest ancestor of node that is part of graph
+        """
+
+        node = Node(node)
+        if not node.hasFn(om.MFn.kDagNode):
+            return
+
+        hierarchy = cls.__asGraph(graph).__getHierarchy()
+        if (parent := hierarchy.directParent(node)) is not None:
+            return Node(parent)
+
+    def upstream(
+            self,
+            fnType: int = om.MFn.kInvalid,
+            depth: Optional[int] = None,
+            prune: Optional[Callable[[Node], bool]] = None,
+            breadthFirst: bool = False
+            ) -> Iterator[Node]:
+        """
+        :desc: lazily walk the nodes feeding the graph members,
+        each node is yielded once even when reached from several members
+        """
+        return self.__walk('upstream', fnType, depth, prune, breadthFirst)
+
+    def downstream(
+            self,
+            fnType: int = om.MFn.kInvalid,
+            depth: Optional[int] = None,
+            prune: Optional[Callable[[Node], bool]] = None,
+            breadthFirst: bool = False
+            ) -> Iterator[Node]:
+        """
+        :desc: lazily walk the nodes fed by the graph members,
+        each node is yielded once even when reached from several members
+        """
+        return self.__walk('downstream', fnType, depth, prune, breadthFirst)
+
+    def __walk(self, direction, fnType, depth, prune, breadthFirst) -> Iterator[Node]:
 
-        parents = cls.getParents(node, graph)
-        parents_copy = cls().copy(parents)
+        visited = set()
+        for node in self:
+            walk = getattr(node, direction)
+            for other in walk(fnType, depth, prune, breadthFirst):
 
-        to_remove = cls()
-        for par in parents_copy:
-            for subParent in cls.getParents(par, graph):
-                to_remove.add(subParent)
+                if other in visited:
+                    continue
+
+                visited.add(other)
+                yield other
+
+    def descendants(
+            self,
+            fnType: int = om.MFn.kInvalid,
+            depth: Optional[int] = None,
+            prune: Optional[Callable[[Node], bool]] = None,
+            breadthFirst: bool = False
+            ) -> Iterator[Node]:
+        """
+        :desc: lazily walk the dag nodes below the graph members,
+        each node is yielded once even when reached from several members
+        :example: shapes = list(Graph.ls(type='transform').descendants(om.MFn.kShape))
+        """
+        return self.__walk('descendants', fnType, depth, prune, breadthFirst)
+
+    def ancestors(
+            self,
+            fnType: int = om.MFn.kInvalid,
+            depth: Optional[int] = None,
+            prune: Optional[Callable[[Node], bool]] = None,
+            breadthFirst: bool = False
+            ) -> Iterator[Node]:
+        """
+        :desc: lazily walk the dag nodes above the graph members,
+        each node is yielded once even when reached from several members
+        """
+        return self.__walk('ancestors', fnType, depth, prune, breadthFirst)
 
-        if parent := parents - to_remove:
-            return parent.get(0)
+    def connectivity(self) -> Connectivity:
+        """
+        :desc: gather the connections between the graph members in one pass
+        the returned index sorts, splits in components and finds cycles without maya calls,
+        it is not updated when connections change
+        :example: order = graph.connectivity().toposort()
+        """
+        return Connectivity(self)
 
     @property
     def dagRoots(self) -> 'Graph':
@@ -227,10 +397,128 @@ class Graph(om.MSelectionList):
         return self.getParents(node, self)
 
     def directChildren(self, node: Union[str, om.MObject]) -> 'Graph':
-        return self.getChildren(node, self)
+        return self.getDirectChildren(node, self)
 
     def directParents(self, node: Union[str, om.MObject]) -> Optional[Node]:
-        return self.getParents(node, self)
+        return self.getDirectParent(node, self)
+
+    def __getHierarchy(self) -> HierarchyIndex:
+        """
+        :desc: lazily build the hierarchy index of the graph members
+        the index is dropped by every mutation of the graph, and when a dag node
+        was reparented or a node renamed in the scene since it was built
+        """
+        generation = DAG_GENERATION.value
+        if self._hierarchy is not None and generation != self._hierarchyGeneration and not self._keepsHierarchy():
+            self._hierarchy = None
+
+        if self._hierarchy is None:
+            self._hierarchy = HierarchyIndex(self)
+            self._hierarchyGeneration = generation
+
+        return self._hierarchy
+
+    def _keepsHierarchy(self) -> bool:
+        """
+        :desc: whether the graph updates its hierarchy index itself on scene changes
+        """
+        return False
+
+    def __getNames(self) -> Dict[str, int]:
+        """
+        :desc: lazily build the name to index map of the graph members
+        """
+        if self._names is None:
+            self._names = {}
+            for idx, name in enumerate(self.getSelectionStrings()):
+                self._names.setdefault(name, idx)
+
+        return self._names
+
+    def __getHashes(self) -> Dict[int, List[Tuple[int, om.MObject]]]:
+        """
+        :desc: lazily build the handle hash code to (index, node) map of the graph members
+        hash codes of distinct nodes can collide, nodes sharing one are told apart by MObject equality
+        """
+        if self._hashes is None:
+            self._hashes = {}
+            for idx in range(self.length()):
+                self.__indexMember(self._hashes, idx)
+
+        return self._hashes
+
+    @staticmethod
+    def __find(entries: List[Tuple[int, om.MObject]], obj: om.MObject) -> Optional[int]:
+
+        for idx, other in entries:
+            if other == obj:
+                return idx
+
+    def __indexMember(self, hashes: Dict[int, List[Tuple[int, om.MObject]]], idx: int) -> None:
+
+        obj = self.getDependNode(idx)
+        key = om.MObjectHandle(obj).hashCode()
+
+        # the first index of a node is kept
+        if (entries := hashes.get(key)) is None:
+            hashes[key] = [(idx, obj)]
+        elif self.__find(entries, obj) is None:
+            entries.append((idx, obj))
+
+    def _indexOf(self, obj: om.MObject) -> Optional[int]:
+        return self.__find(self.__getHashes().get(om.MObjectHandle(obj).hashCode(), ()), obj)
+
+    def _invalidate(self) -> None:
+        self._hierarchy = None
+        self._names = None
+        self._hashes = None
+
+    def add(self, *args, **kwargs) -> 'Graph':
+
+        length = self.length()
+        self._hierarchy = None
+        result = super().add(*args, **kwargs)
+
+        # added items are appended, only index the new ones
+        if self._names is not None:
+            for idx in range(length, self.length()):
+                for name in self.getSelectionStrings(idx):
+                    self._names.setdefault(name, idx)
+
+        if self._hashes is not None:
+            for idx in range(length, self.length()):
+                self.__indexMember(self._hashes, idx)
+
+        return result
+
+    def merge(self, *args, **kwargs) -> 'Graph':
+        self._invalidate()
+        return super().merge(*args, **kwargs)
+
+    def remove(self, *args, **kwargs) -> 'Graph':
+        self._invalidate()
+        return super().remove(*args, **kwargs)
+
+    def clear(self, *args, **kwargs) -> 'Graph':
+        self._invalidate()
+        return super().clear(*args, **kwargs)
+
+    def copy(self, *args, **kwargs) -> 'Graph':
+        self._invalidate()
+        return super().copy(*args, **kwargs)
+
+    def intersect(self, *args, **kwargs) -> 'Graph':
+        self._invalidate()
+        return super().intersect(*args, **kwargs)
+
+    @staticmethod
+    def batch() -> ModifierSession:
+        """
+        :desc: open a modifier session, connections, disconnections, node creation
+        and renames issued inside the with block are executed at once on exit
+        the returned session can undo or redo the whole batch
+        """
+        return ModifierSession()
 
     @staticmethod
     def __initRegistred(value: str) -> Any:
@@ -249,6 +537,118 @@ class Graph(om.MSelectionList):
         self.add(node)
         return node
 
+    def __plugs(self, name: str) -> List[om.MPlug]:
+
+        plugs = []
+        for idx in range(self.length()):
+            fn = om.MFnDependencyNode(self.getDependNode(idx))
+            plugs.append(fn.findPlug(name, True))
+
+        return plugs
+
+    def getAttr(self, name: str) -> 'numpy.ndarray':
+        """
+        :desc: read one attribute on every node of the graph at once
+        the value type is decided once from the first plug
+        :param str name: attribute name shared by every node
+        :return: array of shape (N,) for scalars or (N, k) for compounds and matrices
+        :rtype: numpy.ndarray
+        """
+        np = requireNumpy()
+        plugs = self.__plugs(name)
+
+        if not plugs:
+            return np.empty((0,))
+
+        accessor = PlugAccessor(plugs[0])
+        return np.array(accessor.readAll(plugs), dtype=accessor.dtype)
+
+    def setAttr(self, name: str, values: Any) -> None:
+        """
+        :desc: write one attribute on every node of the graph in one modifier pass
+        :param str name: attribute name shared by every node
+        :param values: array of shape (N,) or (N, k), a single value is broadcast
+        """
+        np = requireNumpy()
+        plugs = self.__plugs(name)
+
+        if not plugs:
+            return
+
+        accessor = PlugAccessor(plugs[0])
+        shape = (len(plugs),) + accessor.shape
+        values = np.broadcast_to(np.asarray(values, dtype=accessor.dtype), shape)
+
+        with dgModifier() as modifier:
+            accessor.writeAll(modifier, plugs, values.tolist())
+
+    def __dagPaths(self) -> List[om.MDagPath]:
+
+        paths = []
+        for idx in range(self.length()):
+            item = self._item(idx)
+            if not isinstance(item, om.MDagPath):
+                raise TypeError(f'{Node(item)} is not a dagNode')
+
+            paths.append(item)
+
+        return paths
+
+    def localMatrices(self) -> 'numpy.ndarray':
+        """
+        :desc: local matrix of every dag member, identity for shapes
+        :return: array of shape (N, 4, 4)
+        :rtype: numpy.ndarray
+        """
+        return transforms.localMatrices([path.node() for path in self.__dagPaths()])
+
+    def worldMatrices(self) -> 'numpy.ndarray':
+        """
+        :desc: world matrix of every dag member from the local matrices along its dag path,
+        the matrices of shared parents are read and multiplied once
+        :return: array of shape (N, 4, 4)
+        :rtype: numpy.ndarray
+        """
+        return transforms.worldMatrices(self.__dagPaths())
+
+    def setLocalMatrices(self, matrices: Any) -> None:
+        """
+        :desc: give every transform member its local matrix in one modifier pass
+        matrices are decomposed in translate, rotate, scale and shear at once, see transforms.setLocalMatrices
+        :param matrices: array of shape (N, 4, 4) or (N, 16), a single matrix is broadcast
+        """
+        objects = [path.node() for path in self.__dagPaths()]
+
+        with dgModifier() as modifier:
+            transforms.setLocalMatrices(modifier, objects, matrices)
+
+    def snapshot(self) -> bytes:
+        """
+        :desc: capture node types, names, dag parenting, non default attribute values
+        and the connections between the graph members into compact bytes
+        :rtype: bytes
+        """
+        objects = [self.getDependNode(idx) for idx in range(self.length())]
+        return Snapshot.capture(objects).toBytes()
+
+    @classmethod
+    def restore(
+            cls,
+            snapshot: Union[bytes, Snapshot],
+            namespace: Optional[str] = None
+            ) -> 'Graph':
+        """
+        :desc: re-create a graph captured with Graph.snapshot in one modifier pass
+        :param bytes | Snapshot snapshot: captured graph
+        :param str | None namespace: namespace the created nodes are put in
+        :return: the created nodes
+        :rtype: Graph
+        """
+        if isinstance(snapshot, bytes):
+            snapshot = Snapshot.fromBytes(snapshot)
+
+        return cls.__fromObjects(snapshot.restore(namespace))
+
     def __repr__(self) -> str:
         class_name = self.__class__.__name__
         return f'{class_name}.ls({[str(x) for x in self]})'
@@ -259,62 +659,141 @@ class Graph(om.MSelectionList):
     def __len__(self) -> int:
         return self.length()
 
+    def _item(self, idx: int) -> Union[om.MObject, om.MDagPath]:
+        """
+        :desc: get the item at idx as stored, dag path for dag nodes
+        """
+        obj = self.getDependNode(idx)
+        if obj.hasFn(om.MFn.kDagNode):
+            try:
+                return self.getDagPath(idx)
+            except RuntimeError:
+                pass
+
+        return obj
+
     def __getitem__(self, value: int | str | slice) -> Node:
 
         if isinstance(value, int):
             # implementation of the negative getting exemple self[-1]
             value = len(self) + value if value < 0 else value
-            print(f'{value=}')
             return self.__initRegistred(self.getDependNode(value))
 
         if isinstance(value, slice):
-            return self.__class__.ls(self.getSelectionStrings()[value])
+            graph = self.__class__()
+            for idx in range(*value.indices(len(self))):
+                graph.add(self._item(idx))
+
+            return graph
 
         elif isinstance(value, str):
 
-            if value not in self.getSelectionStrings():
-                raise NameError(f'__getitem__ fail: {value} not in the Graph')
+            idx = self.__getNames().get(value)
+
+            # names can be outdated by a rename, rebuild them once
+            if idx is None or value not in self.getSelectionStrings(idx):
+                self._names = None
+                idx = self.__getNames().get(value)
 
-            idx = self.getSelectionStrings().index(value)
+            if idx is None:
+                raise NameError(f'__getitem__ fail: {value} not in the Graph')
 
             return self.__initRegistred(self.getDependNode(idx))
 
+    def __select(self, other: 'Graph', shared: bool) -> List[Union[om.MObject, om.MDagPath]]:
+        """
+        :desc: items of the graph whose node is in other when shared is True, not in other otherwise
+        """
+        hashes = other.__getHashes()
+        return [
+            self._item(idx)
+            for key, entries in self.__getHashes().items()
+            for idx, obj in entries
+            if (self.__find(hashes.get(key, ()), obj) is not None) is shared
+            ]
+
+    def __fromItems(self, items: List[Union[om.MObject, om.MDagPath]]) -> 'Graph':
+
+        graph = self.__class__()
+        graph.__extend(items)
+        return graph
+
+    def __extend(self, items: List[Union[om.MObject, om.MDagPath]]) -> None:
+        # items are known to be unique, skip the selection list merge check
+        for item in items:
+            self.add(item, False)
+
+    def __replace(self, items: List[Union[om.MObject, om.MDagPath]]) -> None:
+        self.clear()
+        self.__extend(items)
+
     def __and__(self, other: om.MSelectionList) -> 'Graph':
         '''
         intersection
         '''
-        print(type(self), type(other))
-        if not isinstance(other, om.MSelectionList):
-            raise TypeError(f'can not intersect Graph and {type(other)}')
-
-        final_lst = self.__class__().copy(self)
-        final_lst = final_lst.intersect(other)
-        return self.__class__(final_lst)
+        return self.__fromItems(self.__select(self.__asGraph(other), True))
 
     def __or__(self, other: om.MSelectionList) -> 'Graph':
         '''
         union
         '''
-        copy = self.__class__().copy(self)
-        return copy(self).merge(other)
+        graph = self.__class__().copy(self)
+        graph.__extend(self.__asGraph(other).__select(self, False))
+        return graph
 
     def __xor__(self, other: om.MSelectionList) -> 'Graph':
         '''
         symetrical difference
         '''
-        copy = self.__class__().copy(self)
-        return copy.merge(other, strategy=om.MSelectionList.kXORWithList)
+        other = self.__asGraph(other)
+        return self.__fromItems(self.__select(other, False) + other.__select(self, False))
+
+    def __sub__(self, other: om.MSelectionList) -> 'Graph':
+        '''
+        difference
+        '''
+        return self.__fromItems(self.__select(self.__asGraph(other), False))
+
+    def __iand__(self, other: om.MSelectionList) -> 'Graph':
+        self.__replace(self.__select(self.__asGraph(other), True))
+        return self
+
+    def __ior__(self, other: om.MSelectionList) -> 'Graph':
+        self.__extend(self.__asGraph(other).__select(self, False))
+        return self
+
+    def __ixor__(self, other: om.MSelectionList) -> 'Graph':
+        other = self.__asGraph(other)
+        self.__replace(self.__select(other, False) + other.__select(self, False))
+        return self
+
+    def __isub__(self, other: om.MSelectionList) -> 'Graph':
+        self.__replace(self.__select(self.__asGraph(other), False))
+        return self
+
+    def issubset(self, other: Union[om.MSelectionList, List[str], List[Node]]) -> bool:
+        """
+        :desc: every node of the graph is in other
+        """
+        return not self.__select(self.__asGraph(other), False)
+
+    def isdisjoint(self, other: Union[om.MSelectionList, List[str], List[Node]]) -> bool:
+        """
+        :desc: the graph and other have no node in common
+        """
+        return not self.__select(self.__asGraph(other), True)
 
     def __iter__(self) -> Iterator[Node]:
         '''
         :desc: return iterator
         '''
+        getDependNode = self.getDependNode
         for idx in range(self.length()):
-            yield self.get(idx)
+            yield self.__initRegistred(getDependNode(idx))
 
     def __contains__(self, item: om.MObject | om.MPlug | om.MDagPath) -> bool:
-        return self.hasItem(item)
 
-    def __sub__(self, other: om.MSelectionList) -> 'Graph':
-        copy = self.__class__().copy(self)
-        return copy.merge(other, strategy=om.MSelectionList.kRemoveFromList)
+        if isinstance(item, om.MObject):
+            return self._indexOf(item) is not None
+
+        return self.hasItem(item)
@@ -0,0 +1,208 @@
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional
+
+from maya.api import OpenMaya as om
+
+
+class HierarchyIndex:
+    """
+    :desc: parent and children lookup between the dag members of a selection list
+    members are indexed by their full dag paths (one path per instance),
+    paths are kept sorted so the descendants of a path are a contiguous range
+    """
+
+    def __init__(self, selList: om.MSelectionList) -> None:
+
+        self.members: Dict[int, tuple] = {}
+        self.objects: Dict[str, om.MObject] = {}
+        self.parentPaths: Dict[str, Optional[str]] = {}
+        self.childPaths: Dict[str, List[str]] = {}
+
+        for idx in range(selList.length()):
+            obj = selList.getDependNode(idx)
+
+            if not obj.hasFn(om.MFn.kDagNode):
+                continue
+
+            paths = self.fullPaths(obj)
+            self.members[om.MObjectHandle(obj).hashCode()] = (obj, paths)
+            for path in paths:
+                self.objects[path] = obj
+
+        self.paths = sorted(self.objects)
+
+        # parents sort before their children so they are already registered
+        for path in self.paths:
+            parent = self.__nearestAncestor(path)
+            self.parentPaths[path] = parent
+            self.childPaths[path] = []
+
+            if parent is not None:
+                self.childPaths[parent].append(path)
+
+    @staticmethod
+    def fullPaths(obj: om.MObject) -> List[str]:
+        return [path.fullPathName() for path in om.MDagPath.getAllPathsTo(obj)]
+
+    def __nearestAncestor(self, path: str) -> Optional[str]:
+        """
+        :desc: walk up the given full dag path until a member path is found
+        """
+        idx = path.rfind('|')
+        while idx > 0:
+            path = path[:idx]
+            if path in self.objects:
+                return path
+
+            idx = path.rfind('|')
+
+    def __parentPath(self, path: str) -> Optional[str]:
+
+        if path in self.parentPaths:
+            return self.parentPaths[path]
+
+        return self.__nearestAncestor(path)
+
+    def descendantPaths(self, path: str) -> List[str]:
+        start = bisect_left(self.paths, path + '|')
+        end = bisect_left(self.paths, path + '}')
+        return self.paths[start:end]
+
+    def __objects(self, paths: List[str]) -> List[om.MObject]:
+
+        objects = {}
+        for path in paths:
+            obj = self.objects[path]
+            objects.setdefault(om.MObjectHandle(obj).hashCode(), obj)
+
+        return list(objects.values())
+
+    def roots(self) -> List[om.MObject]:
+        """
+        :desc: members that have no member ancestor on any of their paths
+        """
+        return [
+            obj for obj, paths in self.members.values()
+            if all(self.parentPaths[path] is None for path in paths)
+            ]
+
+    def descendants(self, obj: om.MObject) -> List[om.MObject]:
+
+        paths = []
+        for path in self.fullPaths(obj):
+            paths.extend(self.descendantPaths(path))
+
+        return self.__objects(paths)
+
+    def ancestors(self, obj: om.MObject) -> List[om.MObject]:
+
+        paths = []
+        for path in self.fullPaths(obj):
+            parent = self.__parentPath(path)
+
+            while parent is not None:
+                paths.append(parent)
+                parent = self.parentPaths[parent]
+
+        return self.__objects(paths)
+
+    def directChildren(self, obj: om.MObject) -> List[om.MObject]:
+
+        paths = []
+        for path in self.fullPaths(obj):
+
+            if path in self.childPaths:
+                paths.extend(self.childPaths[path])
+                continue
+
+            # obj is not a member, keep descendants whose nearest member
+            # ancestor is above obj
+            for other in self.descendantPaths(path):
+                parent = self.parentPaths[other]
+                if parent is None or len(parent) < len(path):
+                    paths.append(other)
+
+        return self.__objects(paths)
+
+    def directParent(self, obj: om.MObject) -> Optional[om.MObject]:
+
+        for path in self.fullPaths(obj):
+            if (parent := self.__parentPath(path)) is not None:
+                return self.objects[parent]
+
+    def addNode(self, obj: om.MObject) -> None:
+        """
+        :desc: index a new member, members below it get it as nearest ancestor
+        """
+        key = om.MObjectHandle(obj).hashCode()
+        if key in self.members or not obj.hasFn(om.MFn.kDagNode):
+            return
+
+        paths = self.fullPaths(obj)
+        self.members[key] = (obj, paths)
+
+        for path in paths:
+            self.objects[path] = obj
+            insort(self.paths, path)
+
+            parent = self.__nearestAncestor(path)
+            self.parentPaths[path] = parent
+            self.childPaths[path] = []
+
+            if parent is not None:
+                self.childPaths[parent].append(path)
+
+            for other in self.descendantPaths(path):
+                otherParent = self.parentPaths[other]
+                if otherParent is not None and len(otherParent) > len(path):
+                    continue
+
+                if otherParent is not None:
+                    self.childPaths[otherParent].remove(other)
+
+                self.parentPaths[other] = path
+                self.childPaths[path].append(other)
+
+    def removeNode(self, obj: om.MObject) -> None:
+        """
+        :desc: drop a member, its member children are given to its nearest ancestor
+        paths indexed for the member are used, so obj can already be renamed or moved
+        """
+        if (entry := self.members.pop(om.MObjectHandle(obj).hashCode(), None)) is None:
+            return
+
+        for path in entry[1]:
+            del self.objects[path]
+            self.paths.pop(bisect_left(self.paths, path))
+
+            parent = self.parentPaths.pop(path)
+            children = self.childPaths.pop(path)
+
+            if parent is not None:
+                self.childPaths[parent].remove(path)
+
+            for child in children:
+                self.parentPaths[child] = parent
+                if parent is not None:
+                    self.childPaths[parent].append(child)
+
+    def refreshNode(self, obj: om.MObject) -> None:
+        """
+        :desc: re-index a member and its member descendants after a rename or reparent
+        """
+        if (entry := self.members.get(om.MObjectHandle(obj).hashCode())) is None:
+            return
+
+        paths = []
+        for path in entry[1]:
+            paths.extend(self.descendantPaths(path))
+
+        descendants = self.__objects(paths)
+        for other in [obj] + descendants:
+            self.removeNode(other)
+
+        for other in [obj] + descendants:
+            self.addNode(other)
+
+    def isIndexed(self, obj: om.MObject) -> bool:
+        return om.MObjectHandle(obj).hashCode() in self.members
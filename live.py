@@ -0,0 +1,188 @@
+from bisect import bisect_right
+from typing import Any, List, NamedTuple, Optional
+
+from maya.api import OpenMaya as om
+
+from .graph import Graph
+
+
+class Change(NamedTuple):
+    version: int
+    kind: str
+    name: str
+    previousName: Optional[str] = None
+
+
+class LiveGraph(Graph):
+    """
+    :desc: graph of every scene node of a type, kept current by maya messages
+    membership, name index and hierarchy index are updated per change,
+    each change bumps version and is appended to the change log
+    callbacks are registered by open and removed by close or by the with statement,
+    graphs derived from a LiveGraph (slices, set operations) are never opened
+    """
+
+    def __init__(self, *args, nodeType: str = 'dependNode') -> None:
+
+        super().__init__(*args)
+        self.nodeType = nodeType
+        self.version = 0
+        self.changes: List[Change] = []
+        self.__callbacks: List[int] = []
+
+    def __enter__(self) -> 'LiveGraph':
+        return self.open()
+
+    def __exit__(self, excType, excValue, traceback) -> None:
+        self.close()
+
+    @property
+    def isOpen(self) -> bool:
+        return bool(self.__callbacks)
+
+    def open(self) -> 'LiveGraph':
+        """
+        :desc: fill the graph from the scene and start following changes
+        """
+        if self.isOpen:
+            return self
+
+        self.clear()
+        self.merge(Graph.ls(type=self.nodeType))
+
+        self.__callbacks = [
+            om.MDGMessage.addNodeAddedCallback(self.__onAdded, self.nodeType),
+            om.MDGMessage.addNodeRemovedCallback(self.__onRemoved, self.nodeType),
+            om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, self.__onRenamed),
+            om.MDagMessage.addAllDagChangesCallback(self.__onDagChanged),
+            ]
+        return self
+
+    def close(self) -> None:
+
+        if self.__callbacks:
+            om.MMessage.removeCallbacks(self.__callbacks)
+            self.__callbacks = []
+
+    def _keepsHierarchy(self) -> bool:
+        return self.isOpen
+
+    def changesSince(self, version: int) -> List[Change]:
+        """
+        :desc: changes recorded after the given version, cost is O(changes)
+        """
+        start = bisect_right(self.changes, version, key=lambda change: change.version)
+        return self.changes[start:]
+
+    def __record(self, kind: str, name: str, previousName: Optional[str] = None) -> None:
+        self.version += 1
+        self.changes.append(Change(self.version, kind, name, previousName))
+
+    @staticmethod
+    def __name(obj: om.MObject) -> str:
+        return om.MSelectionList().add(obj).getSelectionStrings()[0]
+
+    def __onAdded(self, node: om.MObject, clientData: Any) -> None:
+
+        if self._indexOf(node) is not None:
+            return
+
+        # Graph.add drops the hierarchy index, keep it and update it instead
+        hierarchy = self._hierarchy
+        self.add(node)
+
+        if hierarchy is not None:
+            hierarchy.addNode(node)
+            self._hierarchy = hierarchy
+
+        self.__record('added', self.__name(node))
+
+    def __onRemoved(self, node: om.MObject, clientData: Any) -> None:
+
+        if (idx := self._indexOf(node)) is None:
+            return
+
+        name = self.getSelectionStrings(idx)[0]
+        if self._hierarchy is not None:
+            self._hierarchy.removeNode(node)
+
+        # move the last item in the hole so no other index shifts
+        last = self.length() - 1
+        if idx != last:
+            moved = self.getDependNode(last)
+            movedName = self.getSelectionStrings(last)[0]
+            om.MSelectionList.replace(self, idx, self._item(last))
+
+            if self._names is not None:
+                self._names[movedName] = idx
+
+        if self._hashes is not None:
+            # hash codes can collide, only the entry of the removed node is dropped
+            key = om.MObjectHandle(node).hashCode()
+            if entries := [entry for entry in self._hashes[key] if entry[0] != idx]:
+                self._hashes[key] = entries
+            else:
+                del self._hashes[key]
+
+            if idx != last:
+                key = om.MObjectHandle(moved).hashCode()
+                self._hashes[key] = [(idx, moved) if entry[0] == last else entry for entry in self._hashes[key]]
+
+        om.MSelectionList.remove(self, last)
+
+        if self._names is not None and self._names.get(name) == idx:
+            del self._names[name]
+
+        self.__record('removed', name)
+
+    def __onRenamed(self, node: om.MObject, previousName: str, clientData: Any) -> None:
+
+        idx = self._indexOf(node)
+
+        if self._names is not None and idx is not None and self._names.get(previousName) == idx:
+            del self._names[previousName]
+
+        if node.hasFn(om.MFn.kDagNode) and self._hierarchy is not None:
+            self.__refreshHierarchy(node, previousName, member=idx is not None)
+
+        if idx is None:
+            return
+
+        name = self.getSelectionStrings(idx)[0]
+        if self._names is not None:
+            self._names[name] = idx
+
+        self.__record('renamed', name, previousName)
+
+    def __refreshHierarchy(self, node: om.MObject, previousName: str, member: bool) -> None:
+        """
+        :desc: re-index the members whose dag paths went through the renamed node
+        """
+        hierarchy = self._hierarchy
+
+        if member:
+            hierarchy.refreshNode(node)
+            return
+
+        descendants = []
+        for path in hierarchy.fullPaths(node):
+            previousPath = f'{path.rsplit("|", 1)[0]}|{previousName}'
+            descendants.extend(hierarchy.objects[other] for other in hierarchy.descendantPaths(previousPath))
+
+        for other in descendants:
+            hierarchy.refreshNode(other)
+
+    def __onDagChanged(self, msgType: int, child: om.MDagPath, parent: om.MDagPath, clientData: Any) -> None:
+
+        obj = child.node()
+        if self._hierarchy is not None:
+
+            if self._hierarchy.isIndexed(obj):
+                self._hierarchy.refreshNode(obj)
+
+            else:
+                # previous paths of a non member are unknown, rebuild lazily
+                self._hierarchy = None
+
+        if (idx := self._indexOf(obj)) is not None:
+            self.__record('reparented', self.getSelectionStrings(idx)[0])
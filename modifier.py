@@ -0,0 +1,198 @@
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Iterator, Tuple, Union
+
+from maya.api import OpenMaya as om
+
+
+class Command:
+    """
+    :desc: edit the api has no modifier call for, queued between the modifiers of a session
+    """
+
+    __slots__ = ('doIt', 'undoIt')
+
+    def __init__(self, doIt: Callable[[], None], undoIt: Callable[[], None]) -> None:
+        self.doIt = doIt
+        self.undoIt = undoIt
+
+
+class ModifierSession:
+    """
+    :desc: queue dependency graph edits and execute them in one doIt
+    connect, disconnect, node creation and rename issued by Plug, Node and Graph
+    join the active session instead of running their own modifier,
+    commands run in queue order between the modifiers,
+    sources of the destination plugs connected or disconnected in the session are tracked
+    so later edits see the queued state instead of the scene one,
+    what was queued after a mark can be dropped with rollback,
+    a session entered while another one is active joins the outer one
+    """
+
+    _active: Optional['ModifierSession'] = None
+
+    @classmethod
+    def active(cls) -> Optional['ModifierSession']:
+        return ModifierSession._active
+
+    def __init__(self) -> None:
+        self.__modifiers: List[Union[om.MDGModifier, Command]] = []
+        self.__sources: Dict[Tuple[int, str], om.MPlug] = {}
+        # (plug key, source before the edit or None), undone by rollback
+        self.__journal: List[Tuple[Tuple[int, str], Optional[om.MPlug]]] = []
+        self.__sealed = False
+        self.__done = False
+
+    def __enter__(self) -> 'ModifierSession':
+
+        if ModifierSession._active is None:
+            ModifierSession._active = self
+
+        return ModifierSession._active
+
+    def __exit__(self, excType, excValue, traceback) -> None:
+
+        if ModifierSession._active is not self:
+            return
+
+        ModifierSession._active = None
+
+        # nothing queued is part of the scene yet, dropping it is enough
+        if excType is None:
+            self.doIt()
+
+    def modifier(self, dag: Optional[bool] = None) -> om.MDGModifier:
+        """
+        :desc: get the modifier new operations have to be queued on
+        dag nodes can only be created with a MDagModifier and dependency nodes
+        with a MDGModifier, a new modifier is chained when the kind changes
+        :param bool | None dag: kind of node created by the operation, None for any
+        """
+        current = self.__modifiers[-1] if self.__modifiers else None
+        isDag = isinstance(current, om.MDagModifier)
+
+        if self.__sealed or not isinstance(current, om.MDGModifier) or (dag is not None and dag != isDag):
+            current = om.MDagModifier() if dag else om.MDGModifier()
+            self.__modifiers.append(current)
+            self.__sealed = False
+
+        return current
+
+    @staticmethod
+    def __plugKey(plug: om.MPlug) -> Tuple[int, str]:
+        return (
+            om.MObjectHandle(plug.node()).hashCode(),
+            plug.partialName(
+                includeNonMandatoryIndices=True,
+                includeInstancedIndices=True,
+                useFullAttributePath=True,
+                useLongNames=True
+                )
+            )
+
+    def source(self, plug: om.MPlug) -> om.MPlug:
+        """
+        :desc: source of the plug once the queued operations are done, a null plug when none
+        """
+        if (source := self.__sources.get(self.__plugKey(plug))) is not None:
+            return source
+
+        return plug.source()
+
+    def __setSource(self, destination: om.MPlug, source: om.MPlug) -> None:
+
+        key = self.__plugKey(destination)
+        self.__journal.append((key, self.__sources.get(key)))
+        self.__sources[key] = source
+
+    def connected(self, source: om.MPlug, destination: om.MPlug) -> None:
+        """
+        :desc: record a connection queued on the session modifiers
+        """
+        self.__setSource(destination, om.MPlug(source))
+
+    def disconnected(self, destination: om.MPlug) -> None:
+        """
+        :desc: record a disconnection queued on the session modifiers
+        """
+        self.__setSource(destination, om.MPlug())
+
+    def mark(self) -> Tuple[int, int]:
+        """
+        :desc: position of the queue, operations queued after it go to a new modifier
+        so they can be dropped without touching what was queued before
+        """
+        self.__sealed = True
+        return len(self.__modifiers), len(self.__journal)
+
+    def rollback(self, mark: Tuple[int, int]) -> None:
+        """
+        :desc: drop the operations and sources queued after mark,
+        nothing queued is part of the scene yet so dropping it is enough
+        """
+        count, journal = mark
+        del self.__modifiers[count:]
+
+        while len(self.__journal) > journal:
+            key, source = self.__journal.pop()
+            if source is None:
+                del self.__sources[key]
+            else:
+                self.__sources[key] = source
+
+        self.__sealed = True
+
+    def command(self, doIt: Callable[[], None], undoIt: Callable[[], None]) -> None:
+        """
+        :desc: queue a command after the operations already queued,
+        later operations go to a new modifier
+        """
+        self.__modifiers.append(Command(doIt, undoIt))
+
+    def doIt(self) -> None:
+
+        done = []
+        try:
+            for modifier in self.__modifiers:
+                modifier.doIt()
+                done.append(modifier)
+
+        except Exception:
+            for modifier in reversed(done):
+                modifier.undoIt()
+            raise
+
+        self.__done = True
+
+    def undoIt(self) -> None:
+
+        if not self.__done:
+            return
+
+        for modifier in reversed(self.__modifiers):
+            modifier.undoIt()
+
+        self.__done = False
+
+    def redoIt(self) -> None:
+
+        if self.__done:
+            return
+
+        self.doIt()
+
+
+@contextmanager
+def dgModifier(dag: Optional[bool] = None) -> Iterator[om.MDGModifier]:
+    """
+    :desc: yield the modifier of the active session,
+    or a new modifier executed when the block exits
+    """
+    session = ModifierSession.active()
+
+    if session:
+        yield session.modifier(dag)
+        return
+
+    mod = om.MDagModifier() if dag else om.MDGModifier()
+    yield mod
+    mod.doIt()
@@ -1,20 +1,35 @@
-from typing import Union, Any
+from typing import Union, Any, List, Optional, Callable, Iterator
 
-from maya import cmds
 from maya.api import OpenMaya as om
+
+from . import shims
+from .attributes import createAttribute
+from .cache import NAME_CACHE, PLUG_CACHE, PUBLISHED_CACHE
+from .modifier import dgModifier
 from .plug import Plug
+from .traversal import iterAncestors, iterDependencyGraph, iterDescendants, iterSiblings
 
 
 class Node(om.MObject):
+    """
+    :desc: lightweight node reference, only the MObject is held
+    function sets and handle are created on first use
+    """
+
+    __slots__ = ('_dependencyNode', '_handle')
 
     @classmethod
     def create(cls, typ, name=None, parent=None):
 
-        if parent:
-            obj = om.MFnDagNode().create(typ, name=name, parent=parent)
+        with dgModifier(dag=bool(parent)) as modifier:
+            if parent:
+                obj = modifier.createNode(typ, Node(parent))
 
-        else:
-            obj = om.MFnDependencyNode().create(typ, name)
+            else:
+                obj = modifier.createNode(typ)
+
+            if name:
+                modifier.renameNode(obj, name)
 
         return cls(obj)
 
@@ -27,12 +42,84 @@ class Node(om.MObject):
         else:
             super().__init__(entry)
 
-        self.dependencyNode = om.MFnDependencyNode(self)
+        self._dependencyNode = None
+        self._handle = None
+
+    @property
+    def dependencyNode(self) -> om.MFnDependencyNode:
+
+        if self._dependencyNode is None:
+            self._dependencyNode = om.MFnDependencyNode(self)
+
+        return self._dependencyNode
+
+    @property
+    def handle(self) -> om.MObjectHandle:
+
+        if self._handle is None:
+            self._handle = om.MObjectHandle(self)
+
+        return self._handle
+
+    @property
+    def typeId(self) -> om.MTypeId:
+        return self.dependencyNode.typeId
+
+    @property
+    def typeName(self) -> str:
+        return self.dependencyNode.typeName
+
+    @classmethod
+    def fromNames(cls, names: List[str], cache: bool = False) -> List['Node']:
+        """
+        :desc: resolve many node names with a single selection list
+        every name has to match exactly one node
+        :param List[str] names: node names, duplicates are resolved once
+        :param bool cache: reuse and fill the scene wide name cache
+        :return: one Node per given name
+        :rtype: List[Node]
+        """
+        objects = {}
+        missing = []
+        for name in dict.fromkeys(names):
+
+            if cache and (obj := NAME_CACHE.get(name)) is not None:
+                objects[name] = obj
+
+            else:
+                missing.append(name)
+
+        selList = om.MSelectionList()
+        for name in missing:
+            length = selList.length()
+            selList.add(name)
+
+            if selList.length() == length:
+                # an other name of the same node is already in the list
+                objects[name] = om.MSelectionList().add(name).getDependNode(0)
+
+            else:
+                objects[name] = selList.getDependNode(length)
+
+            if cache:
+                NAME_CACHE.set(name, objects[name])
+
+        return [cls(objects[name]) for name in names]
+
+    def __hash__(self) -> int:
+        return self.handle.hashCode()
+
+    def __eq__(self, other: Any) -> bool:
+
+        if isinstance(other, om.MObject):
+            return om.MObject.__eq__(self, other)
+
+        return NotImplemented
 
     def __repr__(self) -> str:
 
         cls_name = self.__class__.__name__
-        typ = f'"{cmds.nodeType(self.name)}"'
+        typ = f'"{self.typeName}"'
         name = f'name="{self.name}"'
 
         return f'{cls_name}.create({typ}, {name})'
@@ -71,19 +158,117 @@ class Node(om.MObject):
 
     @name.setter
     def name(self, value: str) -> None:
-        self.dependencyNode.setName(value)
+        with dgModifier() as modifier:
+            modifier.renameNode(self, value)
+
+    def upstream(
+            self,
+            fnType: int = om.MFn.kInvalid,
+            depth: Optional[int] = None,
+            prune: Optional[Callable[['Node'], bool]] = None,
+            breadthFirst: bool = False
+            ) -> Iterator['Node']:
+        """
+        :desc: lazily walk the nodes feeding this node, see iterDependencyGraph
+        :example: next(node.upstream(om.MFn.kSkinClusterFilter), None)
+        """
+        return self.__walk(True, fnType, depth, prune, breadthFirst)
+
+    def downstream(
+            self,
+            fnType: int = om.MFn.kInvalid,
+            depth: Optional[int] = None,
+            prune: Optional[Callable[['Node'], bool]] = None,
+            breadthFirst: bool = False
+            ) -> Iterator['Node']:
+        """
+        :desc: lazily walk the nodes fed by this node, see iterDependencyGraph
+        """
+        return self.__walk(False, fnType, depth, prune, breadthFirst)
+
+    def __walk(self, upstream, fnType, depth, prune, breadthFirst) -> Iterator['Node']:
+
+        if prune is not None:
+            predicate = prune
+            prune = lambda obj: predicate(Node(obj))
+
+        for obj in iterDependencyGraph(
+                self,
+                upstream=upstream,
+                fnType=fnType,
+                depth=depth,
+                prune=prune,
+                breadthFirst=breadthFirst
+                ):
+            yield Node(obj)
+
+    def descendants(
+            self,
+            fnType: int = om.MFn.kInvalid,
+            depth: Optional[int] = None,
+            prune: Optional[Callable[['Node'], bool]] = None,
+            breadthFirst: bool = False,
+            instances: bool = False
+            ) -> Iterator['Node']:
+        """
+        :desc: lazily walk the dag nodes below this node, see iterDescendants
+        :example: for shape in node.descendants(om.MFn.kShape): ...
+        """
+        return self.__dagWalk(iterDescendants, fnType, depth, prune, breadthFirst, instances)
+
+    def ancestors(
+            self,
+            fnType: int = om.MFn.kInvalid,
+            depth: Optional[int] = None,
+            prune: Optional[Callable[['Node'], bool]] = None,
+            breadthFirst: bool = False,
+            instances: bool = False
+            ) -> Iterator['Node']:
+        """
+        :desc: lazily walk the dag nodes above this node, see iterAncestors
+        """
+        return self.__dagWalk(iterAncestors, fnType, depth, prune, breadthFirst, instances)
+
+    def siblings(self, fnType: int = om.MFn.kInvalid, instances: bool = False) -> Iterator['Node']:
+        """
+        :desc: lazily list the other children of the parents of this node, see iterSiblings
+        """
+        if not self.hasFn(om.MFn.kDagNode):
+            return
+
+        for path in iterSiblings(self, fnType, instances):
+            yield Node(path.node())
+
+    def __dagWalk(self, walker, fnType, depth, prune, breadthFirst, instances) -> Iterator['Node']:
+
+        if not self.hasFn(om.MFn.kDagNode):
+            return
+
+        if prune is not None:
+            predicate = prune
+            prune = lambda obj: predicate(Node(obj))
+
+        for path in walker(
+                self,
+                fnType=fnType,
+                depth=depth,
+                prune=prune,
+                breadthFirst=breadthFirst,
+                instances=instances
+                ):
+            yield Node(path.node())
 
     def __getitem__(self, item: Union[str, int]) -> 'Plug':
 
-        if self.hasFn(om.MFn.kContainer):
-            container = om.MFnContainerNode(self)
-            plugs, names = container.getPublishedPlugs()
+        return Plug(PLUG_CACHE.find(self, item, self.__findPlug))
+
+    def __findPlug(self, item: Union[str, int]) -> om.MPlug:
 
-            for plug, name in zip(plugs, names):
-                if item == name:
-                    return Plug(plug)
+        if self.hasFn(om.MFn.kContainer):
+            if (plug := PUBLISHED_CACHE.get(self).plugs.get(item)) is not None:
+                return plug
 
-        return Plug(self.dependencyNode.findPlug(item, True))
+        return self.dependencyNode.findPlug(item, True)
 
     def __setitem__(
             self,
@@ -98,6 +283,16 @@ class Node(om.MObject):
             self[key].set(value)
 
     def addAttr(self, **kwargs) -> Plug:
-        name = kwargs.get('ln', kwargs.get('sn'))
-        cmds.addAttr(self.name, **kwargs)
-        return self[name]
+        """
+        :desc: add a dynamic attribute, kwargs are the cmds.addAttr flags
+        the attribute is built with the attribute function sets and added with a modifier,
+        flags the function sets do not cover go through the cmds shim
+        """
+        if (attr := createAttribute(**kwargs)) is None:
+            shims.addAttr(self, **kwargs)
+            return self[kwargs.get('ln', kwargs.get('longName', kwargs.get('sn', kwargs.get('shortName'))))]
+
+        with dgModifier() as modifier:
+            modifier.addAttribute(self, attr)
+
+        return Plug(om.MPlug(self, attr))
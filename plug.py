@@ -1,8 +1,10 @@
-from typing import Union, Any, List
+from typing import Union, Any, List, Optional
 
 from maya.api import OpenMaya as om
 
 from . import node as nde
+from .arrays import PlugAccessor, arrayData, handleAccessor, requireNumpy
+from .modifier import ModifierSession, dgModifier
 
 
 class Plug(om.MPlug):
@@ -132,31 +134,164 @@ class Plug(om.MPlug):
             matobj = matrixData.create(value[0])
             self.setMObject(matobj)
 
+    def getArray(self, indices: Optional[List[int]] = None) -> 'numpy.ndarray':
+        """
+        :desc: read a whole multi attribute or typed array data at once
+        multis are read through one array data handle,
+        typed arrays (double, float, int, point, vector) through their data object
+        :param List[int] | None indices: logical indices for multis, positions for
+        typed arrays, every existing element when None
+        :return: array of shape (N,) or (N, k), points are returned without w
+        :rtype: numpy.ndarray
+        """
+        np = requireNumpy()
+
+        if self.isArray:
+            return self.__getMulti(np, indices)
+
+        if description := arrayData(self.attribute()):
+            fnData, _, dtype, width = description
+            values = np.array(fnData(self.asMObject()).array(), dtype=dtype)
+
+            if width > 1:
+                values = values[:, :width] if values.size else values.reshape(0, width)
+
+            return values if indices is None else values[list(indices)]
+
+        raise TypeError(f'{self} is neither a multi nor a typed array attribute')
+
+    def setArray(self, values: Any, indices: Optional[List[int]] = None) -> None:
+        """
+        :desc: write a whole multi attribute or typed array data at once
+        typed arrays and non numeric multis are written by a modifier, numeric multis through
+        one array data handle, set at once like Plug.set and not undoable, inside a modifier
+        session every multi joins the session modifier so it is part of the batch and its undo
+        :param values: array of shape (N,) or (N, k)
+        :param List[int] | None indices: logical indices for multis, positions for
+        typed arrays, 0 to N - 1 when None, other elements are kept
+        """
+        np = requireNumpy()
+
+        if self.isArray:
+            return self.__setMulti(np, values, indices)
+
+        if description := arrayData(self.attribute()):
+            fnData, build, dtype, width = description
+
+            if indices is None:
+                array = np.asarray(values, dtype=dtype)
+
+            else:
+                array = self.getArray().astype(dtype)
+                array[list(indices)] = values
+
+            obj = fnData().create(build(array.tolist()))
+            with dgModifier() as modifier:
+                modifier.newPlugValue(self, obj)
+            return
+
+        raise TypeError(f'{self} is neither a multi nor a typed array attribute')
+
+    def __getMulti(self, np, indices: Optional[List[int]]) -> 'numpy.ndarray':
+
+        if indices is None:
+            indices = self.getExistingArrayAttributeIndices()
+
+        accessor = handleAccessor(self.attribute())
+
+        # non numeric elements, type is still decided once for every plug
+        if accessor is None:
+            plugs = [self.elementByLogicalIndex(idx) for idx in indices]
+            if not plugs:
+                return np.empty((0,))
+
+            plugAccessor = PlugAccessor(plugs[0])
+            return np.array(plugAccessor.readAll(plugs), dtype=plugAccessor.dtype)
+
+        dtype, width, getter, _ = accessor
+        shape = (len(indices),) if width == 1 else (len(indices), width)
+        values = np.zeros(shape, dtype=dtype)
+
+        handle = self.asMDataHandle()
+        try:
+            arrayHandle = om.MArrayDataHandle(handle)
+            for row, idx in enumerate(indices):
+                try:
+                    arrayHandle.jumpToLogicalElement(idx)
+                except RuntimeError:
+                    continue
+
+                values[row] = getter(arrayHandle.inputValue())
+
+        finally:
+            self.destructHandle(handle)
+
+        return values
+
+    def __setMulti(self, np, values: Any, indices: Optional[List[int]]) -> None:
+
+        accessor = handleAccessor(self.attribute())
+        values = np.asarray(values)
+        if indices is None:
+            indices = range(len(values))
+
+        # non numeric elements, and any element inside a session, are written plug by plug in one modifier
+        if accessor is None or ModifierSession.active() is not None:
+            plugs = [self.elementByLogicalIndex(idx) for idx in indices]
+            if not plugs:
+                return
+
+            plugAccessor = PlugAccessor(plugs[0])
+            with dgModifier() as modifier:
+                plugAccessor.writeAll(modifier, plugs, values.tolist())
+            return
+
+        dtype, width, _, setter = accessor
+        handle = self.asMDataHandle()
+        try:
+            arrayHandle = om.MArrayDataHandle(handle)
+            builder = arrayHandle.builder()
+
+            for idx, value in zip(indices, values.astype(dtype).tolist()):
+                setter(builder.addElement(idx), value)
+
+            arrayHandle.set(builder)
+            self.setMDataHandle(handle)
+
+        finally:
+            self.destructHandle(handle)
+
     def connect(self, other: 'Plug', force=False) -> None:
+        """
+        :desc: connect to other, inside a modifier session the source queued
+        on other by earlier operations is the one checked and disconnected
+        """
+        session = ModifierSession.active()
+        source = session.source(other) if session else om.MPlug.source(other)
+
+        with dgModifier() as modifier:
+            if not source.isNull and force:
+                modifier.disconnect(source, other)
 
-        modifier = om.MDGModifier()
-        if other.isDestination and force:
-            modifier.disconnect(other.source(), other)
+            elif not source.isNull:
+                raise NameError(f"plug {other} is already connected")
 
-        elif other.isDestination:
-            raise NameError(f"plug {other} is already connected")
+            modifier.connect(self, other)
 
-        modifier.connect(self, other)
-        modifier.doIt()
+        if session:
+            session.connected(self, other)
 
     def disconnect(self, other: 'Plug') -> None:
-        modifier = om.MDGModifier()
-        modifier.disconnect(self, other)
-        modifier.doIt()
+
+        session = ModifierSession.active()
+        with dgModifier() as modifier:
+            modifier.disconnect(self, other)
+
+        if session:
+            session.disconnected(other)
 
     def __rshift__(self, other) -> None:
         self.connect(other, force=True)
 
     def __lshift__(self, other) -> None:
-
-        modifier = om.MDGModifier()
-        if self.isDestination:
-            modifier.disconnect(self.source(), self)
-
-        modifier.connect(other, self)
-        modifier.doIt()
+        Plug(other).connect(self, force=True)
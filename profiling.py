@@ -0,0 +1,377 @@
+import importlib
+import inspect
+import json
+import types
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from maya.api import OpenMaya as om
+
+UNATTRIBUTED = '<unattributed>'
+
+_MISSING = object()
+
+_METHOD_TYPES = (types.FunctionType, types.MethodDescriptorType, types.WrapperDescriptorType)
+
+# grapher modules whose om and cmds globals are swapped while profiling
+_MODULES = (
+    'arrays', 'attributes', 'cache', 'container', 'context', 'graph', 'hierarchy',
+    'live', 'modifier', 'node', 'plug', 'query', 'shims', 'snapshot', 'topology', 'transforms', 'traversal'
+    )
+
+# public classes whose methods are reported as grapher operations
+_OPERATIONS = (
+    ('graph', 'Graph'), ('live', 'LiveGraph'), ('node', 'Node'),
+    ('container', 'Container'), ('plug', 'Plug'), ('modifier', 'ModifierSession')
+    )
+
+_DUNDERS = {
+    '__getitem__', '__setitem__', '__iter__', '__contains__', '__and__', '__or__',
+    '__xor__', '__sub__', '__iand__', '__ior__', '__ixor__', '__isub__',
+    '__rshift__', '__lshift__', '__enter__', '__exit__'
+    }
+
+
+class CallStats:
+
+    __slots__ = ('count', 'seconds')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+
+
+class ProfileStats:
+    """
+    :desc: api and cmds calls counted and timed per public grapher operation
+    calls are attributed to the outermost grapher method on the stack,
+    operation time is inclusive so python overhead is operation time minus api time
+    """
+
+    def __init__(self) -> None:
+        self.operations: Dict[str, CallStats] = {}
+        self.calls: Dict[str, Dict[str, CallStats]] = {}
+        self.__stack: List[str] = []
+
+    def _enter(self, operation: str) -> None:
+        self.__stack.append(operation)
+
+    def _exit(self, operation: str, seconds: float) -> None:
+        self.__stack.pop()
+        self.operations.setdefault(operation, CallStats()).add(seconds)
+
+    def _record(self, call: str, seconds: float) -> None:
+        operation = self.__stack[0] if self.__stack else UNATTRIBUTED
+        self.calls.setdefault(operation, {}).setdefault(call, CallStats()).add(seconds)
+
+    def apiSeconds(self, operation: str) -> float:
+        return sum(stats.seconds for stats in self.calls.get(operation, {}).values())
+
+    def toDict(self) -> Dict[str, Any]:
+
+        result = {}
+        for operation in sorted(set(self.operations) | set(self.calls)):
+            stats = self.operations.get(operation, CallStats())
+            result[operation] = {
+                'count': stats.count,
+                'seconds': stats.seconds,
+                'apiSeconds': self.apiSeconds(operation),
+                'calls': {
+                    call: {'count': callStats.count, 'seconds': callStats.seconds}
+                    for call, callStats in self.calls.get(operation, {}).items()
+                    },
+                }
+
+        return result
+
+    def report(self, limit: Optional[int] = 10) -> str:
+        """
+        :desc: readable summary, operations sorted by time, their api calls sorted by time
+        :param int | None limit: number of api calls listed per operation, None for all
+        """
+        lines = []
+        entries = self.toDict()
+        order = sorted(entries, key=lambda name: -max(entries[name]['seconds'], entries[name]['apiSeconds']))
+
+        for operation in order:
+            entry = entries[operation]
+            python = max(entry['seconds'] - entry['apiSeconds'], 0.0)
+            lines.append(
+                f'{operation}: {_count(entry["count"])} calls, {entry["seconds"]:.3f}s, '
+                f'{entry["apiSeconds"]:.3f}s api, {python:.3f}s python'
+                )
+
+            calls = sorted(entry['calls'].items(), key=lambda item: -item[1]['seconds'])
+            for call, stats in calls[:limit]:
+                lines.append(f'    {_count(stats["count"])} {call} calls, {stats["seconds"]:.3f}s')
+
+        return '\n'.join(lines)
+
+    def export(self, path: str) -> None:
+        with open(path, 'w') as stream:
+            json.dump(self.toDict(), stream, indent=2, sort_keys=True)
+
+
+def _unwrapped(function: Callable) -> Callable:
+    """
+    :desc: original of a method already timed through a base class
+    """
+    return getattr(function, '_profiled', function)
+
+
+def _count(count: int) -> str:
+
+    for threshold, suffix in ((1e9, 'G'), (1e6, 'M'), (1e3, 'k')):
+        if count >= threshold:
+            return f'{count / threshold:.1f}{suffix}'
+
+    return str(count)
+
+
+class _InstrumentedType(type):
+    """
+    :desc: type of the instrumented api classes, construction is timed
+    and returns an instance of the real class, so nothing built inside the block keeps a profiling type
+    """
+
+    def __instancecheck__(cls, instance: Any) -> bool:
+        return isinstance(instance, cls._real)
+
+    def __subclasscheck__(cls, subclass: type) -> bool:
+        return issubclass(subclass, cls._real)
+
+    def __call__(cls, *args, **kwargs) -> Any:
+        start = perf_counter()
+        try:
+            return cls._real(*args, **kwargs)
+        finally:
+            cls._stats._record(cls._label, perf_counter() - start)
+
+
+class _Instrumentation:
+    """
+    :desc: installs the module proxies and method wrappers for one ProfileStats
+    and restores every patched attribute on uninstall
+    """
+
+    def __init__(self, stats: ProfileStats) -> None:
+        self.stats = stats
+        self.__patches: List[Tuple[Any, str, Any]] = []
+        self.__classes: Dict[type, type] = {}
+
+    def __patch(self, owner: Any, name: str, value: Any) -> None:
+        previous = owner.__dict__.get(name, _MISSING)
+        setattr(owner, name, value)
+        self.__patches.append((owner, name, previous))
+
+    def install(self) -> None:
+
+        package = __name__.rpartition('.')[0]
+        modules = {name: importlib.import_module(f'{package}.{name}') for name in _MODULES}
+
+        for module in modules.values():
+            if 'om' in module.__dict__:
+                self.__patch(module, 'om', _ModuleProxy(module.om, self))
+
+            if 'cmds' in module.__dict__:
+                self.__patch(module, 'cmds', _ModuleProxy(module.cmds, self, 'cmds.'))
+
+        for moduleName, className in _OPERATIONS:
+            cls = getattr(modules[moduleName], className)
+            self.__wrapOperations(cls)
+
+            # api methods inherited by the grapher class bypass the module proxy
+            base = cls.__bases__[0]
+            if getattr(om, base.__name__, None) is base:
+                for name, method in self.__apiMethods(base):
+                    if not any(name in klass.__dict__ for klass in cls.__mro__[:-len(base.__mro__)]):
+                        self.__patch(cls, name, self.__timed(method, f'{base.__name__}.{name}'))
+
+    def uninstall(self) -> None:
+
+        for owner, name, value in reversed(self.__patches):
+            if value is _MISSING:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, value)
+
+        self.__patches = []
+
+    @staticmethod
+    def __apiMethods(cls: type) -> Iterator[Tuple[str, Any]]:
+
+        for name in dir(cls):
+            if name.startswith('_'):
+                continue
+
+            # instance methods only, static and class methods are bound differently
+            if isinstance(inspect.getattr_static(cls, name), _METHOD_TYPES):
+                yield name, _unwrapped(getattr(cls, name))
+
+    def __timed(self, function: Callable, label: str) -> Callable:
+
+        stats = self.stats
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stats._record(label, perf_counter() - start)
+
+        timed._profiled = function
+        return timed
+
+    def wrapApi(self, value: Any, label: str) -> Any:
+        """
+        :desc: counted stand-in for an attribute of maya.cmds or maya.api.OpenMaya
+        """
+        if isinstance(value, type):
+            return self.__instrumentedClass(value, label)
+
+        if callable(value):
+            return self.__timed(value, label)
+
+        return value
+
+    def __instrumentedClass(self, cls: type, label: str) -> type:
+        """
+        :desc: the methods are wrapped on the real class until uninstall,
+        the returned subclass only times construction
+        """
+        if cls in self.__classes:
+            return self.__classes[cls]
+
+        try:
+            for name, method in self.__apiMethods(cls):
+                self.__patch(cls, name, self.__timed(method, f'{label}.{name}'))
+
+            for name in dir(cls):
+                static = inspect.getattr_static(cls, name)
+                if not name.startswith('_') and isinstance(static, staticmethod):
+                    function = _unwrapped(getattr(cls, name))
+                    self.__patch(cls, name, staticmethod(self.__timed(function, f'{label}.{name}')))
+
+        except TypeError:
+            # methods of immutable extension types can not be replaced, only their construction is timed
+            pass
+
+        try:
+            instrumented = _InstrumentedType(cls.__name__, (cls,), {'_real': cls, '_label': label, '_stats': self.stats})
+        except TypeError:
+            # final api types can not be subclassed, they are used as is
+            instrumented = cls
+
+        self.__classes[cls] = instrumented
+        return instrumented
+
+    def __wrapOperations(self, cls: type) -> None:
+
+        for name, value in list(cls.__dict__.items()):
+            if name.startswith('_') and name not in _DUNDERS:
+                continue
+
+            label = f'{cls.__name__}.{name}'
+            if isinstance(value, (staticmethod, classmethod)):
+                self.__patch(cls, name, type(value)(self.__operation(value.__func__, label)))
+
+            elif isinstance(value, property):
+                self.__patch(cls, name, property(
+                        value.fget and self.__operation(value.fget, label),
+                        value.fset and self.__operation(value.fset, label),
+                        value.fdel,
+                        value.__doc__
+                        ))
+
+            elif isinstance(value, types.FunctionType):
+                self.__patch(cls, name, self.__operation(value, label))
+
+    def __operation(self, function: Callable, label: str) -> Callable:
+
+        stats = self.stats
+
+        def operation(*args, **kwargs):
+            stats._enter(label)
+            start = perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                stats._exit(label, perf_counter() - start)
+
+            if isinstance(result, types.GeneratorType):
+                return self.__generator(result, label)
+
+            return result
+
+        operation.__name__ = function.__name__
+        operation.__doc__ = function.__doc__
+        return operation
+
+    def __generator(self, generator: Iterator, label: str) -> Iterator:
+        """
+        :desc: lazy walks do their work while iterated, each step is timed as the operation
+        """
+        stats = self.stats
+        while True:
+            stats._enter(label)
+            start = perf_counter()
+            try:
+                value = next(generator)
+            except StopIteration:
+                return
+            finally:
+                stats._exit(label, perf_counter() - start)
+
+            yield value
+
+
+class _ModuleProxy:
+    """
+    :desc: module stand-in returning counted versions of the module attributes
+    """
+
+    def __init__(self, module: types.ModuleType, instrumentation: _Instrumentation, prefix: str = '') -> None:
+        self.__module = module
+        self.__instrumentation = instrumentation
+        self.__prefix = prefix
+
+    def __getattr__(self, name: str) -> Any:
+        value = self.__instrumentation.wrapApi(getattr(self.__module, name), f'{self.__prefix}{name}')
+        setattr(self, name, value)
+        return value
+
+
+_active: Optional[_Instrumentation] = None
+
+
+@contextmanager
+def profile() -> Iterator[ProfileStats]:
+    """
+    :desc: count and time the maya api and cmds calls made by grapher inside the block
+    nothing is patched outside of the block, so profiling costs nothing when unused,
+    api objects created inside the block are instances of the real classes and are not counted afterwards,
+    a profile opened inside another one yields the outer stats
+    :return: stats filled while the block runs
+    :rtype: ProfileStats
+    """
+    global _active
+
+    if _active is not None:
+        yield _active.stats
+        return
+
+    instrumentation = _Instrumentation(ProfileStats())
+    instrumentation.install()
+    _active = instrumentation
+
+    try:
+        yield instrumentation.stats
+
+    finally:
+        _active = None
+        instrumentation.uninstall()
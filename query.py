@@ -0,0 +1,164 @@
+"""
+:desc: declarative node queries
+type and hierarchy constraints are given to the native iterators as function set filters,
+attribute predicates are evaluated on batches of the iterated nodes
+"""
+import operator
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from maya.api import OpenMaya as om
+
+from .arrays import PlugAccessor
+from .traversal import iterDagNodes, iterNodes, typeConstraint, typeFilter
+
+OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    'in': lambda value, operand: value in operand,
+    'not in': lambda value, operand: value not in operand,
+    }
+
+# number of nodes read per attribute pass
+BATCH_SIZE = 1024
+
+
+def predicate(condition: Any) -> Callable[[Any], bool]:
+    """
+    :desc: compile a where condition, a callable called with the attribute value,
+    an (operator, operand) tuple with an operator of OPERATORS, or a value the attribute has to equal
+    compound and matrix values are read as lists, tuple operands are compared as lists
+    """
+    if callable(condition):
+        return condition
+
+    if isinstance(condition, tuple) and len(condition) == 2 and isinstance(condition[0], str):
+        op, operand = condition
+        if op not in OPERATORS:
+            raise TypeError(f'unknown query operator {op}, expected one of {", ".join(OPERATORS)}')
+
+    else:
+        op, operand = '==', condition
+
+    compare = OPERATORS[op]
+    if isinstance(operand, tuple) and op not in ('in', 'not in'):
+        operand = list(operand)
+
+    return lambda value: compare(value, operand)
+
+
+def _reader(plug: om.MPlug) -> Callable[[om.MPlug], Any]:
+
+    try:
+        return PlugAccessor(plug).read
+
+    except TypeError:
+        attr = plug.attribute()
+        if attr.hasFn(om.MFn.kTypedAttribute) and om.MFnTypedAttribute(attr).attrType() == om.MFnData.kString:
+            return om.MPlug.asString
+
+        raise TypeError(f'{plug.name()} can not be used in a query predicate')
+
+
+def filterAttributes(
+        objects: List[om.MObject],
+        where: Dict[str, Callable[[Any], bool]]
+        ) -> List[om.MObject]:
+    """
+    :desc: keep the nodes whose attributes match every compiled predicate
+    each predicate reads one attribute on the nodes kept by the previous ones,
+    the value reader is decided once per attribute, nodes without the attribute are dropped
+    """
+    for name, match in where.items():
+        readers = {}
+        kept = []
+
+        for obj in objects:
+            fn = om.MFnDependencyNode(obj)
+            if not fn.hasAttribute(name):
+                continue
+
+            plug = fn.findPlug(name, True)
+            key = om.MObjectHandle(plug.attribute()).hashCode()
+            if (read := readers.get(key)) is None:
+                read = readers[key] = _reader(plug)
+
+            if match(read(plug)):
+                kept.append(obj)
+
+        objects = kept
+        if not objects:
+            break
+
+    return objects
+
+
+def _members(container: om.MObject) -> List[om.MObject]:
+
+    if not container.hasFn(om.MFn.kContainer):
+        raise TypeError(f'{om.MFnDependencyNode(container).name()} is not a container')
+
+    return om.MFnContainerNode(container).getMembers()
+
+
+def _candidates(
+        typeNames: Union[str, List[str], None],
+        under: Optional[om.MObject],
+        inContainer: Optional[om.MObject]
+        ) -> Iterable[om.MObject]:
+    """
+    :desc: nodes matching the type, hierarchy and container constraints
+    """
+    if inContainer is not None and under is None:
+        members = _members(inContainer)
+        if not typeNames:
+            return members
+
+        match = typeFilter(typeNames)
+        return (obj for obj in members if match(obj))
+
+    if under is None:
+        objects = iterNodes(typeNames)
+
+    else:
+        if not under.hasFn(om.MFn.kDagNode):
+            raise TypeError(f'{om.MFnDependencyNode(under).name()} is not a dagNode')
+
+        fnType, match = typeConstraint(typeNames)
+        objects = iterDagNodes(fnType, under)
+        if match is not None:
+            objects = (obj for obj in objects if match(obj))
+
+    if inContainer is not None:
+        hashes = {om.MObjectHandle(member).hashCode() for member in _members(inContainer)}
+        objects = (obj for obj in objects if om.MObjectHandle(obj).hashCode() in hashes)
+
+    return objects
+
+
+def iterQuery(
+        typeNames: Union[str, List[str], None] = None,
+        under: Optional[om.MObject] = None,
+        where: Optional[Dict[str, Any]] = None,
+        inContainer: Optional[om.MObject] = None
+        ) -> Iterator[om.MObject]:
+    """
+    :desc: lazily yield the nodes matching every constraint
+    :param str | List[str] | None typeNames: node types, types deriving from them match too
+    :param MObject | None under: only dag descendants of this node
+    :param dict | None where: attribute name: condition, see predicate
+    :param MObject | None inContainer: only members of this container
+    """
+    objects = iter(_candidates(typeNames, under, inContainer))
+
+    if not where:
+        yield from objects
+        return
+
+    where = {name: predicate(condition) for name, condition in where.items()}
+    while batch := list(islice(objects, BATCH_SIZE)):
+        yield from filterAttributes(batch, where)
@@ -0,0 +1,45 @@
+"""
+:desc: maya.cmds fallbacks for the few cases the api based core does not cover
+flags the api implementations do not support are forwarded here unchanged
+"""
+from functools import lru_cache
+from typing import List, Tuple
+
+from maya import cmds
+from maya.api import OpenMaya as om
+
+
+def ls(*args, **kwargs) -> List[str]:
+    return cmds.ls(*args, **kwargs) or []
+
+
+def listHistory(*args, **kwargs) -> List[str]:
+    return cmds.listHistory(*args, **kwargs) or []
+
+
+def listRelatives(*args, **kwargs) -> List[str]:
+    return cmds.listRelatives(*args, **kwargs) or []
+
+
+def addAttr(node: om.MObject, **kwargs) -> None:
+    name = om.MSelectionList().add(node).getSelectionStrings()[0]
+    cmds.addAttr(name, **kwargs)
+
+
+def addContainerNodes(container: str, nodes: List[str]) -> None:
+    """
+    :desc: add nodes to a container, the api has no call editing membership
+    """
+    cmds.container(container, edit=True, addNode=nodes)
+
+
+def removeContainerNodes(container: str, nodes: List[str]) -> None:
+    cmds.container(container, edit=True, removeNode=nodes)
+
+
+@lru_cache(maxsize=None)
+def derivedTypes(typeName: str) -> Tuple[str, ...]:
+    """
+    :desc: the node type and every type deriving from it, asked once per type
+    """
+    return tuple(cmds.nodeType(typeName, derived=True, isTypeName=True) or (typeName,))
@@ -0,0 +1,364 @@
+import json
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from maya.api import OpenMaya as om
+
+from .arrays import PlugAccessor, arrayData, handleAccessor, requireNumpy
+from .attributes import createAttribute, describeAttribute
+from .modifier import ModifierSession
+from .plug import Plug
+
+MAGIC = b'GRAPHER\x01'
+
+
+def plugPath(plug: om.MPlug) -> List[list]:
+    """
+    :desc: describe a plug as [attribute long name, logical index or None] from its root attribute
+    """
+    path = []
+    while True:
+        index = None
+        if plug.isElement:
+            index = plug.logicalIndex()
+            plug = plug.array()
+
+        path.append([om.MFnAttribute(plug.attribute()).name, index])
+
+        if not plug.isChild:
+            break
+
+        plug = plug.parent()
+
+    return path[::-1]
+
+
+def resolvePlug(obj: om.MObject, path: List[list], attributes: Optional[Dict[str, om.MObject]] = None) -> om.MPlug:
+    """
+    :desc: get the plug described by plugPath on obj
+    :param Dict[str, MObject] | None attributes: root attributes not added to obj yet, by long name
+    """
+    fn = om.MFnDependencyNode(obj)
+
+    plug = None
+    for name, index in path:
+        if plug is None and attributes and name in attributes:
+            attr = attributes[name]
+        else:
+            attr = fn.attribute(name)
+
+        plug = om.MPlug(obj, attr) if plug is None else plug.child(attr)
+
+        if index is not None:
+            plug = plug.elementByLogicalIndex(index)
+
+    return plug
+
+
+class Snapshot:
+    """
+    :desc: compact description of nodes, their dag parenting, their dynamic attributes,
+    their non default attribute values and the connections between them
+    serialized as a zlib compressed json header followed by raw numpy buffers
+    dynamic attributes createAttribute can not build back (compounds, generic data)
+    are left out with their values and connections,
+    values of compound multis such as skinCluster weightList or blendShape
+    inputTarget are not captured, connections to them are
+    """
+
+    def __init__(
+            self,
+            nodes: Optional[List[Dict[str, Any]]] = None,
+            connections: Optional[List[list]] = None,
+            buffers: Optional[List['numpy.ndarray']] = None
+            ) -> None:
+
+        self.nodes = nodes or []
+        self.connections = connections or []
+        self.buffers = buffers or []
+
+    @classmethod
+    def capture(cls, objects: List[om.MObject]) -> 'Snapshot':
+
+        snapshot = cls()
+
+        # parents are captured before their children so restore can create them in order
+        objects = sorted(objects, key=cls.__depth)
+        indices = {om.MObjectHandle(obj).hashCode(): idx for idx, obj in enumerate(objects)}
+
+        skipped = []
+        for obj in objects:
+            fn = om.MFnDependencyNode(obj)
+
+            parent = None
+            if obj.hasFn(om.MFn.kDagNode):
+                dagNode = om.MFnDagNode(obj)
+                if dagNode.parentCount():
+                    parent = indices.get(om.MObjectHandle(dagNode.parent(0)).hashCode())
+
+            dynamic, missing = cls.__captureDynamic(fn)
+            skipped.append(missing)
+
+            snapshot.nodes.append({
+                'type': fn.typeName,
+                'name': fn.name().rsplit(':', 1)[-1],
+                'dag': obj.hasFn(om.MFn.kDagNode),
+                'parent': parent,
+                'dynamic': dynamic,
+                'attrs': snapshot.__captureAttributes(obj, fn, missing),
+                })
+
+        # sources can come later in capture order, connections are read once every node is described
+        for dst, obj in enumerate(objects):
+            for plug in om.MFnDependencyNode(obj).getConnections():
+                if not plug.isDestination:
+                    continue
+
+                source = plug.source()
+                if (src := indices.get(om.MObjectHandle(source.node()).hashCode())) is None:
+                    continue
+
+                srcPath, dstPath = plugPath(source), plugPath(plug)
+                if srcPath[0][0] in skipped[src] or dstPath[0][0] in skipped[dst]:
+                    continue
+
+                snapshot.connections.append([src, srcPath, dst, dstPath])
+
+        return snapshot
+
+    @staticmethod
+    def __depth(obj: om.MObject) -> int:
+
+        if not obj.hasFn(om.MFn.kDagNode):
+            return 0
+
+        return om.MDagPath.getAPathTo(obj).length() + 1
+
+    def __addBuffer(self, array: 'numpy.ndarray') -> int:
+        self.buffers.append(array)
+        return len(self.buffers) - 1
+
+    @staticmethod
+    def __captureDynamic(fn: om.MFnDependencyNode) -> Tuple[List[Dict[str, Any]], Set[str]]:
+        """
+        :desc: definitions of the dynamic root attributes of the node
+        and the names of the ones that can not be built back
+        """
+        dynamic, missing = [], set()
+        for idx in range(fn.attributeCount()):
+            attr = fn.attribute(idx)
+            if fn.attributeClass(attr) != om.MFnDependencyNode.kLocalDynamicAttr:
+                continue
+
+            fnAttr = om.MFnAttribute(attr)
+            if not fnAttr.parent.isNull():
+                continue
+
+            if (flags := describeAttribute(attr)) is None:
+                missing.add(fnAttr.name)
+            else:
+                dynamic.append(flags)
+
+        return dynamic, missing
+
+    def __captureAttributes(self, obj: om.MObject, fn: om.MFnDependencyNode, missing: Set[str]) -> List[list]:
+
+        attrs = []
+        for idx in range(fn.attributeCount()):
+            attr = fn.attribute(idx)
+            fnAttr = om.MFnAttribute(attr)
+
+            if not fnAttr.parent.isNull() or not (fnAttr.writable and fnAttr.storable):
+                continue
+
+            if fnAttr.name in missing and fn.attributeClass(attr) == om.MFnDependencyNode.kLocalDynamicAttr:
+                continue
+
+            plug = om.MPlug(obj, attr)
+            if plug.isDestination:
+                continue
+
+            if entry := self.__captureAttribute(plug, attr, fnAttr.name):
+                attrs.append(entry)
+
+        return attrs
+
+    def __captureAttribute(self, plug: om.MPlug, attr: om.MObject, name: str) -> Optional[list]:
+
+        if plug.isArray:
+            indices = plug.getExistingArrayAttributeIndices()
+            if not indices or (handleAccessor(attr) is None and plug.isCompound):
+                return
+
+            np = requireNumpy()
+            try:
+                values = Plug(plug).getArray(indices)
+            except TypeError:
+                return
+
+            return [name, 'multi', self.__addBuffer(np.array(indices)), self.__addBuffer(values)]
+
+        if arrayData(attr):
+            try:
+                values = Plug(plug).getArray()
+            except RuntimeError:
+                # no data set on the plug yet
+                return
+
+            if len(values):
+                return [name, 'array', self.__addBuffer(values)]
+            return
+
+        if plug.isDefaultValue():
+            return
+
+        if attr.hasFn(om.MFn.kTypedAttribute):
+            if om.MFnTypedAttribute(attr).attrType() == om.MFnData.kString:
+                return [name, 'string', plug.asString()]
+
+        try:
+            accessor = PlugAccessor(plug)
+        except TypeError:
+            return
+
+        return [name, 'value', accessor.read(plug)]
+
+    def toBytes(self) -> bytes:
+
+        header = {
+            'nodes': self.nodes,
+            'connections': self.connections,
+            'buffers': [],
+            }
+
+        chunks = []
+        for array in self.buffers:
+            header['buffers'].append({'dtype': array.dtype.str, 'shape': list(array.shape)})
+            chunks.append(array.tobytes())
+
+        header = json.dumps(header, separators=(',', ':')).encode('utf-8')
+        body = struct.pack('<I', len(header)) + header + b''.join(chunks)
+        return MAGIC + zlib.compress(body)
+
+    @classmethod
+    def fromBytes(cls, data: bytes) -> 'Snapshot':
+
+        if not data.startswith(MAGIC):
+            raise ValueError('data is not a grapher snapshot')
+
+        body = zlib.decompress(data[len(MAGIC):])
+        size, = struct.unpack_from('<I', body)
+        header = json.loads(body[4:4 + size].decode('utf-8'))
+
+        buffers = []
+        offset = 4 + size
+        if header['buffers']:
+            np = requireNumpy()
+
+            for description in header['buffers']:
+                dtype = np.dtype(description['dtype'])
+                count = int(np.prod(description['shape']))
+                array = np.frombuffer(body, dtype=dtype, count=count, offset=offset)
+                buffers.append(array.reshape(description['shape']))
+                offset += count * dtype.itemsize
+
+        return cls(header['nodes'], header['connections'], buffers)
+
+    def restore(self, namespace: Optional[str] = None) -> List[om.MObject]:
+        """
+        :desc: create the captured nodes, values and connections in one modifier pass
+        :param str | None namespace: namespace the nodes are renamed in, created if needed
+        :return: created nodes in capture order
+        :rtype: List[MObject]
+        """
+        if namespace and not om.MNamespace.namespaceExists(namespace):
+            om.MNamespace.addNamespace(namespace)
+
+        session = ModifierSession()
+        objects = []
+
+        for description in self.nodes:
+            objects.append(self.__createNode(session, description, objects, namespace))
+
+        # dynamic attributes are queued on the nodes, plugs on them are built from the attribute objects
+        modifier = session.modifier()
+        attributes = []
+        for obj, description in zip(objects, self.nodes):
+            added = {}
+            for flags in description.get('dynamic', ()):
+                attr = createAttribute(**flags)
+                modifier.addAttribute(obj, attr)
+                added[flags['longName']] = attr
+
+            attributes.append(added)
+
+        for obj, added, description in zip(objects, attributes, self.nodes):
+            for entry in description['attrs']:
+                self.__restoreAttribute(modifier, obj, added, entry)
+
+        for src, srcPath, dst, dstPath in self.connections:
+            modifier.connect(
+                    resolvePlug(objects[src], srcPath, attributes[src]),
+                    resolvePlug(objects[dst], dstPath, attributes[dst])
+                    )
+
+        session.doIt()
+        return objects
+
+    @staticmethod
+    def __createNode(
+            session: ModifierSession,
+            description: Dict[str, Any],
+            objects: List[om.MObject],
+            namespace: Optional[str]
+            ) -> om.MObject:
+
+        typ = description['type']
+        parent = description['parent']
+
+        if parent is not None:
+            obj = session.modifier(dag=True).createNode(typ, objects[parent])
+
+        elif description['dag']:
+            obj = session.modifier(dag=True).createNode(typ)
+
+            # shapes without parent are created under a new transform
+            if om.MFnDependencyNode(obj).typeName != typ:
+                obj = om.MFnDagNode(obj).child(0)
+
+        else:
+            obj = session.modifier(dag=False).createNode(typ)
+
+        name = description['name']
+        session.modifier().renameNode(obj, f'{namespace}:{name}' if namespace else name)
+        return obj
+
+    def __restoreAttribute(
+            self,
+            modifier: om.MDGModifier,
+            obj: om.MObject,
+            attributes: Dict[str, om.MObject],
+            entry: list
+            ) -> None:
+
+        name, kind = entry[:2]
+        plug = resolvePlug(obj, [[name, None]], attributes)
+
+        if kind == 'value':
+            PlugAccessor(plug).write(modifier, plug, entry[2])
+
+        elif kind == 'string':
+            modifier.newPlugValueString(plug, entry[2])
+
+        elif kind == 'array':
+            fnData, build, _, _ = arrayData(plug.attribute())
+            modifier.newPlugValue(plug, fnData().create(build(self.buffers[entry[2]].tolist())))
+
+        elif kind == 'multi':
+            indices = self.buffers[entry[2]].tolist()
+            values = self.buffers[entry[3]].tolist()
+            plugs = [plug.elementByLogicalIndex(idx) for idx in indices]
+
+            if plugs:
+                PlugAccessor(plugs[0]).writeAll(modifier, plugs, values)
@@ -0,0 +1,268 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from maya.api import OpenMaya as om
+
+from .arrays import requireNumpy
+from .node import Node
+from .plug import Plug
+
+
+def _gather(np, indptr: 'numpy.ndarray', indices: 'numpy.ndarray', rows: 'numpy.ndarray') -> 'numpy.ndarray':
+    """
+    :desc: concatenated neighbours of rows in a CSR adjacency, without a python loop
+    """
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    total = int(counts.sum())
+    if not total:
+        return np.empty((0,), dtype=indices.dtype)
+
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return indices[offsets + np.arange(total)]
+
+
+class Connectivity:
+    """
+    :desc: connections between the members of a graph, gathered in one pass
+    members are numbered by their index in the graph,
+    node level edges are stored as CSR index arrays in both directions,
+    the connected plug pairs are kept per edge for the detail
+    """
+
+    def __init__(self, graph: om.MSelectionList) -> None:
+
+        np = requireNumpy()
+        self.graph = graph
+        self.size = graph.length()
+
+        sources, targets = [], []
+        self.__plugs: List[Tuple[om.MPlug, om.MPlug]] = []
+
+        for idx in range(self.size):
+            fn = om.MFnDependencyNode(graph.getDependNode(idx))
+            for plug in fn.getConnections():
+                if not plug.isSource:
+                    continue
+
+                for destination in plug.destinations():
+                    other = graph._indexOf(destination.node())
+                    if other is None:
+                        continue
+
+                    sources.append(idx)
+                    targets.append(other)
+                    self.__plugs.append((plug, destination))
+
+        self.plugSources = np.array(sources, dtype=np.int64)
+        self.plugTargets = np.array(targets, dtype=np.int64)
+
+        edges = np.unique(self.plugSources * max(self.size, 1) + self.plugTargets)
+        self.sources = edges // max(self.size, 1)
+        self.targets = edges % max(self.size, 1)
+
+        self.indptr, self.indices = self.__csr(np, self.sources, self.targets)
+        self.reverseIndptr, self.reverseIndices = self.__csr(np, self.targets, self.sources)
+
+    def __csr(self, np, rows: 'numpy.ndarray', columns: 'numpy.ndarray') -> Tuple['numpy.ndarray', 'numpy.ndarray']:
+
+        order = np.argsort(rows, kind='stable')
+        indptr = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.size), out=indptr[1:])
+        return indptr, columns[order]
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.size} nodes, {len(self)} edges, {len(self.__plugs)} connections)'
+
+    def index(self, node: Any) -> int:
+        """
+        :desc: index of a member node
+        """
+        idx = self.graph._indexOf(node if isinstance(node, om.MObject) else Node(node))
+        if idx is None:
+            raise NameError(f'{node} not in the Graph')
+
+        return idx
+
+    def __asGraph(self, indices: Any) -> om.MSelectionList:
+
+        graph = self.graph.__class__()
+        for idx in indices:
+            graph.add(self.graph._item(int(idx)))
+
+        return graph
+
+    def successors(self, idx: int) -> 'numpy.ndarray':
+        return self.indices[self.indptr[idx]:self.indptr[idx + 1]]
+
+    def predecessors(self, idx: int) -> 'numpy.ndarray':
+        return self.reverseIndices[self.reverseIndptr[idx]:self.reverseIndptr[idx + 1]]
+
+    def plugs(self, source: Any = None, destination: Any = None) -> List[Tuple[Plug, Plug]]:
+        """
+        :desc: connected plug pairs, optionally only the ones leaving source or entering destination
+        """
+        np = requireNumpy()
+        mask = np.ones(len(self.__plugs), dtype=bool)
+
+        if source is not None:
+            mask &= self.plugSources == self.index(source)
+
+        if destination is not None:
+            mask &= self.plugTargets == self.index(destination)
+
+        return [(Plug(self.__plugs[idx][0]), Plug(self.__plugs[idx][1])) for idx in np.flatnonzero(mask)]
+
+    def toposort(self) -> om.MSelectionList:
+        """
+        :desc: members ordered so every node comes after the nodes feeding it, with Kahn's algorithm
+        each round releases the whole frontier of nodes left without inputs
+        """
+        np = requireNumpy()
+        inDegree = np.bincount(self.targets, minlength=self.size)
+        frontier = np.flatnonzero(inDegree == 0)
+        order = []
+
+        while len(frontier):
+            order.append(frontier)
+
+            released = _gather(np, self.indptr, self.indices, frontier)
+            np.subtract.at(inDegree, released, 1)
+            frontier = np.unique(released[inDegree[released] == 0])
+
+        order = np.concatenate(order) if order else np.empty((0,), dtype=np.int64)
+        if len(order) != self.size:
+            raise ValueError(f'{self.size - len(order)} nodes are part of a cycle, see findCycles')
+
+        return self.__asGraph(order)
+
+    def componentLabels(self) -> 'numpy.ndarray':
+        """
+        :desc: weakly connected component label of every member, the smallest member index of its component
+        labels are hooked along the edges and shortcut until stable
+        """
+        np = requireNumpy()
+        labels = np.arange(self.size)
+
+        while True:
+            sourceLabels, targetLabels = labels[self.sources], labels[self.targets]
+            smallest = np.minimum(sourceLabels, targetLabels)
+
+            hooked = labels.copy()
+            np.minimum.at(hooked, sourceLabels, smallest)
+            np.minimum.at(hooked, targetLabels, smallest)
+
+            while not np.array_equal(shortcut := hooked[hooked], hooked):
+                hooked = shortcut
+
+            if np.array_equal(hooked, labels):
+                return labels
+
+            labels = hooked
+
+    def connectedComponents(self) -> List[om.MSelectionList]:
+        """
+        :desc: islands of members connected to each other, largest first
+        """
+        np = requireNumpy()
+        if not self.size:
+            return []
+
+        _, inverse, counts = np.unique(self.componentLabels(), return_inverse=True, return_counts=True)
+
+        order = np.argsort(inverse, kind='stable')
+        groups = np.split(order, np.cumsum(counts)[:-1])
+        groups.sort(key=len, reverse=True)
+
+        return [self.__asGraph(group) for group in groups]
+
+    def findCycles(self) -> List[om.MSelectionList]:
+        """
+        :desc: strongly connected components holding a cycle, with Tarjan's algorithm
+        every node of a returned component can reach every other one
+        """
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        selfLoops = set(self.sources[self.sources == self.targets].tolist())
+
+        index: Dict[int, int] = {}
+        lowLink: Dict[int, int] = {}
+        stack, onStack = [], set()
+        cycles = []
+
+        for root in range(self.size):
+            if root in index:
+                continue
+
+            work = [(root, indptr[root])]
+            index[root] = lowLink[root] = len(index)
+            stack.append(root)
+            onStack.add(root)
+
+            while work:
+                node, position = work[-1]
+
+                if position < indptr[node + 1]:
+                    work[-1] = (node, position + 1)
+                    other = indices[position]
+
+                    if other not in index:
+                        index[other] = lowLink[other] = len(index)
+                        stack.append(other)
+                        onStack.add(other)
+                        work.append((other, indptr[other]))
+
+                    elif other in onStack:
+                        lowLink[node] = min(lowLink[node], index[other])
+
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowLink[parent] = min(lowLink[parent], lowLink[node])
+
+                if lowLink[node] != index[node]:
+                    continue
+
+                component = []
+                while True:
+                    member = stack.pop()
+                    onStack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+
+                if len(component) > 1 or node in selfLoops:
+                    cycles.append(self.__asGraph(sorted(component)))
+
+        return cycles
+
+    def __closure(self, node: Any, indptr: 'numpy.ndarray', indices: 'numpy.ndarray') -> om.MSelectionList:
+
+        np = requireNumpy()
+        visited = np.zeros(self.size, dtype=bool)
+        frontier = np.array([self.index(node)])
+
+        while len(frontier):
+            reached = _gather(np, indptr, indices, frontier)
+            frontier = np.unique(reached[~visited[reached]])
+            visited[frontier] = True
+
+        return self.__asGraph(np.flatnonzero(visited))
+
+    def upstreamClosure(self, node: Any) -> om.MSelectionList:
+        """
+        :desc: members feeding node directly or through other members,
+        node itself is part of it only when it is in a cycle
+        """
+        return self.__closure(node, self.reverseIndptr, self.reverseIndices)
+
+    def downstreamClosure(self, node: Any) -> om.MSelectionList:
+        """
+        :desc: members fed by node directly or through other members,
+        node itself is part of it only when it is in a cycle
+        """
+        return self.__closure(node, self.indptr, self.indices)
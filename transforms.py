@@ -0,0 +1,291 @@
+"""
+:desc: vectorized local and world matrices of dag nodes
+matrices are numpy arrays of shape (N, 4, 4) in maya row vector convention,
+a world matrix is the local matrix times the parent world matrix
+"""
+from typing import List, Tuple
+
+from maya.api import OpenMaya as om
+
+from .arrays import requireNumpy
+
+# rotateOrder enum values: axes in the order they are applied
+ROTATE_ORDERS = ((0, 1, 2), (1, 2, 0), (2, 0, 1), (0, 2, 1), (1, 0, 2), (2, 1, 0))
+
+_IDENTITY = (1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+
+
+def _localValues(obj: om.MObject) -> List[float]:
+    """
+    :desc: the 16 values of the matrix plug, identity for dag nodes without transform
+    """
+    if not obj.hasFn(om.MFn.kTransform):
+        return _IDENTITY
+
+    plug = om.MFnDependencyNode(obj).findPlug('matrix', False)
+    return list(om.MFnMatrixData(plug.asMObject()).matrix())
+
+
+def _inherits(obj: om.MObject) -> bool:
+    """
+    :desc: whether the parent world matrix applies, false for transforms with inheritsTransform off
+    """
+    if not obj.hasFn(om.MFn.kTransform):
+        return True
+
+    fn = om.MFnDependencyNode(obj)
+    return not fn.hasAttribute('inheritsTransform') or fn.findPlug('inheritsTransform', False).asBool()
+
+
+def localMatrices(objects: List[om.MObject]) -> 'numpy.ndarray':
+    np = requireNumpy()
+    return np.array([_localValues(obj) for obj in objects], dtype='float64').reshape(-1, 4, 4)
+
+
+def worldMatrices(paths: List[om.MDagPath]) -> 'numpy.ndarray':
+    """
+    :desc: world matrices of dag paths, each path above them is read once
+    and the products are computed one hierarchy level at a time for every path of the level,
+    the world matrix of a transform with inheritsTransform off is its local matrix
+    """
+    np = requireNumpy()
+    rows = {}
+    parents, depths, values, inherits = [], [], [], []
+    members = []
+
+    for path in paths:
+        path = om.MDagPath(path)
+        chain = []
+
+        while path.length() and (name := path.fullPathName()) not in rows:
+            chain.append((name, path.node()))
+            path.pop()
+
+        parent = rows[path.fullPathName()] if path.length() else -1
+        for name, obj in reversed(chain):
+            rows[name] = len(values)
+            depths.append(depths[parent] + 1 if parent >= 0 else 0)
+            parents.append(parent)
+            values.append(_localValues(obj))
+            inherits.append(_inherits(obj))
+            parent = rows[name]
+
+        members.append(parent)
+
+    if not members:
+        return np.empty((0, 4, 4))
+
+    local = np.array(values, dtype='float64').reshape(-1, 4, 4)
+    world = local.copy()
+    parents = np.array(parents)
+    depths = np.array(depths)
+    inherits = np.array(inherits, dtype=bool)
+
+    order = np.argsort(depths, kind='stable')
+    bounds = np.searchsorted(depths[order], np.arange(1, depths.max() + 2))
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        level = order[start:end]
+        level = level[inherits[level]]
+        world[level] = local[level] @ world[parents[level]]
+
+    return world[members]
+
+
+def _axisMatrices(np, axis: int, angles: 'numpy.ndarray') -> 'numpy.ndarray':
+
+    cos, sin = np.cos(angles), np.sin(angles)
+    one, zero = np.ones_like(angles), np.zeros_like(angles)
+
+    if axis == 0:
+        rows = ((one, zero, zero), (zero, cos, sin), (zero, -sin, cos))
+    elif axis == 1:
+        rows = ((cos, zero, -sin), (zero, one, zero), (sin, zero, cos))
+    else:
+        rows = ((cos, sin, zero), (-sin, cos, zero), (zero, zero, one))
+
+    return np.stack([np.stack(row, -1) for row in rows], -2)
+
+
+def eulerMatrices(np, angles: 'numpy.ndarray', order: Tuple[int, int, int] = (0, 1, 2)) -> 'numpy.ndarray':
+    """
+    :desc: (N, 3, 3) rotation matrices of (N, 3) xyz angles in radians applied in order
+    """
+    first, second, third = order
+    return (
+        _axisMatrices(np, first, angles[:, first])
+        @ _axisMatrices(np, second, angles[:, second])
+        @ _axisMatrices(np, third, angles[:, third])
+        )
+
+
+def eulerAngles(np, rotations: 'numpy.ndarray', order: Tuple[int, int, int] = (0, 1, 2)) -> 'numpy.ndarray':
+    """
+    :desc: (N, 3) xyz angles in radians of (N, 3, 3) rotation matrices, the inverse of eulerMatrices
+    at gimbal lock the third angle is set to 0
+    """
+    first, second, third = order
+    sign = 1.0 if (second - first) % 3 == 1 else -1.0
+
+    sinSecond = np.clip(-sign * rotations[:, first, third], -1.0, 1.0)
+    angles = np.empty((len(rotations), 3))
+    angles[:, second] = np.arcsin(sinSecond)
+    angles[:, first] = np.arctan2(sign * rotations[:, second, third], rotations[:, third, third])
+    angles[:, third] = np.arctan2(sign * rotations[:, first, second], rotations[:, first, first])
+
+    lock = np.abs(sinSecond) > 1.0 - 1e-9
+    if lock.any():
+        angles[lock, first] = np.arctan2(-sign * rotations[lock, third, second], rotations[lock, second, second])
+        angles[lock, third] = 0.0
+
+    return angles
+
+
+def decompose(np, matrices: 'numpy.ndarray') -> Tuple['numpy.ndarray', ...]:
+    """
+    :desc: split (N, 4, 4) matrices into translate, scale, shear and rotation matrices
+    following the maya order scale * shear * rotation * translate, shears are xy, xz, yz
+    """
+    rows = matrices[:, :3, :3]
+    translate = matrices[:, 3, :3].copy()
+
+    def dot(a, b):
+        return np.einsum('ij,ij->i', a, b)
+
+    def norm(a):
+        return np.linalg.norm(a, axis=1)
+
+    scale = np.empty((len(matrices), 3))
+    shear = np.empty((len(matrices), 3))
+    rotation = np.empty((len(matrices), 3, 3))
+
+    scale[:, 0] = norm(rows[:, 0])
+    rotation[:, 0] = rows[:, 0] / scale[:, 0, None]
+
+    projected = dot(rows[:, 1], rotation[:, 0])
+    remainder = rows[:, 1] - projected[:, None] * rotation[:, 0]
+    scale[:, 1] = norm(remainder)
+    rotation[:, 1] = remainder / scale[:, 1, None]
+    shear[:, 0] = projected / scale[:, 1]
+
+    first = dot(rows[:, 2], rotation[:, 0])
+    second = dot(rows[:, 2], rotation[:, 1])
+    remainder = rows[:, 2] - first[:, None] * rotation[:, 0] - second[:, None] * rotation[:, 1]
+    scale[:, 2] = norm(remainder)
+    rotation[:, 2] = remainder / scale[:, 2, None]
+
+    # a negative determinant is carried by the z scale
+    flipped = dot(np.cross(rotation[:, 0], rotation[:, 1]), rotation[:, 2]) < 0
+    scale[flipped, 2] *= -1
+    rotation[flipped, 2] *= -1
+
+    shear[:, 1] = first / scale[:, 2]
+    shear[:, 2] = second / scale[:, 2]
+
+    return translate, scale, shear, rotation
+
+
+def _read3(np, objects: List[om.MObject], name: str, default: float) -> 'numpy.ndarray':
+
+    values = np.full((len(objects), 3), default)
+    for idx, obj in enumerate(objects):
+        fn = om.MFnDependencyNode(obj)
+        if fn.hasAttribute(name):
+            plug = fn.findPlug(name, False)
+            values[idx] = [plug.child(axis).asDouble() for axis in range(3)]
+
+    return values
+
+
+def _pivotOffsets(
+        np,
+        objects: List[om.MObject],
+        pivoted: 'numpy.ndarray',
+        linear: 'numpy.ndarray',
+        rotation: 'numpy.ndarray'
+        ) -> 'numpy.ndarray':
+    """
+    :desc: translation the pivots add to each local matrix,
+    maya builds it as -sp * scaleShear * sp * st * -rp * rotation * rp * rt * translate
+    """
+    offsets = np.zeros((len(objects), 3))
+    if not pivoted.any():
+        return offsets
+
+    items = [obj for obj, flag in zip(objects, pivoted) if flag]
+    scalePivot = _read3(np, items, 'scalePivot', 0.0)
+    scaleTranslate = _read3(np, items, 'scalePivotTranslate', 0.0)
+    rotatePivot = _read3(np, items, 'rotatePivot', 0.0)
+    rotateTranslate = _read3(np, items, 'rotatePivotTranslate', 0.0)
+
+    # the rotation is orthonormal, what is left of the linear part is scale * shear
+    scaleShear = linear[pivoted] @ np.swapaxes(rotation[pivoted], 1, 2)
+
+    point = scalePivot - np.einsum('ni,nij->nj', scalePivot, scaleShear) + scaleTranslate - rotatePivot
+    offsets[pivoted] = np.einsum('ni,nij->nj', point, rotation[pivoted]) + rotatePivot + rotateTranslate
+    return offsets
+
+
+def _compensates(obj: om.MObject) -> bool:
+    """
+    :desc: whether a joint applies the inverse scale of its parent, maya ignores it with segmentScaleCompensate off
+    """
+    fn = om.MFnDependencyNode(obj)
+    return not fn.hasAttribute('segmentScaleCompensate') or fn.findPlug('segmentScaleCompensate', False).asBool()
+
+
+def setLocalMatrices(modifier: om.MDGModifier, objects: List[om.MObject], matrices: 'numpy.ndarray') -> None:
+    """
+    :desc: queue the translate, rotate, scale and shear values giving each transform its local matrix
+    rotateOrder, rotateAxis, the scale and rotate pivots and their translates are taken into account,
+    and for joints jointOrient and, when segmentScaleCompensate is on, the inverse parent scale,
+    joints have no pivot in their matrix
+    """
+    np = requireNumpy()
+    if not objects:
+        return
+
+    matrices = np.broadcast_to(np.asarray(matrices, dtype='float64').reshape(-1, 4, 4), (len(objects), 4, 4))
+
+    for obj in objects:
+        if not obj.hasFn(om.MFn.kTransform):
+            raise TypeError(f'{om.MFnDependencyNode(obj).name()} is not a transform')
+
+    joints = np.array([obj.hasFn(om.MFn.kJoint) for obj in objects], dtype=bool)
+    compensated = np.array([joint and _compensates(obj) for obj, joint in zip(objects, joints)], dtype=bool)
+    matrices = matrices.copy()
+
+    if compensated.any():
+        # undo the inverse parent scale the joint applies before its translation
+        inverseScale = _read3(np, objects, 'inverseScale', 1.0)
+        matrices[compensated, :3, :3] *= inverseScale[compensated, None, :]
+
+    translate, scale, shear, rotation = decompose(np, matrices)
+    translate -= _pivotOffsets(np, objects, ~joints, matrices[:, :3, :3], rotation)
+
+    # rotation = rotateAxis * rotate * jointOrient, the axis and orient always use the xyz order
+    rotateAxis = eulerMatrices(np, _read3(np, objects, 'rotateAxis', 0.0))
+    rotation = np.swapaxes(rotateAxis, 1, 2) @ rotation
+    if joints.any():
+        jointOrient = eulerMatrices(np, _read3(np, [obj for obj, joint in zip(objects, joints) if joint], 'jointOrient', 0.0))
+        rotation[joints] = rotation[joints] @ np.swapaxes(jointOrient, 1, 2)
+
+    rotateOrders = np.zeros(len(objects), dtype=int)
+    for idx, obj in enumerate(objects):
+        fn = om.MFnDependencyNode(obj)
+        if fn.hasAttribute('rotateOrder'):
+            rotateOrders[idx] = fn.findPlug('rotateOrder', False).asInt()
+
+    rotate = np.empty((len(objects), 3))
+    for value, order in enumerate(ROTATE_ORDERS):
+        if (members := rotateOrders == value).any():
+            rotate[members] = eulerAngles(np, rotation[members], order)
+
+    for obj, values in zip(objects, zip(translate.tolist(), rotate.tolist(), scale.tolist(), shear.tolist())):
+        fn = om.MFnDependencyNode(obj)
+        for name, value in zip(('translate', 'rotate', 'scale', 'shear'), values):
+            if not fn.hasAttribute(name):
+                continue
+
+            plug = fn.findPlug(name, False)
+            for axis in range(3):
+                modifier.newPlugValueDouble(plug.child(axis), value[axis])
@@ -0,0 +1,308 @@
+from collections import deque
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+from maya.api import OpenMaya as om
+
+from . import shims
+
+
+def iterDependencyGraph(
+        root: om.MObject,
+        upstream: bool = True,
+        fnType: int = om.MFn.kInvalid,
+        depth: Optional[int] = None,
+        prune: Optional[Callable[[om.MObject], bool]] = None,
+        breadthFirst: bool = False,
+        includeRoot: bool = False
+        ) -> Iterator[om.MObject]:
+    """
+    :desc: lazily walk the dependency graph from root with MItDependencyGraph
+    closing the generator stops the walk
+    :param MObject root: node the walk starts from
+    :param bool upstream: walk the inputs, or the outputs when False
+    :param MFn.Type fnType: only yield nodes compatible with this function set
+    :param int | None depth: do not walk further than depth connections from root
+    :param callable prune: called with each node, True skip the node and what is behind it
+    :param bool breadthFirst: breadth first order instead of depth first
+    :param bool includeRoot: yield root itself when it matches fnType
+    """
+    direction = om.MItDependencyGraph.kUpstream if upstream else om.MItDependencyGraph.kDownstream
+    traversal = om.MItDependencyGraph.kBreadthFirst if breadthFirst else om.MItDependencyGraph.kDepthFirst
+
+    # the native filter hides the nodes that do not match,
+    # so it is only used when no node needs to be visited to be pruned
+    native = depth is None and prune is None
+    iterator = om.MItDependencyGraph(
+            root,
+            fnType if native else om.MFn.kInvalid,
+            direction,
+            traversal,
+            om.MItDependencyGraph.kNodeLevel
+            )
+
+    while not iterator.isDone():
+        obj = iterator.currentNode()
+
+        if obj == root:
+            if includeRoot and (native or fnType == om.MFn.kInvalid or obj.hasFn(fnType)):
+                yield obj
+
+            if depth == 0:
+                iterator.prune()
+
+        elif native:
+            yield obj
+
+        elif prune is not None and prune(obj):
+            iterator.prune()
+
+        else:
+            if fnType == om.MFn.kInvalid or obj.hasFn(fnType):
+                yield obj
+
+            if depth is not None and len(iterator.getNodePath()) > depth:
+                iterator.prune()
+
+        iterator.next()
+
+
+# node types whose derived types are exactly the nodes compatible with a function set
+FN_TYPES = {
+    'dependNode': om.MFn.kDependencyNode,
+    'dagNode': om.MFn.kDagNode,
+    'transform': om.MFn.kTransform,
+    'joint': om.MFn.kJoint,
+    'shape': om.MFn.kShape,
+    'mesh': om.MFn.kMesh,
+    'nurbsCurve': om.MFn.kNurbsCurve,
+    'nurbsSurface': om.MFn.kNurbsSurface,
+    'locator': om.MFn.kLocator,
+    'camera': om.MFn.kCamera,
+    'container': om.MFn.kContainer,
+    'geometryFilter': om.MFn.kGeometryFilt,
+    'skinCluster': om.MFn.kSkinClusterFilter,
+    'blendShape': om.MFn.kBlendShape,
+    'animCurve': om.MFn.kAnimCurve,
+    'objectSet': om.MFn.kSet,
+    'reference': om.MFn.kReference,
+    }
+
+DAG_FN_TYPES = {
+    om.MFn.kDagNode, om.MFn.kTransform, om.MFn.kJoint, om.MFn.kShape, om.MFn.kMesh,
+    om.MFn.kNurbsCurve, om.MFn.kNurbsSurface, om.MFn.kLocator, om.MFn.kCamera
+    }
+
+
+def typeFilter(typeNames: Union[str, List[str]]) -> Callable[[om.MObject], bool]:
+    """
+    :desc: predicate matching nodes of the given types or of a type deriving from them,
+    like the type flag of cmds.ls and cmds.listRelatives
+    """
+    if isinstance(typeNames, str):
+        typeNames = [typeNames]
+
+    fnTypes = [FN_TYPES[name] for name in typeNames if name in FN_TYPES]
+    names = set()
+    for name in typeNames:
+        if name not in FN_TYPES:
+            names.update(shims.derivedTypes(name))
+
+    def match(obj: om.MObject) -> bool:
+
+        if any(obj.hasFn(fnType) for fnType in fnTypes):
+            return True
+
+        return bool(names) and om.MFnDependencyNode(obj).typeName in names
+
+    return match
+
+
+def typeConstraint(typeNames: Union[str, List[str], None]) -> Tuple[int, Optional[Callable[[om.MObject], bool]]]:
+    """
+    :desc: compile node types to the function set given to the native iterators
+    and the predicate left to run on what they yield
+    a single type with a function set needs no predicate,
+    other types are matched by type name on every node
+    """
+    if isinstance(typeNames, str):
+        typeNames = [typeNames]
+
+    if not typeNames:
+        return om.MFn.kDependencyNode, None
+
+    if len(typeNames) == 1 and typeNames[0] in FN_TYPES:
+        return FN_TYPES[typeNames[0]], None
+
+    return om.MFn.kInvalid, typeFilter(typeNames)
+
+
+def iterNodes(typeNames: Union[str, List[str], None] = None) -> Iterator[om.MObject]:
+    """
+    :desc: lazily list the scene nodes of the given types and of the types deriving from them
+    a single type with a function set is filtered by MItDag or MItDependencyNodes,
+    other types are matched by type name while iterating every node
+    :param str | List[str] | None typeNames: node types, None for every node
+    """
+    fnType, match = typeConstraint(typeNames)
+
+    if fnType in DAG_FN_TYPES:
+        yield from iterDagNodes(fnType)
+        return
+
+    iterator = om.MItDependencyNodes(fnType)
+    while not iterator.isDone():
+        obj = iterator.thisNode()
+
+        if match is None or match(obj):
+            yield obj
+
+        iterator.next()
+
+
+def iterDagNodes(fnType: int = om.MFn.kInvalid, root: Optional[om.MObject] = None) -> Iterator[om.MObject]:
+    """
+    :desc: lazily list the dag nodes compatible with fnType, instanced nodes once
+    :param MObject | None root: only list the descendants of root
+    """
+    for path in iterDescendants(root, fnType):
+        yield path.node()
+
+
+def iterDescendants(
+        root: Union[om.MObject, om.MDagPath, None] = None,
+        fnType: int = om.MFn.kInvalid,
+        depth: Optional[int] = None,
+        prune: Optional[Callable[[om.MObject], bool]] = None,
+        breadthFirst: bool = False,
+        instances: bool = False
+        ) -> Iterator[om.MDagPath]:
+    """
+    :desc: lazily walk the dag below root with MItDag
+    closing the generator stops the walk
+    :param MObject | MDagPath | None root: node the walk starts from, not yielded, None for the world
+    :param MFn.Type fnType: only yield nodes compatible with this function set
+    :param int | None depth: do not walk further than depth levels below root
+    :param callable prune: called with each node, True skip the node and what is below it
+    :param bool breadthFirst: breadth first order instead of depth first
+    :param bool instances: yield every path of instanced nodes, each node once otherwise
+    """
+    traversal = om.MItDag.kBreadthFirst if breadthFirst else om.MItDag.kDepthFirst
+
+    # the native filter hides the nodes that do not match,
+    # so it is only used when no node needs to be visited to be pruned
+    native = depth is None and prune is None
+    filterType = fnType if native else om.MFn.kInvalid
+
+    iterator = om.MItDag(traversal, filterType)
+    if root is not None:
+        iterator.reset(root, traversal, filterType)
+
+    seen = set()
+
+    while not iterator.isDone():
+        obj = iterator.currentItem()
+        level = iterator.depth()
+
+        if level == 0 or obj.hasFn(om.MFn.kWorld):
+            pass
+
+        elif prune is not None and prune(obj):
+            iterator.prune()
+
+        else:
+            duplicate = False
+            if not instances and iterator.isInstanced(True):
+                key = om.MObjectHandle(obj).hashCode()
+                duplicate = key in seen
+                seen.add(key)
+
+            if duplicate:
+                # what is below was walked from the first path
+                iterator.prune()
+
+            else:
+                if native or fnType == om.MFn.kInvalid or obj.hasFn(fnType):
+                    yield iterator.getPath()
+
+                if depth is not None and level >= depth:
+                    iterator.prune()
+
+        iterator.next()
+
+
+def _dagPaths(root: Union[om.MObject, om.MDagPath]) -> List[om.MDagPath]:
+
+    if isinstance(root, om.MDagPath):
+        return [om.MDagPath(root)]
+
+    return om.MDagPath.getAllPathsTo(root)
+
+
+def iterAncestors(
+        root: Union[om.MObject, om.MDagPath],
+        fnType: int = om.MFn.kInvalid,
+        depth: Optional[int] = None,
+        prune: Optional[Callable[[om.MObject], bool]] = None,
+        breadthFirst: bool = False,
+        instances: bool = False
+        ) -> Iterator[om.MDagPath]:
+    """
+    :desc: lazily walk up the dag paths of root, the world is not yielded
+    a node root walks up every path of the node, a dag path root only that path
+    :param MFn.Type fnType: only yield nodes compatible with this function set
+    :param int | None depth: do not walk further than depth levels above root
+    :param callable prune: called with each node, True stop walking up from the node
+    :param bool breadthFirst: every direct parent first, then every grandparent...
+    :param bool instances: yield every path of instanced ancestors, each node once otherwise
+    """
+    paths = _dagPaths(root)
+    pending = deque((path, 0) for path in (paths if breadthFirst else reversed(paths)))
+    seen = set()
+
+    while pending:
+        path, level = pending.popleft() if breadthFirst else pending.pop()
+        if path.length() <= 1 or (depth is not None and level >= depth):
+            continue
+
+        parent = om.MDagPath(path).pop()
+        obj = parent.node()
+
+        if prune is not None and prune(obj):
+            continue
+
+        pending.append((parent, level + 1))
+
+        key = parent.fullPathName() if instances else om.MObjectHandle(obj).hashCode()
+        if key in seen or (fnType != om.MFn.kInvalid and not obj.hasFn(fnType)):
+            continue
+
+        seen.add(key)
+        yield parent
+
+
+def iterSiblings(
+        root: Union[om.MObject, om.MDagPath],
+        fnType: int = om.MFn.kInvalid,
+        instances: bool = False
+        ) -> Iterator[om.MDagPath]:
+    """
+    :desc: lazily list the other children of the parents of root
+    a node root has the siblings of every path of the node, a dag path root only the ones of that path
+    """
+    obj = root.node() if isinstance(root, om.MDagPath) else root
+    seen = set()
+
+    for path in _dagPaths(root):
+        parent = om.MDagPath(path).pop()
+
+        for sibling in iterDescendants(parent if parent.length() else None, fnType, depth=1, instances=True):
+            other = sibling.node()
+            if other == obj:
+                continue
+
+            key = sibling.fullPathName() if instances else om.MObjectHandle(other).hashCode()
+            if key in seen:
+                continue
+
+            seen.add(key)
+            yield sibling